@@ -54,21 +54,8 @@ def get_best_move_astar(board, depth_limit=2, beam_width=5):
         # Generar movimientos legales desde el tablero actual para el jugador actual.
         legal_moves = MoveGenerator.generate_legal_moves(board, board.turn)
 
-        # Asegurar que todos los movimientos sean instancias de la clase Move.
-        fixed_moves = []
-        for m in legal_moves:
-            if isinstance(m, Move):
-                fixed_moves.append(m)
-            else:
-                try:
-                    # Si el movimiento es una tupla (start, end), lo convierte a un objeto Move.
-                    start_sq, end_sq = m
-                    fixed_moves.append(Move(start_sq, end_sq, board))
-                except Exception:
-                    continue # Ignora movimientos mal formados.
-
         scored_moves = [] # Lista para almacenar los movimientos con sus evaluaciones.
-        for move in fixed_moves:
+        for move in legal_moves: # Movimientos codificados como enteros: make_move los aplica directamente.
             board.make_move(move) # Realiza el movimiento en el tablero (simulación).
             eval_score = evaluate_board(board) # Evalúa el tablero después del movimiento.
             board.undo_move() # Deshace el movimiento para restaurar el tablero.
@@ -97,6 +84,8 @@ def get_best_move_astar(board, depth_limit=2, beam_width=5):
             )
             board.undo_move() # Deshace el movimiento para restaurar el tablero.
 
-    return best_move # Devuelve el mejor movimiento encontrado.
+    if best_move is None:
+        return None
+    return Move.from_int(best_move, board) # La interfaz recibe un objeto Move.
 
 
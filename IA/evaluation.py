@@ -1,4 +1,6 @@
 # IA/evaluation.py
+from chessLogic.bitboard import FILE_MASKS # Máscaras de columnas para contar peones por columna.
+
 # Valores de las piezas en puntos. Ajustados para dar más peso a las piezas mayores.
 piece_values = {"p":100,"n":320,"b":330,"r":500,"q":900,"k":20000} 
 
@@ -124,6 +126,13 @@ def evaluate_board(board):
     pawn_structure_score = 0 # Puntuación por la estructura de peones.
     other_score = 0 # Puntuación por otras heurísticas.
 
+    bitboards = board.bitboards # Bitboards por pieza, para conteos sin recorrer el tablero.
+
+    # Determinar si es endgame para usar la tabla de rey de endgame.
+    # Una heurística simple para endgame: si hay pocas piezas mayores (reinas y torres).
+    num_major_pieces = (bitboards["wq"] | bitboards["bq"] | bitboards["wr"] | bitboards["br"]).bit_count()
+    is_endgame = num_major_pieces <= 4 # Arbitrario, se puede ajustar el umbral.
+
     # --- Material + Posición ---
     # Itera sobre cada casilla del tablero para evaluar material y posición.
     for r in range(8):
@@ -153,14 +162,7 @@ def evaluate_board(board):
             elif p_type == "q":
                 val = queen_table[r][c] if piece[0] == "w" else queen_table[7-r][c]
             elif p_type == "k":
-                # Determinar si es endgame para usar la tabla de rey de endgame.
-                # Una heurística simple para endgame: si hay pocas piezas mayores (reinas y torres).
-                num_major_pieces = 0
-                for row_board in board.board:
-                    for p in row_board:
-                        if p != "--" and p[1] in ("q", "r"):
-                            num_major_pieces += 1
-                if num_major_pieces <= 4: # Arbitrario, se puede ajustar el umbral.
+                if is_endgame: # Final: el rey debe centralizarse.
                     val = king_table_end[r][c] if piece[0] == "w" else king_table_end[7-r][c]
                 else: # Si no es endgame, usa la tabla de medio juego.
                     val = king_table_mid[r][c] if piece[0] == "w" else king_table_mid[7-r][c]
@@ -171,8 +173,9 @@ def evaluate_board(board):
     # Se usa MoveGenerator para obtener los movimientos pseudo-legales de forma más eficiente.
     from IA.move_generator import MoveGenerator # Importa aquí para evitar importaciones circulares.
     # La movilidad se calcula como la diferencia entre el número de movimientos pseudo-legales de blancas y negras.
-    mobility_score = len(MoveGenerator.generate_pseudo_legal_moves(board, "w")) - \
-                     len(MoveGenerator.generate_pseudo_legal_moves(board, "b"))
+    # Se cuentan con bitboards (ataques precalculados y popcount) sin construir las listas de movimientos.
+    mobility_score = MoveGenerator.count_pseudo_legal_moves(board, "w") - \
+                     MoveGenerator.count_pseudo_legal_moves(board, "b")
 
     # --- Seguridad del Rey ---
     # Penalización más fuerte por estar en jaque.
@@ -184,12 +187,9 @@ def evaluate_board(board):
     # --- Estructura de Peones (Nueva heurística) ---
     # Penaliza peones doblados y aislados.
     for color in ["w", "b"]: # Itera para ambos colores.
-        pawn_count_by_col = [0] * 8 # Cuenta los peones por columna.
-        for r in range(8):
-            for c in range(8):
-                piece = board.get_piece(r, c)
-                if piece == color + "p": # Si es un peón del color actual.
-                    pawn_count_by_col[c] += 1 # Incrementa el contador de la columna.
+        pawns = bitboards[color + "p"] # Bitboard de los peones del color actual.
+        # Cuenta los peones por columna intersecando con la máscara de cada columna.
+        pawn_count_by_col = [(pawns & FILE_MASKS[c]).bit_count() for c in range(8)]
         
         for c in range(8):
             if pawn_count_by_col[c] > 1: # Peones doblados (más de un peón en la misma columna).
@@ -207,8 +207,8 @@ def evaluate_board(board):
 
     # --- Otras heurísticas ---
     # Par de alfiles: bonificación por tener dos alfiles.
-    white_bishops = sum(1 for r in range(8) for c in range(8) if board.get_piece(r,c) == "wb")
-    black_bishops = sum(1 for r in range(8) for c in range(8) if board.get_piece(r,c) == "bb")
+    white_bishops = bitboards["wb"].bit_count()
+    black_bishops = bitboards["bb"].bit_count()
     if white_bishops >= 2:
         other_score += 20 # Bonificación para las blancas.
     if black_bishops >= 2:
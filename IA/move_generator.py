@@ -1,7 +1,26 @@
 # IA/move_generator.py
 from chessLogic.moves import is_legal_move # Importa la función is_legal_move para verificar movimientos geométricos.
 from chessLogic.rules import ChessRules # Importa ChessRules para verificar enroque.
-from chessLogic.move import Move # Importa la clase Move para crear objetos de movimiento.
+from chessLogic.move import ( # Codificación entera de los movimientos (ver chessLogic/move.py).
+    DOUBLE_PAWN_PUSH, KING_CASTLE, QUEEN_CASTLE, CAPTURE, EN_PASSANT, PROMOTION_FLAGS,
+)
+from chessLogic.attack_tables import ( # Tablas precalculadas de destinos y líneas por casilla.
+    PAWN_ATTACKS, RAYS, RAYS_BB, DIRECTIONS, SQUARE_COORDS,
+    KNIGHT_ATTACKS_BB, KING_ATTACKS_BB, PAWN_ATTACKS_BB,
+)
+from chessLogic.slider_attacks import ROOK_ATTACKS, ROOK_MASKS, BISHOP_ATTACKS, BISHOP_MASKS # Ataques deslizantes.
+from chessLogic.bitboard import FILE_MASKS, RANK_MASKS, FULL_BOARD # Máscaras para operar con peones en bloque.
+
+ALL_RAYS = range(8) # Las 8 líneas (rectas y diagonales) que salen de una casilla.
+
+# Bits 12-15 ya desplazados, para componer movimientos con un solo OR.
+CAPTURE_BITS = CAPTURE << 12
+DOUBLE_PAWN_PUSH_BITS = DOUBLE_PAWN_PUSH << 12
+EN_PASSANT_BITS = EN_PASSANT << 12
+KING_CASTLE_BITS = KING_CASTLE << 12
+QUEEN_CASTLE_BITS = QUEEN_CASTLE << 12
+# Las cuatro promociones, de la más valiosa a la menos valiosa (la dama se prueba primero).
+PROMOTION_BITS = tuple(PROMOTION_FLAGS[piece] << 12 for piece in "qrbn")
 
 class MoveGenerator:
     """
@@ -20,7 +39,7 @@ class MoveGenerator:
             color (str): El color del jugador ('w' para blancas o 'b' para negras).
             
         Returns:
-            list: Una lista de tuplas, donde cada tupla representa un movimiento ((start_row, start_col), (end_row, end_col)).
+            list: Una lista de movimientos codificados como enteros (ver chessLogic/move.py).
         """
         moves = [] # Lista para almacenar los movimientos generados.
         board = chessboard.board # Accede al tablero.
@@ -45,106 +64,170 @@ class MoveGenerator:
                         moves.extend(MoveGenerator._get_king_moves(chessboard, (r, c), color))
                         # Añadir enroque como pseudo-legal aquí para que minimax lo evalúe.
                         # Solo se verifica si el enroque es geométricamente posible y los derechos existen.
-                        if ChessRules.can_castle(chessboard, color, kingside=True):
-                            moves.append(((r, c), (r, c + 2))) # Movimiento de rey para enroque corto.
-                        if ChessRules.can_castle(chessboard, color, kingside=False):
-                            moves.append(((r, c), (r, c - 2))) # Movimiento de rey para enroque largo.
+                        king_sq = r * 8 + c
+                        if ChessRules.can_castle(chessboard, color, kingside=True): # Enroque corto.
+                            moves.append(king_sq | (king_sq + 2) << 6 | KING_CASTLE_BITS)
+                        if ChessRules.can_castle(chessboard, color, kingside=False): # Enroque largo.
+                            moves.append(king_sq | (king_sq - 2) << 6 | QUEEN_CASTLE_BITS)
         return moves # Devuelve la lista de movimientos pseudo-legales.
 
+    @staticmethod
+    def count_pseudo_legal_moves(chessboard, color):
+        """
+        Cuenta los movimientos pseudo-legales de un color sin generarlos, con operaciones de bitboards.
+        Devuelve lo mismo que len(generate_pseudo_legal_moves(chessboard, color)) (cada promoción cuenta
+        como cuatro movimientos, uno por pieza) y se usa para la movilidad.
+
+        Args:
+            chessboard (ChessBoard): La instancia del tablero de ajedrez.
+            color (str): El color del jugador ('w' para blancas o 'b' para negras).
+
+        Returns:
+            int: El número de movimientos pseudo-legales.
+        """
+        bitboards = chessboard.bitboards
+        occupancy = chessboard.all_occupancy
+        not_own = ~chessboard.occupancy[color] # Casillas vacías o con pieza enemiga.
+        enemy = chessboard.occupancy["b" if color == "w" else "w"]
+        empty = ~occupancy & FULL_BOARD
+        count = 0
+
+        # --- Peones: avances simples y dobles, capturas y en passant, todos a la vez ---
+        pawns = bitboards[color + "p"]
+        if color == "w": # Las blancas avanzan hacia índices menores (-8 por fila).
+            single = (pawns >> 8) & empty
+            double = ((single & RANK_MASKS[5]) >> 8) & empty
+            captures_left = ((pawns & ~FILE_MASKS[0]) >> 9) & enemy
+            captures_right = ((pawns & ~FILE_MASKS[7]) >> 7) & enemy
+            last_rank = RANK_MASKS[0]
+        else: # Las negras avanzan hacia índices mayores (+8 por fila).
+            single = (pawns << 8) & empty
+            double = ((single & RANK_MASKS[2]) << 8) & empty
+            captures_left = ((pawns & ~FILE_MASKS[0]) << 7) & enemy
+            captures_right = ((pawns & ~FILE_MASKS[7]) << 9) & enemy
+            last_rank = RANK_MASKS[7]
+        count += single.bit_count() + double.bit_count() + captures_left.bit_count() + captures_right.bit_count()
+        count += 3 * (last_rank & (single | captures_left | captures_right)).bit_count() # Promociones: 4 piezas.
+        en_passant = chessboard.en_passant_square
+        if en_passant is not None: # Peones propios que atacan la casilla de en passant.
+            ep_sq = en_passant[0] * 8 + en_passant[1]
+            count += (PAWN_ATTACKS_BB["b" if color == "w" else "w"][ep_sq] & pawns).bit_count()
+
+        # --- Caballos ---
+        knights = bitboards[color + "n"]
+        while knights:
+            lsb = knights & -knights
+            count += (KNIGHT_ATTACKS_BB[lsb.bit_length() - 1] & not_own).bit_count()
+            knights ^= lsb
+
+        # --- Piezas deslizantes: una consulta por línea (dos para la dama) ---
+        queens = bitboards[color + "q"]
+        rooks = bitboards[color + "r"] | queens
+        while rooks:
+            lsb = rooks & -rooks
+            sq = lsb.bit_length() - 1
+            count += (ROOK_ATTACKS[sq][occupancy & ROOK_MASKS[sq]] & not_own).bit_count()
+            rooks ^= lsb
+        bishops = bitboards[color + "b"] | queens
+        while bishops:
+            lsb = bishops & -bishops
+            sq = lsb.bit_length() - 1
+            count += (BISHOP_ATTACKS[sq][occupancy & BISHOP_MASKS[sq]] & not_own).bit_count()
+            bishops ^= lsb
+
+        # --- Rey y enroques ---
+        kings = bitboards[color + "k"]
+        if kings:
+            count += (KING_ATTACKS_BB[kings.bit_length() - 1] & not_own).bit_count()
+            count += ChessRules.can_castle(chessboard, color, kingside=True)
+            count += ChessRules.can_castle(chessboard, color, kingside=False)
+        return count
+
     @staticmethod
     def _get_pawn_moves(chessboard, start_pos, color):
         """
         Genera los movimientos pseudo-legales para un peón.
+        Al llegar a la última fila se genera una promoción por cada pieza posible.
         """
         moves = []
+        board = chessboard.board
         sr, sc = start_pos # Fila y columna de inicio.
+        from_sq = sr * 8 + sc # Casilla de inicio.
         direction = -1 if color == "w" else 1 # Dirección de avance del peón.
+        last_row = 0 if color == "w" else 7 # Fila de promoción.
         
         # Movimiento de un paso hacia adelante.
-        er, ec = sr + direction, sc # Casilla un paso adelante.
-        if 0 <= er < 8 and chessboard.board[er][ec] == "--": # Si la casilla está dentro del tablero y vacía.
-            moves.append((start_pos, (er, ec)))
+        er = sr + direction # Fila un paso adelante.
+        if 0 <= er < 8 and board[er][sc] == "--": # Si la casilla está dentro del tablero y vacía.
+            move = from_sq | (er * 8 + sc) << 6
+            if er == last_row: # Promoción.
+                moves.extend(move | bits for bits in PROMOTION_BITS)
+            else:
+                moves.append(move)
             # Movimiento de dos pasos desde la posición inicial.
             if (sr == 6 and color == "w") or (sr == 1 and color == "b"): # Si el peón está en su fila inicial.
-                er2 = sr + 2 * direction # Casilla dos pasos adelante.
-                # Si la casilla dos pasos adelante y la casilla intermedia están vacías.
-                if chessboard.board[er2][ec] == "--" and chessboard.board[sr + direction][sc] == "--":
-                    moves.append((start_pos, (er2, ec)))
+                er2 = sr + 2 * direction # Fila dos pasos adelante.
+                # Si la casilla dos pasos adelante está vacía (la intermedia ya lo está).
+                if board[er2][sc] == "--":
+                    moves.append(from_sq | (er2 * 8 + sc) << 6 | DOUBLE_PAWN_PUSH_BITS)
         
-        # Capturas diagonales.
-        for dc in [-1, 1]: # Para las dos diagonales.
-            er, ec = sr + direction, sc + dc # Casilla de captura diagonal.
-            if 0 <= er < 8 and 0 <= ec < 8: # Si la casilla está dentro del tablero.
-                target_piece = chessboard.board[er][ec] # Pieza en la casilla de destino.
-                if target_piece != "--" and target_piece[0] != color: # Si hay una pieza enemiga.
-                    moves.append((start_pos, (er, ec)))
-                # En passant: si la casilla de destino es la casilla de en passant posible.
-                if chessboard.en_passant_square == (er, ec):
-                    moves.append((start_pos, (er, ec)))
+        # Capturas diagonales (tabla precalculada de ataques de peón).
+        en_passant = chessboard.en_passant_square
+        for target in PAWN_ATTACKS[color][from_sq]:
+            tr, tc = target
+            target_piece = board[tr][tc] # Pieza en la casilla de destino.
+            if target_piece != "--" and target_piece[0] != color: # Si hay una pieza enemiga.
+                move = from_sq | (tr * 8 + tc) << 6 | CAPTURE_BITS
+                if tr == last_row: # Captura con promoción.
+                    moves.extend(move | bits for bits in PROMOTION_BITS)
+                else:
+                    moves.append(move)
+            # En passant: si la casilla de destino es la casilla de en passant posible.
+            if en_passant == target:
+                moves.append(from_sq | (tr * 8 + tc) << 6 | EN_PASSANT_BITS)
         return moves
 
     @staticmethod
-    def _get_rook_moves(chessboard, start_pos, color):
+    def _get_target_moves(chessboard, from_sq, color, attacks):
         """
-        Genera los movimientos pseudo-legales para una torre.
+        Genera los movimientos pseudo-legales de una pieza a partir de su bitboard de ataques:
+        todas las casillas atacadas que no tienen pieza propia, marcando las capturas.
         """
         moves = []
-        sr, sc = start_pos
-        directions = [(0, 1), (0, -1), (1, 0), (-1, 0)] # Direcciones: derecha, izquierda, abajo, arriba.
-        for dr, dc in directions: # Itera sobre cada dirección.
-            for i in range(1, 8): # Itera sobre la distancia máxima (hasta 7 casillas).
-                er, ec = sr + dr * i, sc + dc * i # Calcula la casilla de destino.
-                if not (0 <= er < 8 and 0 <= ec < 8): # Si se sale del tablero.
-                    break
-                target_piece = chessboard.board[er][ec] # Pieza en la casilla de destino.
-                if target_piece == "--": # Si la casilla está vacía.
-                    moves.append((start_pos, (er, ec)))
-                elif target_piece[0] != color: # Si hay una pieza enemiga (captura).
-                    moves.append((start_pos, (er, ec)))
-                    break # La línea de visión se bloquea después de una captura.
-                else: # Pieza del mismo color (bloquea la línea de visión).
-                    break
+        enemy = chessboard.occupancy["b" if color == "w" else "w"]
+        targets = attacks & ~chessboard.occupancy[color] # Vacías o con pieza enemiga.
+        while targets:
+            lsb = targets & -targets # Aísla la casilla de menor índice.
+            move = from_sq | (lsb.bit_length() - 1) << 6
+            moves.append(move | CAPTURE_BITS if lsb & enemy else move)
+            targets ^= lsb
         return moves
 
+    @staticmethod
+    def _get_rook_moves(chessboard, start_pos, color):
+        """
+        Genera los movimientos pseudo-legales para una torre.
+        """
+        sq = start_pos[0] * 8 + start_pos[1]
+        attacks = ROOK_ATTACKS[sq][chessboard.all_occupancy & ROOK_MASKS[sq]] # Una sola consulta por torre.
+        return MoveGenerator._get_target_moves(chessboard, sq, color, attacks)
+
     @staticmethod
     def _get_knight_moves(chessboard, start_pos, color):
         """
         Genera los movimientos pseudo-legales para un caballo.
         """
-        moves = []
-        sr, sc = start_pos
-        knight_moves = [(2, 1), (2, -1), (-2, 1), (-2, -1), # Todos los movimientos en 'L'.
-                        (1, 2), (1, -2), (-1, 2), (-1, -2)]
-        for dr, dc in knight_moves: # Itera sobre cada movimiento de caballo.
-            er, ec = sr + dr, sc + dc # Calcula la casilla de destino.
-            if 0 <= er < 8 and 0 <= ec < 8: # Si la casilla está dentro del tablero.
-                target_piece = chessboard.board[er][ec] # Pieza en la casilla de destino.
-                if target_piece == "--" or target_piece[0] != color: # Si está vacía o hay una pieza enemiga.
-                    moves.append((start_pos, (er, ec)))
-        return moves
+        sq = start_pos[0] * 8 + start_pos[1]
+        return MoveGenerator._get_target_moves(chessboard, sq, color, KNIGHT_ATTACKS_BB[sq]) # Saltos en 'L'.
 
     @staticmethod
     def _get_bishop_moves(chessboard, start_pos, color):
         """
         Genera los movimientos pseudo-legales para un alfil.
         """
-        moves = []
-        sr, sc = start_pos
-        directions = [(1, 1), (1, -1), (-1, 1), (-1, -1)] # Direcciones diagonales.
-        for dr, dc in directions: # Itera sobre cada dirección diagonal.
-            for i in range(1, 8): # Itera sobre la distancia máxima.
-                er, ec = sr + dr * i, sc + dc * i # Calcula la casilla de destino.
-                if not (0 <= er < 8 and 0 <= ec < 8): # Si se sale del tablero.
-                    break
-                target_piece = chessboard.board[er][ec] # Pieza en la casilla de destino.
-                if target_piece == "--": # Si la casilla está vacía.
-                    moves.append((start_pos, (er, ec)))
-                elif target_piece[0] != color: # Si hay una pieza enemiga (captura).
-                    moves.append((start_pos, (er, ec)))
-                    break # La línea de visión se bloquea.
-                else: # Pieza del mismo color (bloquea la línea de visión).
-                    break
-        return moves
+        sq = start_pos[0] * 8 + start_pos[1]
+        attacks = BISHOP_ATTACKS[sq][chessboard.all_occupancy & BISHOP_MASKS[sq]] # Una sola consulta por alfil.
+        return MoveGenerator._get_target_moves(chessboard, sq, color, attacks)
 
     @staticmethod
     def _get_queen_moves(chessboard, start_pos, color):
@@ -152,62 +235,273 @@ class MoveGenerator:
         Genera los movimientos pseudo-legales para una reina.
         La reina combina los movimientos de torre y alfil.
         """
-        # Combina los movimientos generados por las funciones de torre y alfil.
-        return MoveGenerator._get_rook_moves(chessboard, start_pos, color) + \
-               MoveGenerator._get_bishop_moves(chessboard, start_pos, color)
+        sq = start_pos[0] * 8 + start_pos[1]
+        occupancy = chessboard.all_occupancy
+        # Coste constante: una consulta de torre y otra de alfil, sin recorrer las 8 líneas.
+        attacks = ROOK_ATTACKS[sq][occupancy & ROOK_MASKS[sq]] | BISHOP_ATTACKS[sq][occupancy & BISHOP_MASKS[sq]]
+        return MoveGenerator._get_target_moves(chessboard, sq, color, attacks)
 
     @staticmethod
     def _get_king_moves(chessboard, start_pos, color):
         """
         Genera los movimientos pseudo-legales para un rey (movimientos de una casilla).
         """
-        moves = []
-        sr, sc = start_pos
-        king_moves = [(1, 0), (-1, 0), (0, 1), (0, -1), # Movimientos adyacentes (horizontal, vertical, diagonal).
-                      (1, 1), (1, -1), (-1, 1), (-1, -1)]
-        for dr, dc in king_moves: # Itera sobre cada movimiento posible del rey.
-            er, ec = sr + dr, sc + dc # Calcula la casilla de destino.
-            if 0 <= er < 8 and 0 <= ec < 8: # Si la casilla está dentro del tablero.
-                target_piece = chessboard.board[er][ec] # Pieza en la casilla de destino.
-                if target_piece == "--" or target_piece[0] != color: # Si está vacía o hay una pieza enemiga.
-                    moves.append((start_pos, (er, ec)))
-        return moves
+        sq = start_pos[0] * 8 + start_pos[1]
+        return MoveGenerator._get_target_moves(chessboard, sq, color, KING_ATTACKS_BB[sq]) # Casillas adyacentes.
+
+    @staticmethod
+    def _find_checks_and_pins(chessboard, color):
+        """
+        Analiza la posición del rey una sola vez: quién le da jaque y qué piezas propias están clavadas.
+        Recorre las 8 líneas desde el rey y las casillas de caballo y peón que lo atacan.
+
+        Args:
+            chessboard (ChessBoard): La instancia del tablero de ajedrez.
+            color (str): El color del rey a analizar ('w' o 'b').
+
+        Returns:
+            tuple: (checkers, check_mask, pins, king_xray) donde
+                - checkers (list): casillas (índices 0..63) de las piezas que dan jaque.
+                - check_mask (int): bitboard de casillas donde una pieza (no rey) resuelve el jaque simple
+                  (capturar al atacante o interponerse).
+                - pins (dict): casilla de pieza clavada -> bitboard de la línea de clavada
+                  (entre el rey y el atacante, incluido este) por la que puede moverse.
+                - king_xray (int): bitboard de casillas detrás del rey en la línea de un atacante deslizante,
+                  que siguen atacadas cuando el rey se aparta.
+        """
+        board = chessboard.board
+        kr, kc = chessboard.white_king_pos if color == "w" else chessboard.black_king_pos
+        enemy = "b" if color == "w" else "w"
+        bitboards = chessboard.bitboards
+        checkers = []
+        check_mask = 0
+        pins = {}
+        king_xray = 0
+
+        # --- Peones y caballos: solo pueden dar jaque, no clavar ---
+        king_sq = kr * 8 + kc
+        attackers = (PAWN_ATTACKS_BB[color][king_sq] & bitboards[enemy + "p"]) | \
+                    (KNIGHT_ATTACKS_BB[king_sq] & bitboards[enemy + "n"])
+        while attackers:
+            lsb = attackers & -attackers
+            checkers.append(lsb.bit_length() - 1)
+            check_mask |= lsb
+            attackers ^= lsb
+
+        # --- Piezas deslizantes: jaques y clavadas a lo largo de las 8 líneas ---
+        queens = bitboards[enemy + "q"]
+        rook_sliders = bitboards[enemy + "r"] | queens
+        bishop_sliders = bitboards[enemy + "b"] | queens
+        rays = RAYS[king_sq]
+        rays_bb = RAYS_BB[king_sq]
+        for i in ALL_RAYS:
+            sliders = rook_sliders if i < 4 else bishop_sliders # Piezas que atacan en esta línea.
+            if not rays_bb[i] & sliders: # Sin atacantes en la línea: ni jaque ni clavada.
+                continue
+            ray = 0 # Casillas recorridas desde el rey.
+            blocker = None # Primera pieza propia encontrada (posible pieza clavada).
+            for nr, nc in rays[i]:
+                sq = nr * 8 + nc
+                ray |= 1 << sq
+                piece = board[nr][nc]
+                if piece != "--":
+                    if piece[0] == color:
+                        if blocker is not None: # Dos piezas propias: no hay clavada.
+                            break
+                        blocker = sq
+                    else:
+                        if sliders >> sq & 1:
+                            if blocker is None: # Jaque directo.
+                                checkers.append(sq)
+                                check_mask |= ray
+                                dr, dc = DIRECTIONS[i]
+                                xr, xc = kr - dr, kc - dc # El rey no puede retroceder por la misma línea.
+                                if 0 <= xr < 8 and 0 <= xc < 8:
+                                    king_xray |= 1 << (xr * 8 + xc)
+                            else: # La pieza propia está clavada contra el rey.
+                                pins[blocker] = ray
+                        break
+
+        return checkers, check_mask, pins, king_xray
 
     @staticmethod
     def generate_legal_moves(chessboard, color):
         """
-        Genera movimientos legales reales para un color dado.
-        - Parte de los movimientos pseudo-legales.
-        - Hace y deshace cada movimiento en el tablero temporalmente.
-        - Elimina los movimientos que dejan al propio rey en jaque.
-        
+        Genera movimientos legales reales para un color dado, sin hacer y deshacer cada movimiento.
+        - Calcula una sola vez las piezas que dan jaque y las piezas clavadas.
+        - En jaque doble solo se generan movimientos de rey.
+        - En jaque simple, las demás piezas solo pueden capturar al atacante o interponerse.
+        - Las piezas clavadas solo se mueven a lo largo de la línea de la clavada.
+        - El rey no puede ir a casillas atacadas (ni retroceder en la línea de un atacante deslizante).
+        - El en passant, que puede descubrir un jaque al retirar dos peones de la misma fila,
+          se verifica simulándolo en el tablero.
+
         Args:
             chessboard (ChessBoard): La instancia del tablero de ajedrez.
             color (str): El color del jugador ('w' para blancas o 'b' para negras).
             
         Returns:
-            list: Una lista de tuplas, donde cada tupla representa un movimiento ((start_row, start_col), (end_row, end_col)).
+            list: Una lista de movimientos codificados como enteros (ver chessLogic/move.py).
         """
+        board = chessboard.board
+        enemy = "b" if color == "w" else "w"
+        checkers, check_mask, pins, king_xray = MoveGenerator._find_checks_and_pins(chessboard, color)
+        in_check = len(checkers) > 0
+        double_check = len(checkers) > 1
         legal_moves = [] # Lista para almacenar los movimientos legales.
-        # Obtiene todos los movimientos pseudo-legales.
-        pseudo_moves = MoveGenerator.generate_pseudo_legal_moves(chessboard, color)
 
-        for start, end in pseudo_moves: # Itera sobre cada movimiento pseudo-legal.
-            # Crear un objeto Move para el movimiento actual.
-            move = Move(start, end, chessboard)
-            
-            # Simular el movimiento en el tablero.
-            chessboard.make_move(move)
+        for r in range(8): # Recorre el tablero en el mismo orden que generate_pseudo_legal_moves.
+            for c in range(8):
+                piece = board[r][c]
+                if piece == "--" or piece[0] != color:
+                    continue
+                p_type = piece[1]
 
-            # Verificar si el rey del color actual está en jaque después del movimiento.
-            if not ChessRules.is_in_check(chessboard, color):
-                legal_moves.append((start, end)) # Si no está en jaque, el movimiento es legal.
+                if p_type == "k": # El rey: casillas no atacadas.
+                    for move in MoveGenerator._get_king_moves(chessboard, (r, c), color):
+                        to_sq = (move >> 6) & 63
+                        if not king_xray >> to_sq & 1 and \
+                                not ChessRules.is_square_attacked(chessboard, SQUARE_COORDS[to_sq], enemy):
+                            legal_moves.append(move)
+                    if not in_check: # can_castle ya comprueba las casillas atacadas.
+                        king_sq = r * 8 + c
+                        if ChessRules.can_castle(chessboard, color, kingside=True):
+                            legal_moves.append(king_sq | (king_sq + 2) << 6 | KING_CASTLE_BITS)
+                        if ChessRules.can_castle(chessboard, color, kingside=False):
+                            legal_moves.append(king_sq | (king_sq - 2) << 6 | QUEEN_CASTLE_BITS)
+                    continue
+
+                if double_check: # En jaque doble solo puede moverse el rey.
+                    continue
 
-            # Revertir el movimiento para restaurar el estado del tablero.
-            chessboard.undo_move()
+                if p_type == "p":
+                    piece_moves = MoveGenerator._get_pawn_moves(chessboard, (r, c), color)
+                elif p_type == "r":
+                    piece_moves = MoveGenerator._get_rook_moves(chessboard, (r, c), color)
+                elif p_type == "n":
+                    piece_moves = MoveGenerator._get_knight_moves(chessboard, (r, c), color)
+                elif p_type == "b":
+                    piece_moves = MoveGenerator._get_bishop_moves(chessboard, (r, c), color)
+                else:
+                    piece_moves = MoveGenerator._get_queen_moves(chessboard, (r, c), color)
+
+                pin_ray = pins.get(r * 8 + c) # Línea por la que puede moverse si está clavada.
+                for move in piece_moves:
+                    if move >> 12 == EN_PASSANT:
+                        # En passant: simularlo es la forma segura de detectar jaques descubiertos.
+                        chessboard.make_move(move)
+                        if not ChessRules.is_in_check(chessboard, color):
+                            legal_moves.append(move)
+                        chessboard.undo_move()
+                        continue
+                    to_bit = 1 << ((move >> 6) & 63)
+                    if in_check and not to_bit & check_mask: # No resuelve el jaque.
+                        continue
+                    if pin_ray is not None and not to_bit & pin_ray: # Rompería la clavada.
+                        continue
+                    legal_moves.append(move)
 
         return legal_moves # Devuelve la lista de movimientos legales.
 
+    @staticmethod
+    def generate_captures(chessboard, color):
+        """
+        Genera solo los movimientos tácticos legales para la búsqueda de quiescencia: capturas
+        (incluido en passant) y promociones a dama, con o sin captura. Las promociones menores no se generan.
+        Trabaja directamente con bitboards (ataques & piezas enemigas) y aplica los mismos filtros de
+        jaque y clavadas que generate_legal_moves, sin recorrer el tablero ni hacer y deshacer movimientos
+        (salvo el en passant, que se simula).
+
+        Args:
+            chessboard (ChessBoard): La instancia del tablero de ajedrez.
+            color (str): El color del jugador ('w' para blancas o 'b' para negras).
+
+        Returns:
+            list: Una lista de movimientos codificados como enteros (ver chessLogic/move.py).
+        """
+        bitboards = chessboard.bitboards
+        occupancy = chessboard.all_occupancy
+        enemy = "b" if color == "w" else "w"
+        targets_mask = chessboard.occupancy[enemy] & ~bitboards[enemy + "k"] # Piezas capturables.
+        checkers, check_mask, pins, king_xray = MoveGenerator._find_checks_and_pins(chessboard, color)
+        captures = []
+
+        # --- Rey: capturas a casillas no defendidas ---
+        king_sq = bitboards[color + "k"].bit_length() - 1
+        targets = KING_ATTACKS_BB[king_sq] & targets_mask
+        while targets:
+            lsb = targets & -targets
+            to_sq = lsb.bit_length() - 1
+            if not king_xray & lsb and not ChessRules.is_square_attacked(chessboard, SQUARE_COORDS[to_sq], enemy):
+                captures.append(king_sq | to_sq << 6 | CAPTURE_BITS)
+            targets ^= lsb
+        if len(checkers) > 1: # En jaque doble solo puede moverse el rey.
+            return captures
+
+        push_mask = FULL_BOARD # Casillas vacías a las que puede promocionar un peón.
+        if checkers: # En jaque simple: capturar al atacante o interponerse (check_mask).
+            targets_mask &= check_mask
+            push_mask = check_mask
+
+        # --- Peones: capturas y promociones a dama ---
+        pawns = bitboards[color + "p"]
+        last_row = 0 if color == "w" else 7
+        step = -8 if color == "w" else 8 # Avance de una fila.
+        queen_bits = PROMOTION_BITS[0]
+        pawn_attacks = PAWN_ATTACKS_BB[color]
+        while pawns:
+            lsb = pawns & -pawns
+            from_sq = lsb.bit_length() - 1
+            pawns ^= lsb
+            pin_ray = pins.get(from_sq, FULL_BOARD) # Línea por la que puede moverse si está clavado.
+            promotes = (from_sq + step) >> 3 == last_row
+            targets = pawn_attacks[from_sq] & targets_mask & pin_ray
+            while targets:
+                t = targets & -targets
+                move = from_sq | (t.bit_length() - 1) << 6 | CAPTURE_BITS
+                captures.append(move | queen_bits if promotes else move)
+                targets ^= t
+            if promotes:
+                to_bit = 1 << (from_sq + step)
+                if not occupancy & to_bit and to_bit & push_mask & pin_ray:
+                    captures.append(from_sq | (from_sq + step) << 6 | queen_bits)
+
+        en_passant = chessboard.en_passant_square
+        if en_passant is not None:
+            ep_sq = en_passant[0] * 8 + en_passant[1]
+            attackers = PAWN_ATTACKS_BB[enemy][ep_sq] & bitboards[color + "p"] # Peones propios que atacan la casilla.
+            while attackers:
+                lsb = attackers & -attackers
+                move = (lsb.bit_length() - 1) | ep_sq << 6 | EN_PASSANT_BITS
+                # Igual que en generate_legal_moves: simularlo detecta los jaques descubiertos.
+                chessboard.make_move(move)
+                if not ChessRules.is_in_check(chessboard, color):
+                    captures.append(move)
+                chessboard.undo_move()
+                attackers ^= lsb
+
+        # --- Caballos y piezas deslizantes: ataques & piezas enemigas ---
+        queens = bitboards[color + "q"]
+        for pieces, kind in ((bitboards[color + "n"], "n"), (bitboards[color + "b"] | queens, "b"),
+                             (bitboards[color + "r"] | queens, "r")):
+            while pieces:
+                lsb = pieces & -pieces
+                from_sq = lsb.bit_length() - 1
+                pieces ^= lsb
+                if kind == "n":
+                    attacks = KNIGHT_ATTACKS_BB[from_sq]
+                elif kind == "b":
+                    attacks = BISHOP_ATTACKS[from_sq][occupancy & BISHOP_MASKS[from_sq]]
+                else:
+                    attacks = ROOK_ATTACKS[from_sq][occupancy & ROOK_MASKS[from_sq]]
+                targets = attacks & targets_mask & pins.get(from_sq, FULL_BOARD)
+                while targets:
+                    t = targets & -targets
+                    captures.append(from_sq | (t.bit_length() - 1) << 6 | CAPTURE_BITS)
+                    targets ^= t
+
+        return captures
+
     @staticmethod
     def has_any_legal_moves(chessboard, color):
         """
@@ -225,13 +519,10 @@ class MoveGenerator:
         # Optimización: solo necesitamos encontrar UN movimiento legal.
         pseudo_moves = MoveGenerator.generate_pseudo_legal_moves(chessboard, color)
 
-        for start, end in pseudo_moves: # Itera sobre cada movimiento pseudo-legal.
-            move = Move(start, end, chessboard) # Crea un objeto Move.
+        for move in pseudo_moves: # Itera sobre cada movimiento pseudo-legal.
             chessboard.make_move(move) # Simula el movimiento.
             if not ChessRules.is_in_check(chessboard, color): # Si el rey no está en jaque después del movimiento.
                 chessboard.undo_move() # Revertir antes de retornar.
                 return True # Se encontró al menos un movimiento legal.
             chessboard.undo_move() # Revertir el movimiento.
         return False # No se encontró ningún movimiento legal.
-
-
@@ -0,0 +1,204 @@
+# IA/perft.py
+# Perft: cuenta las posiciones alcanzables a una profundidad dada.
+# Sirve para comprobar que la generación de movimientos es correcta (los recuentos de las posiciones
+# de referencia son conocidos) y para medir su velocidad en nodos por segundo.
+#
+# Uso: python -m IA.perft --position kiwipete --depth 3 [--divide] [--hash] [--workers 4] [--generator rules]
+#      python -m IA.perft --suite --depth 3
+import argparse # Argumentos de la línea de comandos.
+import time # Medición de tiempos para los nodos por segundo.
+from concurrent.futures import ProcessPoolExecutor # Reparto de los movimientos raíz entre procesos.
+from chessLogic.chessboard import ChessBoard # Tablero sobre el que se hacen y deshacen los movimientos.
+from chessLogic.fen import START_FEN # Posición inicial en FEN.
+from chessLogic.move import PROMOTION, PROMOTION_FLAGS, move_to_uci # Codificación entera de movimientos.
+from IA.move_generator import MoveGenerator # Generador de movimientos legales de la IA.
+
+# Posiciones de referencia (https://www.chessprogramming.org/Perft_Results) y sus recuentos por profundidad.
+REFERENCE_POSITIONS = {
+    "start": (START_FEN, [20, 400, 8902, 197281, 4865609]),
+    "kiwipete": ("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+                 [48, 2039, 97862, 4085603]),
+    "position3": ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", [14, 191, 2812, 43238, 674624]),
+    "position4": ("r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", [6, 264, 9467, 422333]),
+    "position5": ("rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", [44, 1486, 62379, 2103487]),
+}
+
+GENERATORS = ("movegen", "rules") # IA/move_generator.MoveGenerator o chessLogic (get_all_moves + filtro de jaque).
+
+
+def legal_moves(board, generator="movegen"):
+    """
+    Devuelve los movimientos legales del turno actual, codificados como enteros.
+
+    Args:
+        board (ChessBoard): La instancia del tablero de ajedrez.
+        generator (str): 'movegen' para MoveGenerator.generate_legal_moves o 'rules' para
+                         ChessBoard.get_legal_moves (basado en chessLogic/utils.get_all_moves).
+
+    Returns:
+        list: Los movimientos legales. Con 'rules' cada promoción se expande a las cuatro piezas,
+              porque la interfaz elige la pieza después de generar el movimiento.
+    """
+    if generator == "movegen":
+        return MoveGenerator.generate_legal_moves(board, board.turn)
+    moves = []
+    for move in board.get_legal_moves():
+        encoded = move.to_int()
+        if encoded >> 12 & PROMOTION:
+            base = encoded & ~((PROMOTION | 3) << 12) # Sin la pieza de promoción (conserva la captura).
+            moves.extend(base | PROMOTION_FLAGS[piece] << 12 for piece in "qrbn")
+        else:
+            moves.append(encoded)
+    return moves
+
+
+def perft(board, depth, generator="movegen", table=None):
+    """
+    Cuenta las posiciones hoja a la profundidad dada.
+
+    Args:
+        board (ChessBoard): La instancia del tablero de ajedrez (se deja como estaba).
+        depth (int): Profundidad en medias jugadas.
+        generator (str, optional): Generador de movimientos ('movegen' o 'rules').
+        table (dict, optional): Tabla hash (clave de Zobrist, profundidad) -> nodos, para no recontar
+                                transposiciones. None para no usarla.
+
+    Returns:
+        int: El número de nodos hoja.
+    """
+    if depth == 0:
+        return 1
+    if table is not None:
+        key = (board.zobrist_key, depth)
+        nodes = table.get(key)
+        if nodes is not None:
+            return nodes
+    moves = legal_moves(board, generator)
+    if depth == 1: # Recuento directo: no hace falta hacer cada movimiento.
+        nodes = len(moves)
+    else:
+        nodes = 0
+        for move in moves:
+            board.make_move(move)
+            nodes += perft(board, depth - 1, generator, table)
+            board.undo_move()
+    if table is not None:
+        table[key] = nodes
+    return nodes
+
+
+def divide(board, depth, generator="movegen", table=None):
+    """
+    Perft desglosado por movimiento raíz, para localizar diferencias con otro motor.
+
+    Returns:
+        list: Tuplas (movimiento en notación UCI, nodos) en el orden de generación.
+    """
+    results = []
+    for move in legal_moves(board, generator):
+        board.make_move(move)
+        results.append((move_to_uci(move), perft(board, depth - 1, generator, table)))
+        board.undo_move()
+    return results
+
+
+def _perft_root_move(fen, move, depth, generator, use_hash):
+    """
+    Tarea de un proceso del pool: carga la posición, juega un movimiento raíz y cuenta su subárbol.
+    """
+    board = ChessBoard.from_fen(fen)
+    board.make_move(move)
+    return move_to_uci(move), perft(board, depth - 1, generator, {} if use_hash else None)
+
+
+def parallel_divide(fen, depth, generator="movegen", use_hash=False, workers=None):
+    """
+    Divide repartiendo los movimientos raíz entre procesos. Cada proceso recibe la posición en FEN
+    (no el tablero) y, si se pide, usa su propia tabla hash.
+
+    Args:
+        fen (str): La posición en notación FEN.
+        depth (int): Profundidad en medias jugadas (>= 1).
+        generator (str, optional): Generador de movimientos.
+        use_hash (bool, optional): Si cada proceso usa una tabla hash.
+        workers (int, optional): Número de procesos (por defecto, uno por núcleo).
+
+    Returns:
+        list: Tuplas (movimiento en notación UCI, nodos) en el orden de generación.
+    """
+    board = ChessBoard.from_fen(fen)
+    moves = legal_moves(board, generator)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_perft_root_move, fen, move, depth, generator, use_hash) for move in moves]
+        return [future.result() for future in futures]
+
+
+def run_perft(fen, depth, generator="movegen", use_hash=False, workers=1, show_divide=False):
+    """
+    Ejecuta perft sobre una posición, imprime el resultado y los nodos por segundo.
+
+    Args:
+        fen (str): La posición en notación FEN.
+        depth (int): Profundidad en medias jugadas.
+        generator (str, optional): Generador de movimientos ('movegen' o 'rules').
+        use_hash (bool, optional): Usar la tabla hash de perft.
+        workers (int, optional): Procesos; con más de uno se reparten los movimientos raíz.
+        show_divide (bool, optional): Imprimir el recuento de cada movimiento raíz.
+
+    Returns:
+        tuple: (nodos, segundos).
+    """
+    start = time.perf_counter()
+    if workers > 1 and depth > 1:
+        results = parallel_divide(fen, depth, generator, use_hash, workers)
+    elif show_divide and depth > 0:
+        results = divide(ChessBoard.from_fen(fen), depth, generator, {} if use_hash else None)
+    else:
+        results = [(None, perft(ChessBoard.from_fen(fen), depth, generator, {} if use_hash else None))]
+    elapsed = time.perf_counter() - start
+    nodes = sum(count for _, count in results)
+
+    if show_divide:
+        for uci, count in results:
+            print(f"{uci}: {count}")
+    nps = nodes / elapsed if elapsed > 0 else 0.0
+    print(f"perft({depth}) = {nodes} en {elapsed:.3f}s ({nps:,.0f} nodos/s)")
+    return nodes, elapsed
+
+
+def run_suite(max_depth, generator="movegen", use_hash=False, workers=1):
+    """
+    Comprueba todas las posiciones de referencia hasta max_depth contra sus recuentos conocidos.
+
+    Returns:
+        bool: True si todos los recuentos coinciden.
+    """
+    ok = True
+    for name, (fen, expected) in REFERENCE_POSITIONS.items():
+        for depth in range(1, min(max_depth, len(expected)) + 1):
+            print(f"{name} ", end="")
+            nodes, _ = run_perft(fen, depth, generator, use_hash, workers)
+            if nodes != expected[depth - 1]:
+                print(f"❌ {name} perft({depth}): {nodes} != {expected[depth - 1]}")
+                ok = False
+    print("✅ Todos los recuentos coinciden" if ok else "❌ Hay recuentos incorrectos")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Perft y divide sobre ChessBoard.")
+    parser.add_argument("--fen", help="Posición en notación FEN.")
+    parser.add_argument("--position", choices=sorted(REFERENCE_POSITIONS), default="start",
+                        help="Posición de referencia (si no se indica --fen).")
+    parser.add_argument("--depth", type=int, default=3, help="Profundidad en medias jugadas.")
+    parser.add_argument("--generator", choices=GENERATORS, default="movegen", help="Generador de movimientos.")
+    parser.add_argument("--divide", action="store_true", help="Mostrar los nodos de cada movimiento raíz.")
+    parser.add_argument("--hash", action="store_true", help="Usar tabla hash para las transposiciones.")
+    parser.add_argument("--workers", type=int, default=1, help="Procesos para repartir los movimientos raíz.")
+    parser.add_argument("--suite", action="store_true", help="Comprobar todas las posiciones de referencia.")
+    args = parser.parse_args()
+
+    if args.suite:
+        raise SystemExit(0 if run_suite(args.depth, args.generator, args.hash, args.workers) else 1)
+    run_perft(args.fen or REFERENCE_POSITIONS[args.position][0], args.depth, args.generator,
+              args.hash, args.workers, args.divide)
@@ -0,0 +1,151 @@
+# IA/ponder.py
+# Búsqueda en el tiempo del rival ("pondering").
+# Después de jugar, la IA predice la respuesta del rival (el segundo movimiento de la variante principal
+# de su búsqueda) y, en un hilo, busca la posición resultante mientras el rival piensa:
+# - Si el rival juega lo previsto (ponder hit), la búsqueda en curso pasa a ser la de la jugada: recibe su
+#   presupuesto de tiempo con search.ponder_hit y continúa con las iteraciones ya completadas.
+# - Si juega otra cosa (ponder miss), se cancela con un evento; la tabla de transposiciones conserva lo
+#   buscado y la búsqueda normal empieza en el acto.
+# Se usa un hilo y no un proceso para compartir el contexto (tabla, killer moves, history heuristic) sin copias:
+# el GIL reparte la CPU con la interfaz, que apenas la usa mientras espera al jugador.
+import copy # El hilo busca sobre su propia copia del tablero.
+import threading # Hilo de la búsqueda y evento de cancelación.
+from IA import search # get_best_move en modo ponder y ponder_hit.
+from IA.move_generator import MoveGenerator # Legalidad de la respuesta prevista.
+from chessLogic.move import Move as MoveClass # La interfaz trabaja con objetos Move.
+
+PONDER_MAX_DEPTH = 64 # Profundidad máxima en el tiempo del rival (en la práctica, hasta que el rival juega).
+
+
+def predict_reply(board, context):
+    """
+    Predice la respuesta del rival: la continuación de la variante principal de la última búsqueda
+    si empezaba por el último movimiento jugado o, si no, el mejor movimiento que la tabla de
+    transposiciones guarda para la posición.
+
+    Args:
+        board (ChessBoard): La posición tras la jugada de la IA (mueve el rival).
+        context (SearchContext): El contexto de la partida.
+
+    Returns:
+        int | None: El movimiento previsto (legal), o None si la tabla no tiene ninguno.
+    """
+    pv = context.pv
+    if len(pv) >= 2 and board.move_log and pv[0] == board.move_log[-1]:
+        move = pv[1]
+    else:
+        entry = context.transposition_table.probe(board.zobrist_key)
+        if entry is None or entry[3] is None:
+            return None
+        move = entry[3]
+    return move if move in MoveGenerator.generate_legal_moves(board, board.turn) else None
+
+
+class Ponderer:
+    """
+    Búsqueda en el tiempo del rival de una partida. La interfaz llama a start() después de cada jugada
+    de la IA, a finish() cuando vuelve a ser su turno y a stop() si la partida termina o se reinicia.
+    """
+
+    def __init__(self, context, max_depth=PONDER_MAX_DEPTH, workers=1, on_info=None):
+        """
+        Args:
+            context (SearchContext): El contexto de la partida (el mismo que usan las búsquedas normales).
+            max_depth (int, optional): Profundidad máxima de la búsqueda (también tras acertar).
+            workers (int, optional): Procesos de la búsqueda (ver get_best_move).
+            on_info (callable, optional): Recibe el SearchInfo de cada iteración (ver get_best_move).
+        """
+        self.context = context
+        self.max_depth = max_depth
+        self.workers = workers
+        self.on_info = on_info
+        self.thread = None
+        self.stop_event = None
+        self.board = None # Copia del tablero con la respuesta prevista ya jugada (la búsqueda la modifica).
+        self.ponder_position = None # (medias jugadas, clave de Zobrist) de esa copia al empezar.
+        self.ponder_move = None # Respuesta prevista del rival (entero).
+        self.result = None # Movimiento que devolvió la búsqueda del hilo.
+        self.saved_position = None # (last_ply, last_key) del contexto antes de empezar.
+        self.hits = 0
+        self.misses = 0
+
+    def is_active(self):
+        """
+        Indica si hay una búsqueda en el tiempo del rival en marcha (o terminada y sin recoger).
+        """
+        return self.thread is not None
+
+    def start(self, board):
+        """
+        Empieza a buscar en segundo plano la posición tras la respuesta prevista del rival.
+
+        Args:
+            board (ChessBoard): La posición tras la jugada de la IA (no se modifica).
+
+        Returns:
+            bool: True si se empezó a buscar; False si no hay respuesta prevista.
+        """
+        self.stop()
+        reply = predict_reply(board, self.context)
+        if reply is None:
+            return False
+        self.ponder_move = reply
+        self.board = copy.deepcopy(board)
+        self.board.make_move(reply)
+        self.ponder_position = (len(self.board.move_log), self.board.zobrist_key)
+        self.saved_position = (self.context.last_ply, self.context.last_key)
+        self.result = None
+        self.stop_event = threading.Event()
+        search.start_pondering()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return True
+
+    def _run(self):
+        """
+        Cuerpo del hilo: búsqueda sin límite de tiempo hasta ponder_hit, max_depth o la cancelación.
+        """
+        self.result = search.get_best_move(self.board, max_depth=self.max_depth, time_limit=None,
+                                           context=self.context, workers=self.workers,
+                                           ponder=True, stop=self.stop_event, on_info=self.on_info)
+
+    def finish(self, board, time_manager):
+        """
+        Recoge la búsqueda al llegar el turno de la IA. Si el rival jugó lo previsto, la búsqueda continúa
+        con el presupuesto de time_manager y se devuelve su movimiento; si no, se cancela.
+
+        Args:
+            board (ChessBoard): La posición real (mueve la IA).
+            time_manager (TimeManager): Presupuesto de tiempo de la jugada.
+
+        Returns:
+            MoveClass | None: El movimiento para la posición real, o None si no hubo acierto
+                              (hay que buscar con get_best_move).
+        """
+        if self.thread is None:
+            return None
+        if (len(board.move_log), board.zobrist_key) != self.ponder_position:
+            self.misses += 1
+            self.stop()
+            return None
+
+        self.hits += 1
+        if self.thread.is_alive(): # Si el hilo ya terminó (max_depth o mate), su resultado vale tal cual.
+            search.ponder_hit(board, time_manager)
+        self.thread.join()
+        self.thread = None
+        move = self.result
+        # El movimiento es del tablero copiado: se reconstruye sobre el real.
+        return MoveClass.from_int(move.to_int(), board) if move is not None else None
+
+    def stop(self):
+        """
+        Cancela la búsqueda en curso, si la hay, y espera a que el hilo termine. El contexto vuelve a la
+        posición de la última búsqueda real, para que la siguiente no se tome por una partida distinta.
+        """
+        if self.thread is None:
+            return
+        self.stop_event.set()
+        self.thread.join()
+        self.thread = None
+        self.context.last_ply, self.context.last_key = self.saved_position
@@ -0,0 +1,187 @@
+# IA/root_split.py
+# Búsqueda paralela por reparto de los movimientos raíz, determinista, para análisis a profundidad fija.
+# A diferencia de Lazy SMP (IA/smp.py), el resultado no depende del número de procesos ni de cuál termina
+# antes: con workers=1 las tareas se ejecutan en serie, en el propio proceso.
+#
+# Las dos búsquedas usan el modo análisis de IA/search.py (ver analysis_search): sin podas ni reducciones que
+# dependan de la ventana, el valor exacto de un movimiento raíz no depende de alfa, del orden ni del contenido
+# de la tabla de transposiciones, y a igual puntuación gana el movimiento que el generador produce antes.
+# Por eso el resultado es el de minimax(board, depth, ...) con search.analysis_mode activado.
+#
+# 1. Una búsqueda en serie poco profunda (profundización iterativa hasta depth - 1) elige el primer movimiento
+#    raíz, que se busca también en serie a la profundidad completa: fija alfa.
+# 2. El resto se reparte en un ProcessPoolExecutor. Cada tarea recibe la posición en FEN y su movimiento,
+#    lee el alfa compartido (un valor de multiprocessing.Manager), busca con search.search_root_move y, si
+#    mejora alfa, lo sube para las tareas que empiecen después.
+#
+# Uso: python -m IA.root_split --depth 4 [--workers 4] [--fen "..." | --epd posiciones.epd]
+import argparse # Argumentos de la línea de comandos.
+import contextlib # Estado global de la búsqueda del llamador y cerrojo nulo en serie.
+import time # Medición de tiempos.
+import types # Alfa compartido en serie (sin Manager).
+from concurrent.futures import ProcessPoolExecutor # Reparto de los movimientos raíz entre procesos.
+from multiprocessing import Manager # Alfa compartido entre procesos.
+from chessLogic.chessboard import ChessBoard # Cada tarea reconstruye el tablero desde FEN.
+from chessLogic.fen import START_FEN, board_to_fen, iter_fen_file # Posiciones en FEN/EPD.
+from chessLogic.move import move_to_uci # Movimientos en notación UCI.
+from IA import search # Funciones y estado global de la búsqueda.
+from IA.move_generator import MoveGenerator # Movimientos legales de la raíz.
+
+ROOT_SPLIT_TT_MB = 4 # Tabla de transposiciones de cada tarea (se crea vacía en cada una).
+
+
+@contextlib.contextmanager
+def _analysis_context(board):
+    """
+    Activa un contexto de búsqueda vacío, en modo análisis y sin límite de tiempo, con la raíz en board:
+    cada búsqueda parte del mismo estado. Al salir restaura el estado global de la búsqueda del llamador
+    (con workers=1 todo se ejecuta en su proceso).
+    """
+    saved = (search.transposition_table, search.killer_moves, search.history_heuristic, search.search_stats,
+             search.deadline, search.stop_event, search.poll_countdown, search.root_ply,
+             search.pv_moves, search.analysis_mode)
+    context = search.SearchContext(ROOT_SPLIT_TT_MB)
+    search.activate_context(context)
+    search.deadline = None
+    search.stop_event = None
+    search.poll_countdown = search.POLL_INTERVAL
+    search.root_ply = len(board.move_log)
+    search.pv_moves = {}
+    search.analysis_mode = True
+    try:
+        yield context
+    finally:
+        (search.transposition_table, search.killer_moves, search.history_heuristic, search.search_stats,
+         search.deadline, search.stop_event, search.poll_countdown, search.root_ply,
+         search.pv_moves, search.analysis_mode) = saved
+
+
+def _search_root_move(fen, move, rank, depth, shared_alpha, lock):
+    """
+    Tarea de un proceso del pool: busca un movimiento raíz con search.search_root_move frente al alfa
+    compartido y lo sube si lo mejora.
+
+    Returns:
+        tuple: (move, rank, score, nodos); score es desde el punto de vista del bando que mueve en la raíz
+               y solo es exacto si supera el alfa leído menos NULL_WINDOW.
+    """
+    board = ChessBoard.from_fen(fen)
+    with _analysis_context(board) as context:
+        score = search.search_root_move(board, move, depth, shared_alpha.value)
+    with lock:
+        if score > shared_alpha.value:
+            shared_alpha.value = score
+    return move, rank, score, context.stats["nodes"] + context.stats["qnodes"]
+
+
+class RootSplitSearch:
+    """
+    Pool de procesos reutilizable para analizar varias posiciones seguidas.
+    Se usa como gestor de contexto: with RootSplitSearch(4) as splitter: splitter.search(board, 4).
+    """
+
+    def __init__(self, workers=None):
+        """
+        Args:
+            workers (int, optional): Procesos del pool (por defecto, uno por núcleo). Con 1 no se crea
+                                     el pool: las tareas se ejecutan en serie en este proceso.
+        """
+        self.executor = ProcessPoolExecutor(max_workers=workers) if workers != 1 else None
+        self.manager = Manager() if self.executor is not None else None # Alfa compartido entre procesos.
+        self.nodes = 0 # Nodos de la última búsqueda (todos los procesos).
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Cierra el pool y el proceso del Manager.
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.manager.shutdown()
+
+    def search(self, board, depth):
+        """
+        Busca la posición a profundidad fija repartiendo los movimientos raíz.
+
+        Args:
+            board (ChessBoard): La posición (no se modifica).
+            depth (int): Profundidad en medias jugadas (>= 1).
+
+        Returns:
+            tuple: (score, best_move) con score desde el punto de vista de las blancas, como minimax
+                   en modo análisis.
+        """
+        sign = 1 if board.turn == "w" else -1
+        with _analysis_context(board) as context:
+            moves = MoveGenerator.generate_legal_moves(board, board.turn)
+            if not moves or depth <= 0: # Mate, ahogado u hoja: no hay nada que repartir.
+                score, move = search.negamax(board, depth, float('-inf'), float('inf'))
+                self.nodes = context.stats["nodes"] + context.stats["qnodes"]
+                return sign * score, move
+            ranks = {m: i for i, m in enumerate(moves)}
+
+            # 1. Búsqueda en serie poco profunda para ordenar la raíz; su mejor movimiento se busca el primero,
+            #    a la profundidad completa (con la tabla ya caliente).
+            pv_move = None
+            for shallow_depth in range(1, depth):
+                pv_move = search.analysis_search(board, shallow_depth)[1]
+            moves = search.order_moves(board, moves, depth, pv_move)
+            best_score = search.search_root_move(board, moves[0], depth, float('-inf'))
+            best_move = moves[0]
+            self.nodes = context.stats["nodes"] + context.stats["qnodes"]
+
+        # 2. El resto, en paralelo frente al alfa compartido.
+        fen = board_to_fen(board)
+        if self.executor is None: # En serie, en este proceso.
+            shared_alpha, lock = types.SimpleNamespace(value=best_score), contextlib.nullcontext()
+            tasks = [(fen, move, ranks[move], depth, shared_alpha, lock) for move in moves[1:]]
+            results = (_search_root_move(*task) for task in tasks)
+        else:
+            shared_alpha, lock = self.manager.Value("d", best_score), self.manager.Lock()
+            tasks = [(fen, move, ranks[move], depth, shared_alpha, lock) for move in moves[1:]]
+            futures = [self.executor.submit(_search_root_move, *task) for task in tasks]
+            results = (future.result() for future in futures)
+        for move, rank, score, nodes in results:
+            self.nodes += nodes
+            # Una puntuación que no supera su alfa menos NULL_WINDOW tampoco alcanza a la mejor: el
+            # criterio no depende de qué tarea terminó antes.
+            if search.is_better_root_move(score, rank, best_score, ranks[best_move]):
+                best_score, best_move = score, move
+        return sign * best_score, best_move
+
+
+def root_split_search(board, depth, workers=None):
+    """
+    Busca una posición a profundidad fija repartiendo los movimientos raíz entre procesos.
+    Para varias posiciones conviene reutilizar el pool con RootSplitSearch.
+
+    Returns:
+        tuple: (score, best_move) con score desde el punto de vista de las blancas, como minimax;
+               el mismo resultado para cualquier número de procesos y el de minimax en modo análisis.
+    """
+    with RootSplitSearch(workers) as splitter:
+        return splitter.search(board, depth)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Análisis a profundidad fija repartiendo los movimientos raíz.")
+    parser.add_argument("--fen", default=START_FEN, help="Posición en notación FEN.")
+    parser.add_argument("--epd", help="Archivo FEN/EPD con una posición por línea (en lugar de --fen).")
+    parser.add_argument("--depth", type=int, default=4, help="Profundidad en medias jugadas.")
+    parser.add_argument("--workers", type=int, help="Procesos (por defecto, uno por núcleo).")
+    args = parser.parse_args()
+
+    positions = iter_fen_file(args.epd) if args.epd else [(ChessBoard.from_fen(args.fen), {})]
+    with RootSplitSearch(args.workers) as splitter:
+        for board, operations in positions:
+            start = time.perf_counter()
+            score, move = splitter.search(board, args.depth)
+            elapsed = time.perf_counter() - start
+            label = operations.get("id", board_to_fen(board))
+            print(f"{label}: {move_to_uci(move) if move else '-'} {score} "
+                  f"({splitter.nodes} nodos en {elapsed:.2f}s)")
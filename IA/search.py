@@ -1,30 +1,289 @@
 # IA/search.py
+import math # Logaritmos para la tabla de reducciones de LMR.
 import time # Importa el módulo time para medir el tiempo de ejecución.
 from IA.evaluation import evaluate_board, piece_values # Importa la función de evaluación y los valores de las piezas.
 from IA.move_generator import MoveGenerator # Importa la clase MoveGenerator para obtener movimientos.
 from chessLogic.move import Move as MoveClass # Importa la clase Move (renombrada para evitar conflictos).
+from chessLogic.move import CAPTURE, PROMOTION, PROMOTION_PIECES, NULL_MOVE, move_to_uci # Banderas de la codificación entera de movimientos.
 from chessLogic.rules import ChessRules # Importa ChessRules para verificar jaques y enroques.
+from IA.transposition import ( # Tabla de transposiciones acotada (y su versión en memoria compartida).
+    TranspositionTable, SharedTranspositionTable, EXACT, LOWERBOUND, UPPERBOUND,
+)
+from IA.see import static_exchange_eval # Evaluación estática de intercambios para descartar capturas perdedoras.
+from IA.search_info import SearchInfo # Información de cada iteración de la profundización iterativa.
 
 MATE_SCORE = 1000000 # Puntuación muy alta para jaque mate, asegurando que siempre sea la mejor opción.
 STALEMATE_SCORE = 0 # Puntuación para ahogado (empate).
 
-# Tabla de transposiciones (simple diccionario para almacenar resultados de posiciones ya evaluadas).
-transposition_table = {}
+TT_SIZE_MB = 16 # Tamaño de la tabla de transposiciones en megabytes.
+HISTORY_DECAY_SHIFT = 1 # Entre jugadas, la history heuristic se divide entre 2**HISTORY_DECAY_SHIFT.
+CONTINUATION_PLIES = 4 # Medias jugadas máximas entre dos búsquedas para considerar que la partida continúa.
+
+# Prioridades de ordenación por etapas: movimiento de la tabla de transposiciones, capturas y promociones
+# (MVV-LVA), killer moves y, por último, movimientos tranquilos según la history heuristic.
+HASH_MOVE_SCORE = 1 << 30 # El mejor movimiento guardado en la tabla se prueba siempre el primero.
+CAPTURE_SCORE = 1 << 20 # Base de las capturas y promociones, por encima de cualquier movimiento tranquilo.
+KILLER_SCORE = 1 << 16 # Killer moves: después de las capturas y antes del resto de movimientos tranquilos.
+HISTORY_MAX = KILLER_SCORE - 1 # La history heuristic nunca supera a un killer move.
+
+NULL_WINDOW = 0.01 # Anchura de la ventana nula de PVS: la resolución de las evaluaciones (y de la TT).
+
+# Ventanas de aspiración: cada iteración empieza con una ventana estrecha alrededor de la puntuación anterior.
+ASPIRATION_MIN_DEPTH = 2 # Primera profundidad con ventana de aspiración (la 1 no tiene puntuación previa).
+ASPIRATION_WINDOW = 25 # Semiancho inicial de la ventana (un cuarto de peón).
+ASPIRATION_GROWTH = 4 # Factor con el que se ensancha el lado que falla.
+ASPIRATION_MAX_WINDOW = 1000 # Por encima de este semiancho se busca con la ventana completa.
+
+# Poda por movimiento nulo: si pasar el turno y buscar a profundidad reducida ya supera beta,
+# la posición es tan buena que una jugada real también lo hará.
+NULL_MOVE_MIN_DEPTH = 3 # Profundidad restante mínima para intentar el movimiento nulo.
+NULL_MOVE_BASE_R = 2 # Reducción base (además de la media jugada del propio movimiento nulo)...
+NULL_MOVE_DEPTH_DIVISOR = 4 # ... más una media jugada por cada NULL_MOVE_DEPTH_DIVISOR de profundidad...
+NULL_MOVE_EVAL_MARGIN = 200 # ... y otra si la evaluación estática supera beta en más de este margen.
+NULL_MOVE_VERIFY_DEPTH = 6 # Desde esta profundidad, un fallo alto del movimiento nulo se verifica con una búsqueda real.
+
+# Podas cerca del horizonte con la evaluación estática (nodos fuera de la variante principal, sin jaque).
+# Los márgenes están en las unidades de evaluate_board (centipeones); el índice es la profundidad restante.
+REVERSE_FUTILITY_MAX_DEPTH = 3 # Reverse futility (static null move) hasta esta profundidad.
+REVERSE_FUTILITY_MARGIN = 120 # Margen por media jugada de profundidad.
+RAZORING_MAX_DEPTH = 2 # Razoring hasta esta profundidad.
+RAZORING_MARGINS = (0, 600, 900) # Déficit respecto a alfa a partir del cual se comprueba con la quiescencia.
+FUTILITY_MAX_DEPTH = 3 # Futility pruning de movimientos tranquilos hasta esta profundidad.
+FUTILITY_MARGINS = (0, 200, 350, 500) # Ganancia posicional máxima que se supone a un movimiento tranquilo.
+LATE_MOVE_MAX_DEPTH = 3 # Late move pruning hasta esta profundidad.
+LATE_MOVE_COUNTS = (0, 5, 9, 14) # Movimientos probados a partir de los cuales se descartan los tranquilos.
+
+# Quiescencia: capturas que no pueden subir alfa o que pierden material no se buscan.
+DELTA_MARGIN = 200 # Ganancia posicional máxima que se supone a una captura además del material capturado.
+
+POLL_INTERVAL = 512 # Nodos (de negamax y de quiescencia) entre dos consultas del reloj.
+
+MAX_PLY = 128 # Distancia máxima a la raíz de un nodo de negamax (tamaño de la tabla triangular de la variante principal).
+
+
+class SearchTimeout(Exception):
+    """
+    Se lanza dentro de la búsqueda cuando se supera el tiempo límite; get_best_move la captura,
+    deshace los movimientos pendientes y devuelve el mejor movimiento encontrado.
+    """
+
+# Late Move Reductions: reducción logarítmica en la profundidad restante y en el índice del movimiento.
+LMR_MIN_DEPTH = 3 # Profundidad restante mínima para reducir.
+LMR_MIN_MOVES = 4 # Los primeros movimientos de la lista ordenada nunca se reducen.
+LMR_MAX_INDEX = 63 # La tabla se limita a profundidades e índices < 64.
+LMR_REDUCTIONS = tuple(
+    tuple(0 if d < LMR_MIN_DEPTH or i < LMR_MIN_MOVES
+          else max(1, min(d - 2, int(0.75 + math.log(d) * math.log(i) / 2.25)))
+          for i in range(LMR_MAX_INDEX + 1))
+    for d in range(LMR_MAX_INDEX + 1)
+) # LMR_REDUCTIONS[depth][index]: medias jugadas de reducción (deja al menos profundidad 1).
+
+
+class SearchContext:
+    """
+    Estado de búsqueda que se conserva entre las jugadas de una misma partida: la tabla de transposiciones,
+    los killer moves y la history heuristic. Así cada búsqueda empieza con lo aprendido en la anterior.
+    La interfaz crea uno por partida y lo vacía con clear() al empezar una nueva.
+    """
+
+    def __init__(self, tt_size_mb=TT_SIZE_MB, shared=False, transposition_table=None):
+        """
+        Args:
+            tt_size_mb (int, optional): Tamaño de la tabla de transposiciones en megabytes.
+            shared (bool, optional): Crear la tabla en memoria compartida, necesaria para buscar con
+                                     varios procesos (get_best_move con workers > 1).
+            transposition_table (TranspositionTable, optional): Tabla ya creada que se usa en lugar de
+                                                                reservar una nueva (procesos auxiliares).
+        """
+        if transposition_table is None:
+            transposition_table = (SharedTranspositionTable if shared else TranspositionTable)(tt_size_mb)
+        self.transposition_table = transposition_table
+        self.killer_moves = {}
+        self.history_heuristic = {}
+        self.last_ply = None # Medias jugadas de la partida en la última búsqueda.
+        self.last_key = None # Clave de Zobrist de la posición de la última búsqueda.
+        self.stats = {} # Contadores de la última búsqueda (ver reset_stats).
+        self.search_info = [] # SearchInfo de cada iteración completa de la última búsqueda.
+        self.pv = [] # Variante principal de la última búsqueda (empieza por el movimiento devuelto).
+        self.reset_stats()
+
+    def reset_stats(self):
+        """
+        Pone a cero los contadores de la búsqueda: nodos visitados (y de quiescencia), profundidad completada
+        y máxima distancia a la raíz alcanzada (seldepth), podas, podas producidas por el primer
+        movimiento probado, cuántas veces ese primer movimiento fue el de la tabla de transposiciones
+        las nuevas búsquedas de LMR (verificación a profundidad completa) y de PVS (ventana completa),
+        las búsquedas con ventana de aspiración y cuántas fallaron por abajo o por arriba, y los movimientos
+        nulos intentados, los que podaron y los que la búsqueda de verificación desmintió. Las podas cerca
+        del horizonte cuentan los nodos que devolvieron la evaluación sin buscar (reverse futility, razoring)
+        y los movimientos descartados sin buscar (futility, late move pruning). En la quiescencia se cuentan
+        los nodos en jaque (búsqueda de evasiones) y las capturas descartadas por delta pruning o por SEE.
+        En la búsqueda paralela, helper_nodes suma los nodos de los procesos auxiliares.
+        """
+        self.stats.clear() # Se vacía en su sitio: la búsqueda guarda una referencia al diccionario.
+        self.stats.update(nodes=0, qnodes=0, completed_depth=0, seldepth=0, cutoffs=0, first_move_cutoffs=0, hash_moves=0, hash_move_cutoffs=0,
+                          lmr_researches=0, pvs_researches=0,
+                          aspiration_searches=0, aspiration_fail_lows=0, aspiration_fail_highs=0,
+                          null_move_tries=0, null_move_cutoffs=0, null_move_verify_fails=0,
+                          reverse_futility_cutoffs=0, razoring_cutoffs=0, futility_pruned=0, late_move_pruned=0,
+                          qsearch_evasions=0, delta_pruned=0, see_pruned=0, helper_nodes=0)
+
+    def first_move_cutoff_rate(self):
+        """
+        Devuelve la fracción de podas que produjo el primer movimiento probado (cuanto más cerca de 1,
+        mejor es la ordenación de movimientos).
+        """
+        cutoffs = self.stats["cutoffs"]
+        return self.stats["first_move_cutoffs"] / cutoffs if cutoffs else 0.0
+
+    def clear(self):
+        """
+        Olvida todo lo aprendido (partida nueva o posición sin relación con la anterior).
+        """
+        self.transposition_table.clear()
+        self.killer_moves.clear() # En su sitio: la búsqueda puede tener referencias a estos diccionarios.
+        self.history_heuristic.clear()
+        self.reset_stats()
+        self.last_ply = None
+        self.last_key = None
+        self.pv = []
+
+    def is_continuation(self, board):
+        """
+        Indica si la posición sigue a la de la última búsqueda en la misma partida
+        (la misma posición o unas pocas medias jugadas después).
+        """
+        if self.last_ply is None:
+            return True
+        ply = len(board.move_log)
+        if ply == self.last_ply:
+            return board.zobrist_key == self.last_key
+        return self.last_ply < ply <= self.last_ply + CONTINUATION_PLIES
+
+    def new_search(self, board, max_depth):
+        """
+        Prepara el contexto para una búsqueda: vacía todo si la posición salta a otra partida;
+        si no, envejece la tabla de transposiciones y reduce la history heuristic en lugar de borrarla.
+        Los killer moves dependen de la profundidad restante, así que se reinician en cada búsqueda.
+
+        Args:
+            board (ChessBoard): La posición que se va a buscar.
+            max_depth (int): Profundidad máxima de la búsqueda.
+        """
+        if not self.is_continuation(board):
+            self.clear()
+        self.transposition_table.new_search()
+        history = self.history_heuristic
+        for key, score in list(history.items()):
+            score >>= HISTORY_DECAY_SHIFT
+            if score:
+                history[key] = score
+            else:
+                del history[key]
+        self.killer_moves = {d: [] for d in range(max_depth + 1)}
+        self.reset_stats()
+        self.search_info = []
+        self.last_ply = len(board.move_log)
+        self.last_key = board.zobrist_key
+
+
+# Contexto por defecto, usado cuando get_best_move no recibe uno.
+default_context = SearchContext()
+
+# Las funciones de búsqueda usan estas referencias globales, que get_best_move enlaza al contexto activo.
+# Tabla de transposiciones de tamaño fijo (ver IA/transposition.py) con los resultados de posiciones ya evaluadas.
+transposition_table = default_context.transposition_table
 
 # Killer moves y history heuristic para mejorar el ordenamiento de movimientos.
-killer_moves = {}       # killer_moves[depth] = [move1, move2] - Almacena movimientos que causaron podas beta.
-history_heuristic = {}  # history_heuristic[(piece, end)] = score - Almacena la "bondad" histórica de un movimiento.
+killer_moves = default_context.killer_moves       # killer_moves[depth] = [move1, move2] - Almacena movimientos que causaron podas beta.
+history_heuristic = default_context.history_heuristic  # history_heuristic[(piece, to_sq)] = score - Almacena la "bondad" histórica de un movimiento.
+search_stats = default_context.stats # Contadores de la búsqueda en curso (nodos, podas, podas del primer movimiento).
+
+# Control del tiempo dentro de la búsqueda.
+deadline = None # Instante (time.time()) a partir del cual se aborta la búsqueda; None = sin límite.
+poll_countdown = POLL_INTERVAL # Nodos que faltan para la siguiente consulta del reloj.
+root_ply = 0 # Medias jugadas del tablero en la raíz de la búsqueda en curso.
+root_best_move = None # Mejor movimiento raíz de la iteración en curso (para usarlo si se aborta).
+stop_event = None # Evento (threading/multiprocessing) que, al activarse, aborta la búsqueda como el tiempo límite.
+pondering = False # Búsqueda en el tiempo del rival (IA/ponder.py): sin límite de tiempo hasta ponder_hit().
+active_time_manager = None # Presupuesto de tiempo de la búsqueda en curso (lo fija ponder_hit al acertar).
+analysis_mode = False # Modo análisis (ver analysis_search): sin podas ni reducciones que dependan de la ventana.
+
+# Variante principal. Tabla triangular: pv_table[ply] es la mejor línea encontrada desde el nodo de la variante
+# principal a esa distancia de la raíz; al mejorar alfa, el nodo la forma con su movimiento y la de su hijo.
+pv_table = [()] * MAX_PLY
+pv_moves = {} # {clave de Zobrist: movimiento} de la variante de la iteración anterior (si la tabla pierde la entrada).
+
+def activate_context(context):
+    """
+    Enlaza las referencias globales de la búsqueda (tabla de transposiciones, killer moves,
+    history heuristic y estadísticas) a las de un contexto.
+
+    Args:
+        context (SearchContext): El contexto que usarán las siguientes búsquedas.
+    """
+    global transposition_table, killer_moves, history_heuristic, search_stats
+    transposition_table = context.transposition_table
+    killer_moves = context.killer_moves
+    history_heuristic = context.history_heuristic
+    search_stats = context.stats
+
+def poll_deadline():
+    """
+    Consulta el reloj cada POLL_INTERVAL nodos y aborta la búsqueda si se superó el tiempo límite
+    o si se activó stop_event.
+
+    Raises:
+        SearchTimeout: Si se alcanzó el instante límite o se pidió parar.
+    """
+    global poll_countdown
+    poll_countdown -= 1
+    if poll_countdown <= 0:
+        poll_countdown = POLL_INTERVAL
+        if deadline is not None and time.time() >= deadline:
+            raise SearchTimeout()
+        if stop_event is not None and stop_event.is_set():
+            raise SearchTimeout()
+
+def start_pondering():
+    """
+    Prepara el estado de una búsqueda en el tiempo del rival (sin límite de tiempo) antes de arrancar el hilo
+    de get_best_move(..., ponder=True), que no lo toca: así un ponder_hit() que llegue antes de que el hilo
+    empiece a buscar no se pierde.
+    """
+    global deadline, active_time_manager, pondering
+    active_time_manager = None
+    deadline = None
+    pondering = True
+
+def ponder_hit(board, time_manager):
+    """
+    Convierte la búsqueda en el tiempo del rival (get_best_move con ponder=True, en otro hilo) en la búsqueda
+    normal de la jugada: el rival jugó el movimiento previsto. La búsqueda sigue sin reiniciarse, con lo
+    ya buscado, y desde ahora respeta el presupuesto de tiempo.
+
+    Args:
+        board (ChessBoard): La posición real (la misma que la de la búsqueda en curso).
+        time_manager (TimeManager): Presupuesto de tiempo de la jugada; empieza a contar ahora.
+    """
+    global deadline, active_time_manager, pondering
+    time_manager.start(board)
+    active_time_manager = time_manager # Antes de pondering = False: el bucle lo consulta en ese orden.
+    deadline = time_manager.deadline
+    pondering = False
 
 # --- Move ordering mejorado ---
-def order_moves(board, moves, depth):
+def order_moves(board, moves, depth, tt_move=None):
     """
     Ordena una lista de movimientos para mejorar la eficiencia de la poda alfa-beta.
-    Prioriza capturas, promociones, killer moves y movimientos con buen historial.
+    Orden por etapas: el movimiento de la tabla de transposiciones, capturas y promociones (MVV-LVA),
+    killer moves y, al final, el resto de movimientos tranquilos según su historial.
     
     Args:
         board (ChessBoard): La instancia actual del tablero de ajedrez.
-        moves (list): Lista de movimientos a ordenar (tuplas (start, end)).
+        moves (list): Lista de movimientos codificados a ordenar.
         depth (int): La profundidad actual de la búsqueda.
+        tt_move (int, optional): Mejor movimiento guardado en la tabla de transposiciones para esta posición.
         
     Returns:
         list: La lista de movimientos ordenada.
@@ -33,311 +292,724 @@ def order_moves(board, moves, depth):
         """
         Función interna para calcular la prioridad de un movimiento.
         """
-        start, end = m # Desempaqueta el movimiento.
-        piece = board.get_piece(*start) # Pieza que se mueve.
-        target = board.get_piece(*end) # Pieza en la casilla de destino.
-        score = 0 # Puntuación de prioridad del movimiento.
-
-        # Capturas valiosas (MVV-LVA: Most Valuable Victim - Least Valuable Attacker).
-        # Prioriza capturar piezas de alto valor con piezas de bajo valor.
-        if target != "--": # Si es una captura.
-            # 10 * valor_pieza_capturada - valor_pieza_atacante.
-            score += 10 * piece_values.get(target[1], 0) - piece_values.get(piece[1], 0)
-
-        # Promoción de peón.
-        if piece[1] == "p" and (end[0] == 0 or end[0] == 7): # Si es un peón que llega a la última fila.
-            score += 900 # Bonificación alta, equivalente al valor de una reina.
-
-        # Killer moves (movimientos que causaron podas en otras ramas de búsqueda).
-        if depth in killer_moves:
-            for km in killer_moves[depth]:
-                if m == km:
-                    score += 800 # Alta prioridad para killer moves.
-                    break
+        if m == tt_move: # Movimiento de la tabla de transposiciones (o de la variante principal).
+            return -HASH_MOVE_SCORE
+        from_sq = m & 63 # Casilla de inicio.
+        to_sq = (m >> 6) & 63 # Casilla de destino.
+        flags = m >> 12 # Banderas del movimiento.
+        piece = rows[from_sq >> 3][from_sq & 7] # Pieza que se mueve.
+
+        if flags & (CAPTURE | PROMOTION): # Movimientos tácticos.
+            score = CAPTURE_SCORE
+            # Capturas valiosas (MVV-LVA: Most Valuable Victim - Least Valuable Attacker).
+            # Prioriza capturar piezas de alto valor con piezas de bajo valor.
+            if flags & CAPTURE:
+                target = rows[to_sq >> 3][to_sq & 7] # Pieza capturada ("--" en en passant: un peón).
+                victim = piece_values[target[1]] if target != "--" else piece_values["p"]
+                # 10 * valor_pieza_capturada - valor_pieza_atacante.
+                score += 10 * victim - piece_values[piece[1]]
+            # Promoción de peón: bonificación igual al valor de la pieza elegida (la dama primero).
+            if flags & PROMOTION:
+                score += piece_values[PROMOTION_PIECES[flags & 3]]
+            return -score
+
+        # Killer moves (movimientos tranquilos que causaron podas en otras ramas a esta profundidad).
+        if m in killers:
+            return -KILLER_SCORE
+
+        # History heuristic (movimientos tranquilos que han sido buenos en el pasado).
+        score = history_heuristic.get((piece, to_sq), 0)
+        return -(score if score < HISTORY_MAX else HISTORY_MAX) # Negativo: sorted ordena de menor a mayor.
+
+    rows = board.board
+    killers = killer_moves.get(depth, ())
 
-        # History heuristic (movimientos que han sido buenos en el pasado).
-        score += history_heuristic.get((piece, end), 0) # Añade la puntuación histórica.
+    return sorted(moves, key=move_priority) # Ordena la lista de movimientos usando la función de prioridad.
 
-        return -score # Retorna el negativo para ordenar de mayor a menor prioridad (heapq es min-heap).
+def record_cutoff(board, m, depth, index, tt_move):
+    """
+    Registra un movimiento que produjo una poda: actualiza las estadísticas y, si es un movimiento
+    tranquilo, los killer moves y la history heuristic (las capturas ya se ordenan por MVV-LVA).
 
-    return sorted(moves, key=move_priority) # Ordena la lista de movimientos usando la función de prioridad.
+    Args:
+        board (ChessBoard): La instancia del tablero (con el movimiento ya deshecho).
+        m (int): El movimiento codificado que produjo la poda.
+        depth (int): La profundidad restante del nodo.
+        index (int): Posición del movimiento en la lista ordenada (0 = primer movimiento probado).
+        tt_move (int | None): Movimiento de la tabla de transposiciones del nodo.
+    """
+    search_stats["cutoffs"] += 1
+    if index == 0:
+        search_stats["first_move_cutoffs"] += 1
+        if m == tt_move:
+            search_stats["hash_move_cutoffs"] += 1
+    if (m >> 12) & (CAPTURE | PROMOTION):
+        return
+    # Actualizar Killer Moves: almacena movimientos que causaron una poda.
+    killers = killer_moves.setdefault(depth, [])
+    if m not in killers:
+        killers.append(m)
+        if len(killers) > 2: # Mantener solo los 2 killer moves más recientes.
+            killers.pop(0)
+    # Actualizar History Heuristic: incrementa la puntuación del movimiento.
+    key = (board.get_piece(*divmod(m & 63, 8)), (m >> 6) & 63) # (pieza, casilla de destino).
+    history_heuristic[key] = history_heuristic.get(key, 0) + depth * depth
 
 # --- Quiescence Search ---
-def quiescence_search(board, alpha, beta, is_maximizing):
+def quiescence_search(board, alpha, beta):
     """
-    Búsqueda de quiescencia para manejar el "horizonte" del algoritmo Minimax.
+    Búsqueda de quiescencia para manejar el "horizonte" del algoritmo de búsqueda.
     Extiende la búsqueda en posiciones donde hay movimientos "tácticos" (capturas, promociones)
-    para evitar el problema del horizonte.
+    para evitar el problema del horizonte. Formulación negamax: las puntuaciones son siempre
+    desde el punto de vista del bando que mueve.
+    Fuera de jaque usa el generador de capturas (MoveGenerator.generate_captures) y descarta las capturas
+    que no pueden subir alfa (delta pruning) o que pierden material según SEE. En jaque busca todas las
+    evasiones, sin stand-pat, y detecta el jaque mate.
     
     Args:
         board (ChessBoard): La instancia actual del tablero de ajedrez.
         alpha (float): El valor alfa para la poda alfa-beta.
         beta (float): El valor beta para la poda alfa-beta.
-        is_maximizing (bool): True si es el turno del jugador maximizador, False si es el minimizador.
         
     Returns:
-        float: La puntuación de evaluación de la posición después de la búsqueda de quiescencia.
+        float: La puntuación de la posición para el bando que mueve, acotada a [alpha, beta].
     """
+    search_stats["qnodes"] += 1
+    poll_deadline()
+    ply = len(board.move_log) - root_ply
+    if ply > search_stats["seldepth"]:
+        search_stats["seldepth"] = ply
+
+    # En jaque no hay stand-pat (no se puede "no hacer nada"): se buscan todas las evasiones legales.
+    if ChessRules.is_in_check(board, board.turn):
+        search_stats["qsearch_evasions"] += 1
+        evasions = MoveGenerator.generate_legal_moves(board, board.turn)
+        if not evasions: # Jaque mate.
+            return max(alpha, -MATE_SCORE)
+        for m in order_moves(board, evasions, 0):
+            board.make_move(m)
+            eval_score = -quiescence_search(board, -beta, -alpha)
+            board.undo_move()
+            if eval_score >= beta: # Poda beta.
+                return beta
+            if eval_score > alpha:
+                alpha = eval_score
+        return alpha
+
     # Evaluar la posición actual (stand-pat): es la evaluación si no se realizan más movimientos tácticos.
-    stand_pat = evaluate_board(board)
+    stand_pat = evaluate_board(board) # Puntuación desde el punto de vista de las blancas.
+    if board.turn == "b":
+        stand_pat = -stand_pat
+
+    if stand_pat >= beta: # Si la evaluación actual ya es mejor que beta, se puede podar.
+        return beta
+    if stand_pat > alpha:
+        alpha = stand_pat # Actualiza alfa.
+
+    # Solo movimientos "ruidosos" (capturas y promociones a dama), ya legales y ordenados por MVV-LVA.
+    noisy_moves = order_moves(board, MoveGenerator.generate_captures(board, board.turn), 0)
+    rows = board.board
+
+    for m in noisy_moves:
+        flags = m >> 12
+        if not flags & PROMOTION:
+            from_sq = m & 63
+            to_sq = (m >> 6) & 63
+            target = rows[to_sq >> 3][to_sq & 7] # "--" en en passant: la víctima es un peón.
+            victim = piece_values[target[1]] if target != "--" else piece_values["p"]
+            # Delta pruning: ni ganando la pieza capturada (y un margen) se llegaría a alfa.
+            if not analysis_mode and stand_pat + victim + DELTA_MARGIN <= alpha:
+                search_stats["delta_pruned"] += 1
+                continue
+            # Capturas que pierden material tras las recapturas (solo puede pasar si la víctima vale menos).
+            if victim < piece_values[rows[from_sq >> 3][from_sq & 7][1]] and static_exchange_eval(board, m) < 0:
+                search_stats["see_pruned"] += 1
+                continue
 
-    if is_maximizing:
-        if stand_pat >= beta: # Si la evaluación actual ya es mejor que beta, se puede podar.
-            return beta
-        alpha = max(alpha, stand_pat) # Actualiza alfa.
-    else: # is_minimizing
-        if stand_pat <= alpha: # Si la evaluación actual ya es peor que alfa, se puede podar.
-            return alpha
-        beta = min(beta, stand_pat) # Actualiza beta.
-
-    # Generar solo movimientos "ruidosos" (capturas y promociones).
-    noisy_moves = []
-    all_pseudo_moves = MoveGenerator.generate_pseudo_legal_moves(board, board.turn) # Obtiene todos los pseudo-legales.
-    for start, end in all_pseudo_moves:
-        piece = board.get_piece(*start)
-        target = board.get_piece(*end)
-        # Es una captura o una promoción de peón.
-        if target != "--" or (piece[1] == "p" and (end[0] == 0 or end[0] == 7)):
-            noisy_moves.append((start, end))
-
-    # Ordenar movimientos ruidosos para una poda más eficiente.
-    noisy_moves = order_moves(board, noisy_moves, 0) # depth 0 para quiescence (no se usan killer/history específicos de profundidad).
-
-    for start, end in noisy_moves:
-        # Crear un objeto Move para el movimiento actual.
-        m = MoveClass(start, end, board, promotion_choice="q") # Asumimos promoción a reina por defecto en búsqueda.
-
-        # Verificar si el movimiento es legal antes de hacerlo.
-        # Esto es crucial porque generate_pseudo_legal_moves no filtra jaques.
         board.make_move(m)
-        # Si el rey del jugador actual está en jaque después de mover, el movimiento es ilegal.
-        if ChessRules.is_in_check(board, board.turn == "w" and "b" or "w"): 
-            board.undo_move()
-            continue # Este movimiento es ilegal, saltar al siguiente.
+        eval_score = -quiescence_search(board, -beta, -alpha) # Llamada recursiva para el rival.
+        board.undo_move()
+        if eval_score >= beta: # Poda beta.
+            return beta
+        if eval_score > alpha:
+            alpha = eval_score # Actualiza alfa.
 
-        if is_maximizing:
-            eval_score = quiescence_search(board, alpha, beta, False) # Llamada recursiva para el minimizador.
-            board.undo_move()
-            if eval_score >= beta: # Poda beta.
-                return beta
-            alpha = max(alpha, eval_score) # Actualiza alfa.
-        else: # is_minimizing
-            eval_score = quiescence_search(board, alpha, beta, True) # Llamada recursiva para el maximizador.
-            board.undo_move()
-            if eval_score <= alpha: # Poda alfa.
-                return alpha
-            beta = min(beta, eval_score) # Actualiza beta.
+    return alpha # Devuelve el valor final de alfa.
 
-    return alpha if is_maximizing else beta # Devuelve el valor final de alfa o beta.
+# --- Negamax con PVS, transposiciones, killer/history y LMR ---
+def has_non_pawn_material(board, color):
+    """
+    Indica si un bando tiene alguna pieza además del rey y los peones. Sin ellas el zugzwang es
+    frecuente y pasar el turno no es una buena estimación de la posición.
+    """
+    bitboards = board.bitboards
+    return bool(bitboards[color + "n"] | bitboards[color + "b"] | bitboards[color + "r"] | bitboards[color + "q"])
 
-# --- Minimax con poda, transposiciones, killer/history y LMR ---
-def minimax(board, depth, alpha, beta, is_maximizing):
+def negamax(board, depth, alpha, beta, allow_null=True):
     """
-    Implementación del algoritmo Minimax con poda Alfa-Beta, tabla de transposiciones,
-    killer moves, history heuristic y Late Move Reductions (LMR).
+    Búsqueda alfa-beta en formulación negamax con Principal Variation Search (PVS), tabla de
+    transposiciones, killer moves, history heuristic y Late Move Reductions (LMR).
+
+    El primer movimiento se busca con la ventana completa; el resto con una ventana nula (scout)
+    que solo comprueba si superan a alfa. Si un movimiento reducido la supera, se verifica a
+    profundidad completa, y si además cae dentro de la ventana se vuelve a buscar con la ventana completa.
+    En las posiciones de la variante principal de la iteración anterior (pv_moves) cuyo movimiento ya no
+    está en la tabla de transposiciones se prueba primero ese movimiento, y los nodos con ventana abierta
+    van formando la nueva variante en pv_table.
+
+    En los nodos fuera de la variante principal (y sin jaque) se aplican antes las podas basadas en la
+    evaluación estática: reverse futility, razoring y la poda por movimiento nulo (salvo sin piezas
+    además de peones o justo después de otro movimiento nulo); cerca del horizonte, además, se descartan
+    movimientos tranquilos con futility pruning y late move pruning.
     
     Args:
         board (ChessBoard): La instancia actual del tablero de ajedrez.
         depth (int): La profundidad restante de la búsqueda.
         alpha (float): El valor alfa para la poda alfa-beta.
         beta (float): El valor beta para la poda alfa-beta.
-        is_maximizing (bool): True si es el turno del jugador maximizador, False si es el minimizador.
+        allow_null (bool, optional): Permitir la poda por movimiento nulo en este nodo
+                                     (False en la búsqueda de verificación).
         
     Returns:
-        tuple: Una tupla (score, best_move), donde score es la evaluación de la posición
-               y best_move es el mejor movimiento encontrado para llegar a esa evaluación.
-    """
-    # Generar un hash único para la posición actual del tablero.
-    # Incluye el tablero, el turno, la casilla en passant y los derechos de enroque para una clave única.
-    board_hash = hash(str(board.board) + board.turn + str(board.en_passant_square) + str(board.castling_rights))
-
-    # Consultar la tabla de transposiciones.
-    if board_hash in transposition_table:
-        entry = transposition_table[board_hash]
-        if entry['depth'] >= depth: # Si la entrada es lo suficientemente profunda.
-            if entry['type'] == 'exact': # Si es una evaluación exacta.
-                return entry['score'], entry['best_move']
-            if entry['type'] == 'lowerbound' and entry['score'] > alpha: # Si es un límite inferior y mejora alfa.
-                alpha = entry['score']
-            if entry['type'] == 'upperbound' and entry['score'] < beta: # Si es un límite superior y mejora beta.
-                beta = entry['score']
+        tuple: Una tupla (score, best_move), donde score es la evaluación de la posición desde el punto
+               de vista del bando que mueve y best_move es el mejor movimiento encontrado.
+    """
+    # Clave de Zobrist de la posición actual (mantenida de forma incremental por el tablero).
+    # Incluye las piezas, el turno, la casilla en passant y los derechos de enroque.
+    global root_best_move
+    board_hash = board.zobrist_key
+    search_stats["nodes"] += 1
+    poll_deadline()
+    ply = len(board.move_log) - root_ply
+    if ply > search_stats["seldepth"]:
+        search_stats["seldepth"] = ply
+    pv_table[ply] = () # La variante de este nodo empieza vacía (la de un hermano anterior ya no vale).
+    original_alpha = alpha # Guardar alpha original para determinar el tipo de entrada en la TT.
+
+    # Consultar la tabla de transposiciones. Aunque la entrada no sea lo bastante profunda para
+    # devolver su puntuación, su mejor movimiento se prueba el primero.
+    tt_move = None
+    entry = transposition_table.probe(board_hash)
+    if entry is not None:
+        tt_depth, tt_flag, tt_score, tt_move = entry
+        # Si la entrada es lo suficientemente profunda (en modo análisis, de la misma profundidad: una más
+        # profunda daría un valor distinto del de esta búsqueda).
+        if tt_depth == depth or (tt_depth > depth and not analysis_mode):
+            if tt_flag == EXACT: # Si es una evaluación exacta.
+                return tt_score, tt_move
+            if tt_flag == LOWERBOUND and tt_score > alpha: # Si es un límite inferior y mejora alfa.
+                alpha = tt_score
+            elif tt_flag == UPPERBOUND and tt_score < beta: # Si es un límite superior y mejora beta.
+                beta = tt_score
             if alpha >= beta: # Poda por tabla de transposiciones (si los límites se cruzan).
-                return entry['score'], entry['best_move']
+                return tt_score, tt_move
 
     # Caso base: profundidad 0, llamar a quiescence search para evaluar la posición.
-    if depth == 0:
-        score = quiescence_search(board, alpha, beta, is_maximizing)
-        # Guardar en la tabla de transposiciones.
-        transposition_table[board_hash] = {'score': score, 'depth': depth, 'type': 'exact', 'best_move': None}
+    if depth <= 0:
+        score = quiescence_search(board, alpha, beta)
+        # Guardar en la tabla de transposiciones (la quiescencia devuelve una cota si sale de la ventana).
+        flag = UPPERBOUND if score <= alpha else LOWERBOUND if score >= beta else EXACT
+        transposition_table.store(board_hash, 0, flag, score)
         return score, None
 
+    in_check = ChessRules.is_in_check(board, board.turn)
+    is_pv = beta - alpha >= 2 * NULL_WINDOW # Ventana abierta: nodo de la variante principal.
+
+    # Evaluación estática para las podas de los nodos fuera de la variante principal (ni en jaque ni cerca de un mate).
+    # Sin ella no hay reverse futility, razoring, movimiento nulo, futility ni late move pruning.
+    static_eval = None
+    if not is_pv and not in_check and not analysis_mode and -MATE_SCORE < alpha and beta < MATE_SCORE:
+        static_eval = evaluate_board(board)
+        if board.turn == "b":
+            static_eval = -static_eval
+
+        # Reverse futility (static null move): cerca del horizonte, si la evaluación supera beta con
+        # un margen que ninguna jugada del rival debería recuperar, el nodo falla alto sin buscar.
+        if depth <= REVERSE_FUTILITY_MAX_DEPTH and static_eval - REVERSE_FUTILITY_MARGIN * depth >= beta:
+            search_stats["reverse_futility_cutoffs"] += 1
+            return static_eval, None
+
+        # Razoring: si la evaluación está muy por debajo de alfa, se comprueba con la quiescencia
+        # si alguna táctica lo arregla; si no, el nodo falla bajo sin buscar los movimientos tranquilos.
+        if depth <= RAZORING_MAX_DEPTH and static_eval + RAZORING_MARGINS[depth] < alpha:
+            threshold = alpha - RAZORING_MARGINS[depth]
+            score = quiescence_search(board, threshold, threshold + NULL_WINDOW)
+            if score <= threshold:
+                search_stats["razoring_cutoffs"] += 1
+                return score, None
+
+    # Poda por movimiento nulo (solo con ventana nula: fuera de la variante principal).
+    if static_eval is not None and allow_null and depth >= NULL_MOVE_MIN_DEPTH \
+            and board.move_log and board.move_log[-1] != NULL_MOVE and has_non_pawn_material(board, board.turn):
+        if static_eval >= beta: # Solo merece la pena si la posición ya parece superar beta.
+            reduction = NULL_MOVE_BASE_R + depth // NULL_MOVE_DEPTH_DIVISOR
+            if static_eval - beta > NULL_MOVE_EVAL_MARGIN:
+                reduction += 1
+            search_stats["null_move_tries"] += 1
+            board.make_null_move()
+            score = -negamax(board, depth - 1 - reduction, -beta, -beta + NULL_WINDOW)[0]
+            board.undo_null_move()
+            if score >= beta:
+                if score >= MATE_SCORE:
+                    score = beta # Un mate tras pasar el turno no es un mate demostrado.
+                # Verificación: a gran profundidad se confirma con una búsqueda real reducida sin movimiento nulo.
+                if depth < NULL_MOVE_VERIFY_DEPTH or \
+                        negamax(board, depth - reduction, beta - NULL_WINDOW, beta, allow_null=False)[0] >= beta:
+                    search_stats["null_move_cutoffs"] += 1
+                    transposition_table.store(board_hash, depth, LOWERBOUND, score, tt_move)
+                    return score, tt_move
+                search_stats["null_move_verify_fails"] += 1
+
     # Generar movimientos legales para el turno actual.
     moves = MoveGenerator.generate_legal_moves(board, board.turn)
     
     # Si no hay movimientos legales (jaque mate o ahogado).
     if not moves:
-        if ChessRules.is_in_check(board, board.turn):
-            # Jaque mate: el jugador actual pierde.
-            score = (-MATE_SCORE if board.turn == "w" else MATE_SCORE)
-        else:
-            # Ahogado: empate.
-            score = STALEMATE_SCORE
+        # Jaque mate: el jugador actual pierde. Ahogado: empate.
+        score = -MATE_SCORE if in_check else STALEMATE_SCORE
         # Guardar en la tabla de transposiciones.
-        transposition_table[board_hash] = {'score': score, 'depth': depth, 'type': 'exact', 'best_move': None}
+        transposition_table.store(board_hash, depth, EXACT, score)
         return score, None
 
     # Ordenar movimientos para una poda alfa-beta más eficiente.
-    moves = order_moves(board, moves, depth)
-    
+    # En la variante principal anterior, si la tabla perdió la entrada, su movimiento sigue probándose el primero.
+    pv_move = pv_moves.get(board_hash) if tt_move is None and pv_moves else None
+    moves = order_moves(board, moves, depth, tt_move if tt_move is not None else pv_move)
+    if tt_move is not None and moves[0] == tt_move:
+        search_stats["hash_moves"] += 1 # El movimiento de la tabla es legal aquí y se prueba el primero.
+
+    # Podas de movimientos tranquilos cerca del horizonte (solo fuera de la variante principal).
+    futile = static_eval is not None and depth <= FUTILITY_MAX_DEPTH and static_eval + FUTILITY_MARGINS[depth] <= alpha
+    late_move_limit = LATE_MOVE_COUNTS[depth] if static_eval is not None and depth <= LATE_MOVE_MAX_DEPTH else len(moves)
+
+    best_score = float('-inf') # Mejor evaluación encontrada en este nodo.
     best_move = None # Variable para almacenar el mejor movimiento en esta rama.
-    original_alpha = alpha # Guardar alpha original para determinar el tipo de entrada en la TT.
-    entry_type = 'upperbound' # Por defecto, si no se poda, es un upperbound.
-
-    if is_maximizing: # Turno del jugador maximizador (blancas).
-        max_eval = float('-inf') # Inicializa la mejor evaluación como menos infinito.
-        for i, (start, end) in enumerate(moves):
-            m = MoveClass(start, end, board, promotion_choice="q") # Crea el objeto Move.
-            board.make_move(m) # Realiza el movimiento.
-
-            # Late Move Reductions (LMR).
-            # Reduce la profundidad de búsqueda para movimientos que no son capturas
-            # y que se encuentran más tarde en la lista de movimientos ordenados.
-            new_depth = depth - 1
-            if depth >= 3 and i >= 4 and m.piece_captured == "--": # Ajustar umbrales de profundidad e índice.
-                new_depth -= 1 # Reduce la profundidad en 1.
-                if new_depth < 0: new_depth = 0 # Asegura que no sea negativo.
-
-            eval_score, _ = minimax(board, new_depth, alpha, beta, False) # Llamada recursiva para el minimizador.
-            board.undo_move() # Deshace el movimiento.
-
-            if eval_score > max_eval: # Si se encuentra una mejor evaluación.
-                max_eval = eval_score
-                best_move = (start, end)
-
-            alpha = max(alpha, eval_score) # Actualiza alfa.
-            if beta <= alpha: # Poda beta: si la mejor jugada del maximizador es peor que la mejor jugada del minimizador.
-                # Actualizar Killer Moves: almacena movimientos que causaron una poda beta.
-                if depth not in killer_moves:
-                    killer_moves[depth] = []
-                if (start, end) not in killer_moves[depth]:
-                    killer_moves[depth].append((start, end))
-                    if len(killer_moves[depth]) > 2: # Mantener solo los 2 mejores killer moves.
-                        killer_moves[depth].pop(0)
-                # Actualizar History Heuristic: incrementa la puntuación del movimiento.
-                piece = board.get_piece(*start)
-                history_heuristic[(piece, end)] = history_heuristic.get((piece, end), 0) + depth * depth
-                entry_type = 'lowerbound' # Se encontró un límite inferior.
-                break # Poda.
+    for i, m in enumerate(moves):
+        quiet = not (m >> 12) & (CAPTURE | PROMOTION)
+        board.make_move(m) # Realiza el movimiento.
+
+        # Podas de movimientos tranquilos que no dan jaque, una vez buscado al menos un movimiento:
+        # futility (no pueden subir la evaluación hasta alfa) y late move pruning (con la lista
+        # bien ordenada, los movimientos tranquilos tardíos casi nunca producen una poda).
+        if quiet and i > 0 and (futile or i >= late_move_limit) and not ChessRules.is_in_check(board, board.turn):
+            board.undo_move()
+            search_stats["futility_pruned" if futile else "late_move_pruned"] += 1
+            continue
 
-        # Guardar en la tabla de transposiciones.
-        if max_eval >= original_alpha:
-            entry_type = 'exact' if max_eval < beta else 'lowerbound'
-        transposition_table[board_hash] = {'score': max_eval, 'depth': depth, 'type': entry_type, 'best_move': best_move}
-        return max_eval, best_move
-    else: # is_minimizing (Turno del jugador minimizador - negras).
-        min_eval = float('inf') # Inicializa la mejor evaluación como infinito.
-        for i, (start, end) in enumerate(moves):
-            m = MoveClass(start, end, board, promotion_choice="q") # Crea el objeto Move.
-            board.make_move(m) # Realiza el movimiento.
-
-            # Late Move Reductions (LMR).
-            new_depth = depth - 1
-            if depth >= 3 and i >= 4 and m.piece_captured == "--": # Ajustar umbrales.
-                new_depth -= 1
-                if new_depth < 0: new_depth = 0
-
-            eval_score, _ = minimax(board, new_depth, alpha, beta, True) # Llamada recursiva para el maximizador.
-            board.undo_move() # Deshace el movimiento.
-
-            if eval_score < min_eval: # Si se encuentra una mejor evaluación (más baja).
-                min_eval = eval_score
-                best_move = (start, end)
-
-            beta = min(beta, eval_score) # Actualiza beta.
-            if beta <= alpha: # Poda alfa: si la mejor jugada del minimizador es mejor que la mejor jugada del maximizador.
-                # Actualizar Killer Moves.
-                if depth not in killer_moves:
-                    killer_moves[depth] = []
-                if (start, end) not in killer_moves[depth]:
-                    killer_moves[depth].append((start, end))
-                    if len(killer_moves[depth]) > 2:
-                        killer_moves[depth].pop(0)
-                # Actualizar History Heuristic.
-                piece = board.get_piece(*start)
-                history_heuristic[(piece, end)] = history_heuristic.get((piece, end), 0) + depth * depth
-                entry_type = 'upperbound' # Se encontró un límite superior.
-                break # Poda.
+        if i == 0:
+            # Primer movimiento (variante principal esperada): ventana completa.
+            score = -negamax(board, depth - 1, -beta, -alpha)[0]
+        else:
+            # Late Move Reductions (LMR): los movimientos tranquilos tardíos se buscan a menor profundidad,
+            # salvo si el bando que mueve está en jaque o el movimiento da jaque.
+            reduction = 0
+            if depth >= LMR_MIN_DEPTH and i >= LMR_MIN_MOVES and not in_check and not analysis_mode \
+                    and quiet and not ChessRules.is_in_check(board, board.turn):
+                reduction = LMR_REDUCTIONS[min(depth, LMR_MAX_INDEX)][min(i, LMR_MAX_INDEX)]
+
+            # Búsqueda con ventana nula: ¿el movimiento mejora alfa?
+            score = -negamax(board, depth - 1 - reduction, -alpha - NULL_WINDOW, -alpha)[0]
+            if score > alpha and reduction: # El movimiento reducido mejora alfa: verificar a profundidad completa.
+                search_stats["lmr_researches"] += 1
+                score = -negamax(board, depth - 1, -alpha - NULL_WINDOW, -alpha)[0]
+            if alpha < score < beta: # Falla alto dentro de la ventana: nueva variante principal.
+                search_stats["pvs_researches"] += 1
+                score = -negamax(board, depth - 1, -beta, -alpha)[0]
+
+        board.undo_move() # Deshace el movimiento.
+
+        if score > best_score: # Si se encuentra una mejor evaluación.
+            best_score = score
+            best_move = m
+            if score > alpha:
+                alpha = score # Actualiza alfa.
+                if is_pv: # Nueva variante principal: este movimiento seguido de la del hijo.
+                    pv_table[ply] = (m,) + pv_table[ply + 1]
+                if ply == 0:
+                    root_best_move = m # Resultado parcial de la iteración, por si se agota el tiempo.
+                if alpha >= beta: # Poda beta: el rival no permitirá llegar a esta posición.
+                    record_cutoff(board, m, depth, i, tt_move) # Killer moves, history heuristic y estadísticas.
+                    break # Poda.
+
+    # Guardar en la tabla de transposiciones.
+    if best_score <= original_alpha:
+        entry_type = UPPERBOUND # Ningún movimiento superó alfa.
+    elif best_score >= beta:
+        entry_type = LOWERBOUND # Hubo poda beta.
+    else:
+        entry_type = EXACT
+    transposition_table.store(board_hash, depth, entry_type, best_score, best_move)
+    return best_score, best_move
 
-        # Guardar en la tabla de transposiciones.
-        if min_eval <= original_alpha:
-            entry_type = 'exact' if min_eval > alpha else 'upperbound'
-        transposition_table[board_hash] = {'score': min_eval, 'depth': depth, 'type': entry_type, 'best_move': best_move}
-        return min_eval, best_move
+def minimax(board, depth, alpha, beta, is_maximizing):
+    """
+    Envoltorio de negamax con puntuaciones desde el punto de vista de las blancas (la interfaz
+    original de la búsqueda): las blancas maximizan y las negras minimizan.
+    
+    Args:
+        board (ChessBoard): La instancia actual del tablero de ajedrez.
+        depth (int): La profundidad restante de la búsqueda.
+        alpha (float): El valor alfa para la poda alfa-beta.
+        beta (float): El valor beta para la poda alfa-beta.
+        is_maximizing (bool): True si mueven las blancas (debe coincidir con board.turn).
+        
+    Returns:
+        tuple: Una tupla (score, best_move), con score desde el punto de vista de las blancas.
+               En modo análisis (analysis_mode), la raíz se busca con analysis_search, siempre con la
+               ventana completa.
+    """
+    if analysis_mode:
+        score, move = analysis_search(board, depth)
+        return (score if is_maximizing else -score), move
+    if is_maximizing:
+        return negamax(board, depth, alpha, beta)
+    score, move = negamax(board, depth, -beta, -alpha)
+    return -score, move
+
+# --- Modo análisis ---
+# Con analysis_mode activado, negamax es una función pura de la posición y la profundidad: sin podas ni
+# reducciones que dependan de la ventana (reverse futility, razoring, movimiento nulo, futility, late move
+# pruning, LMR y delta pruning) y sin usar puntuaciones de la tabla de otras profundidades. Alfa-beta
+# devuelve entonces el valor exacto de cualquier movimiento que supere alfa, con cualquier ventana, orden
+# de movimientos o contenido de la tabla, y la raíz desempata por el orden del generador de movimientos:
+# la búsqueda en serie (minimax) y la repartida entre procesos (IA/root_split.py) dan el mismo resultado.
+def is_better_root_move(score, rank, best_score, best_rank):
+    """
+    Criterio de la raíz en modo análisis: gana la puntuación más alta y, a igual puntuación (a menos de
+    media unidad de evaluación), el movimiento que el generador de movimientos legales produce antes.
+
+    Args:
+        score (float): Puntuación del movimiento (bando que mueve).
+        rank (int): Posición del movimiento en la lista del generador.
+        best_score (float): Puntuación del mejor movimiento hasta ahora.
+        best_rank (int): Posición de ese movimiento en la lista del generador.
+
+    Returns:
+        bool: True si el movimiento sustituye al mejor.
+    """
+    if score > best_score + NULL_WINDOW / 2:
+        return True
+    return score > best_score - NULL_WINDOW / 2 and rank < best_rank
+
+def search_root_move(board, move, depth, alpha):
+    """
+    Busca un movimiento raíz en modo análisis frente a alfa, rebajado una unidad para detectar empates:
+    primero con ventana nula y, si la supera, con la ventana abierta por arriba.
+
+    Args:
+        board (ChessBoard): La posición raíz (se deja como estaba).
+        move (int): El movimiento.
+        depth (int): Profundidad de la raíz.
+        alpha (float): La mejor puntuación conocida en la raíz (-inf si no hay ninguna).
+
+    Returns:
+        float: Puntuación desde el punto de vista del bando que mueve, redondeada a la resolución de la
+               tabla de transposiciones; es exacta si supera alpha - NULL_WINDOW.
+    """
+    bound = alpha - NULL_WINDOW
+    board.make_move(move)
+    try:
+        score = float('inf')
+        if alpha > float('-inf'):
+            score = -negamax(board, depth - 1, -alpha, -bound)[0]
+        if score > bound:
+            score = -negamax(board, depth - 1, float('-inf'), -bound)[0]
+    finally:
+        board.undo_move()
+    return round(score, 2)
+
+def analysis_search(board, depth):
+    """
+    Búsqueda en serie de la raíz en modo análisis (ver is_better_root_move y search_root_move).
+
+    Args:
+        board (ChessBoard): La instancia actual del tablero de ajedrez.
+        depth (int): Profundidad en medias jugadas.
+
+    Returns:
+        tuple: (score, best_move), con score desde el punto de vista del bando que mueve.
+    """
+    global root_best_move
+    moves = MoveGenerator.generate_legal_moves(board, board.turn)
+    if not moves or depth <= 0: # Mate, ahogado u hoja: no hay raíz que recorrer.
+        return negamax(board, depth, float('-inf'), float('inf'))
+    ranks = {m: i for i, m in enumerate(moves)}
+    entry = transposition_table.probe(board.zobrist_key)
+    best_score, best_move = float('-inf'), None
+    for m in order_moves(board, moves, depth, entry[3] if entry is not None else None):
+        score = search_root_move(board, m, depth, best_score)
+        if best_move is None or is_better_root_move(score, ranks[m], best_score, ranks[best_move]):
+            best_score, best_move = score, m
+            root_best_move = m
+    return best_score, best_move
+
+# --- Ventanas de aspiración ---
+def aspiration_search(board, depth, previous_score):
+    """
+    Busca la raíz con una ventana estrecha centrada en la puntuación de la iteración anterior.
+    Si el resultado cae fuera (falla por abajo o por arriba), ensancha ese lado y repite la búsqueda,
+    hasta acabar con la ventana completa si hace falta.
+
+    Args:
+        board (ChessBoard): La instancia actual del tablero de ajedrez.
+        depth (int): Profundidad de la iteración.
+        previous_score (float | None): Puntuación de la iteración anterior (bando que mueve), o None.
+
+    Returns:
+        tuple: (score, best_move) de negamax dentro de la ventana final.
+    """
+    inf = float('inf')
+    if previous_score is None or depth < ASPIRATION_MIN_DEPTH or abs(previous_score) >= MATE_SCORE:
+        return negamax(board, depth, -inf, inf)
+
+    search_stats["aspiration_searches"] += 1
+    low_delta = high_delta = ASPIRATION_WINDOW
+    while True:
+        alpha = previous_score - low_delta if low_delta <= ASPIRATION_MAX_WINDOW else -inf
+        beta = previous_score + high_delta if high_delta <= ASPIRATION_MAX_WINDOW else inf
+        score, move = negamax(board, depth, alpha, beta)
+        if score <= alpha and alpha > -inf: # Falla por abajo: la posición es peor de lo esperado.
+            search_stats["aspiration_fail_lows"] += 1
+            low_delta *= ASPIRATION_GROWTH
+        elif score >= beta and beta < inf: # Falla por arriba: la posición es mejor de lo esperado.
+            search_stats["aspiration_fail_highs"] += 1
+            high_delta *= ASPIRATION_GROWTH
+        else:
+            return score, move
+
+# --- Información de la búsqueda ---
+def principal_variation(board, max_length, prefix=()):
+    """
+    Completa y valida la variante principal: juega desde la raíz los movimientos de prefix (la de la
+    tabla triangular, que se corta donde la búsqueda devolvió una entrada de la tabla de transposiciones)
+    y sigue con el mejor movimiento que la tabla guarda para cada posición, hasta max_length movimientos,
+    un movimiento ilegal, una posición sin movimiento en la tabla o una repetición.
+
+    Args:
+        board (ChessBoard): La posición raíz (se deja como estaba).
+        max_length (int): Longitud máxima de la variante.
+        prefix (tuple, optional): Principio de la variante.
+
+    Returns:
+        tuple: (pv, keys): los movimientos codificados como enteros y las claves de Zobrist de las
+               posiciones en las que se juegan.
+    """
+    pv, keys = [], []
+    while len(pv) < max(max_length, len(prefix)) and board.zobrist_key not in keys:
+        if len(pv) < len(prefix):
+            move = prefix[len(pv)]
+        else:
+            entry = transposition_table.probe(board.zobrist_key)
+            move = entry[3] if entry is not None else None
+        if move is None or move not in MoveGenerator.generate_legal_moves(board, board.turn):
+            break
+        keys.append(board.zobrist_key)
+        pv.append(move)
+        board.make_move(move)
+    for _ in pv:
+        board.undo_move()
+    return pv, keys
+
+def collect_search_info(depth, score, pv, start_time, iteration_start, tt_start):
+    """
+    Crea el SearchInfo de una iteración completa a partir de los contadores de la búsqueda.
+
+    Args:
+        depth (int): Profundidad completada.
+        score (float): Puntuación de la iteración (bando que mueve).
+        pv (list): Variante principal de la iteración.
+        start_time (float): Instante (time.time()) en que empezó la búsqueda.
+        iteration_start (float): Instante en que empezó la iteración.
+        tt_start (tuple): (probes, hits, stores) de la tabla al empezar la búsqueda.
+
+    Returns:
+        SearchInfo: La información de la iteración.
+    """
+    now = time.time()
+    table = transposition_table
+    probes, hits, stores = table.probes - tt_start[0], table.hits - tt_start[1], table.stores - tt_start[2]
+    return SearchInfo(depth, search_stats["seldepth"], score, search_stats["nodes"], search_stats["qnodes"],
+                      now - start_time, now - iteration_start, probes, hits, stores,
+                      search_stats["cutoffs"], search_stats["first_move_cutoffs"], pv)
 
 # --- Profundización iterativa ---
-def get_best_move(board, max_depth=3, time_limit=10.0):
+def get_best_move(board, max_depth=3, time_limit=10.0, context=None, time_manager=None, workers=1,
+                  ponder=False, stop=None, on_info=None, return_pv=False):
     """
     Función principal para obtener el mejor movimiento de la IA utilizando profundización iterativa.
-    Realiza búsquedas Minimax a profundidades crecientes hasta alcanzar un límite de tiempo o profundidad.
+    Realiza búsquedas negamax a profundidades crecientes hasta alcanzar un límite de tiempo o profundidad.
+    El reloj también se consulta dentro de la búsqueda: al agotarse el tiempo se aborta la iteración en
+    curso y se usa el mejor movimiento de la última iteración completa, o el de la iteración parcial si
+    ya se terminó de buscar algún movimiento raíz que mejora alfa. Si solo hay un movimiento legal,
+    se devuelve sin buscar (con un SearchInfo de profundidad 0).
+    Cada iteración prueba primero, en cada posición, el movimiento de la variante principal de la anterior;
+    la variante final queda en context.pv.
+    Con workers > 1 la búsqueda es paralela (Lazy SMP, ver IA/smp.py): otros procesos buscan la misma
+    posición a la vez compartiendo la tabla de transposiciones, y se juega el resultado más profundo.
     
     Args:
         board (ChessBoard): La instancia actual del tablero de ajedrez.
-        max_depth (int, optional): La profundidad máxima a la que se buscará. Por defecto es 3.
+        max_depth (int, optional): La profundidad máxima a la que se buscará (como mucho MAX_PLY - 1). Por defecto es 3.
         time_limit (float, optional): El límite de tiempo en segundos para la búsqueda. Por defecto es 10.0.
+                                      None para buscar sin límite de tiempo.
+        context (SearchContext, optional): Estado que se conserva entre jugadas de la partida.
+                                           Por defecto se usa el contexto global del módulo.
+        time_manager (TimeManager, optional): Presupuesto de tiempo con reloj (IA/time_manager.py). Si se indica,
+                                              sustituye a time_limit: el presupuesto duro es el límite de la
+                                              búsqueda y el blando decide si se empieza otra iteración.
+        workers (int, optional): Procesos que buscan en paralelo (este incluido). Por defecto 1. Con más de uno,
+                                 el contexto debe tener la tabla en memoria compartida (SearchContext(shared=True)).
+        ponder (bool, optional): Búsqueda en el tiempo del rival (IA/ponder.py): se ignoran time_limit y
+                                 time_manager y se busca hasta max_depth, hasta que ponder_hit() le da un
+                                 presupuesto o hasta que se activa stop. Antes hay que llamar a start_pondering().
+        stop (threading.Event, optional): Evento que aborta la búsqueda (el rival no jugó lo previsto).
+        on_info (callable, optional): Función que recibe el SearchInfo de cada iteración completa (por ejemplo,
+                                      print). Con o sin ella, quedan todos en context.search_info.
+        return_pv (bool, optional): Devolver también la variante principal.
         
     Returns:
-        MoveClass: El mejor movimiento encontrado por la IA.
+        MoveClass: El mejor movimiento encontrado por la IA. Con return_pv, una tupla (move, pv) con la
+                   variante principal como lista de movimientos codificados (empieza por move).
     """
+    global deadline, poll_countdown, root_ply, root_best_move, stop_event, pondering, active_time_manager, pv_moves
     start_time = time.time() # Marca el tiempo de inicio de la búsqueda.
-    best_move_tuple = None # Almacena el mejor movimiento encontrado hasta ahora (como tupla).
-    is_maximizing = (board.turn == "w") # Determina si el jugador actual es el maximizador.
-
-    # Reiniciar tablas para cada nueva búsqueda (importante para evitar información obsoleta).
-    global transposition_table, killer_moves, history_heuristic
-    transposition_table = {} # Reinicia la tabla de transposiciones.
-    killer_moves = {d: [] for d in range(max_depth + 1)} # Inicializa killer moves para cada profundidad.
-    history_heuristic = {} # Reinicia la heurística de historial.
+    if context is None:
+        context = default_context
+
+    max_depth = min(max_depth, MAX_PLY - 1) # Sin extensiones, ply <= depth: cabe en la tabla triangular.
+    legal_moves = MoveGenerator.generate_legal_moves(board, board.turn)
+
+    best_move = None # Almacena el mejor movimiento encontrado hasta ahora (codificado como entero).
+    eval_score = None # Puntuación de la última iteración completada (centro de la ventana de aspiración).
+    pv = [] # Variante principal de la última iteración completada.
+
+    # Preparar el contexto (envejece la tabla y la historia en vez de borrarlas) y enlazar sus tablas.
+    if workers > 1 and not isinstance(context.transposition_table, SharedTranspositionTable):
+        raise ValueError("La búsqueda con varios procesos necesita un SearchContext(shared=True).")
+    context.new_search(board, max_depth)
+    activate_context(context)
+
+    # Respuesta forzada: con un único movimiento legal no hay nada que buscar. El contexto queda como tras
+    # cualquier búsqueda (posición, variante e información de profundidad 0), y la siguiente lo continúa.
+    if len(legal_moves) == 1:
+        if time_manager is not None and not ponder:
+            time_manager.start(board)
+        deadline = stop_event = None
+        pondering = False
+        poll_countdown = POLL_INTERVAL
+        root_ply = len(board.move_log)
+        table = context.transposition_table
+        tt_start = (table.probes, table.hits, table.stores)
+        context.pv = legal_moves[:]
+        score = quiescence_search(board, float('-inf'), float('inf')) # La respuesta, vista por la quiescencia.
+        info = collect_search_info(0, score, context.pv, start_time, start_time, tt_start)
+        context.search_info.append(info)
+        if on_info is not None:
+            on_info(info)
+        move = MoveClass.from_int(legal_moves[0], board)
+        return (move, context.pv) if return_pv else move
+
+    # Límite de tiempo que consulta poll_deadline dentro de negamax y de la quiescencia.
+    # En el tiempo del rival lo fijan start_pondering() y, si el rival juega lo previsto, ponder_hit().
+    stop_event = stop
+    if not ponder:
+        pondering = False
+        active_time_manager = time_manager
+        if time_manager is not None:
+            time_manager.start(board)
+            deadline = time_manager.deadline
+        else:
+            deadline = start_time + time_limit if time_limit is not None else None
+    poll_countdown = POLL_INTERVAL
+    root_ply = len(board.move_log)
+    pv_moves = {}
+    table = context.transposition_table
+    tt_start = (table.probes, table.hits, table.stores) # Los contadores de la tabla se acumulan entre búsquedas.
+
+    # Lazy SMP: los procesos auxiliares empiezan a buscar la misma posición con la tabla compartida.
+    helpers = None
+    if workers > 1:
+        from IA.smp import LazySMPHelpers # Importa aquí para evitar importaciones circulares.
+        helpers = LazySMPHelpers(board, context.transposition_table, workers, max_depth, deadline)
 
     # Iterative Deepening (Profundización Iterativa).
-    for depth in range(1, max_depth + 1): # Itera desde profundidad 1 hasta max_depth.
-        # Verificar límite de tiempo.
-        if time.time() - start_time > time_limit:
-            print(f"⏳ Tiempo límite alcanzado en profundidad {depth-1}. Usando el mejor movimiento encontrado hasta ahora.")
-            break # Sale del bucle si se excede el tiempo.
-
-        # Llamar a minimax para la profundidad actual.
-        eval_score, move_tuple = minimax(board, depth, float('-inf'), float('inf'), is_maximizing)
-        
-        # Si se encontró un movimiento válido, actualizar el mejor movimiento global.
-        if move_tuple:
-            best_move_tuple = move_tuple
-            # print(f"Profundidad {depth}: Mejor movimiento {move_tuple}, Evaluación: {eval_score}") # Para depuración.
-        else:
-            # Si no se encontró un movimiento en esta profundidad, y no hay un best_move_tuple previo,
-            # significa que no hay movimientos legales o algo salió mal.
-            # Esto debería ser manejado por la lógica de jaque mate/ahogado en minimax.
-            pass
+    depth = 0
+    try:
+        for depth in range(1, max_depth + 1): # Itera desde profundidad 1 hasta max_depth.
+            # Verificar límite de tiempo.
+            if deadline is not None and time.time() >= deadline:
+                print(f"⏳ Tiempo límite alcanzado en profundidad {depth-1}. Usando el mejor movimiento encontrado hasta ahora.")
+                break # Sale del bucle si se excede el tiempo.
+
+            # Llamar a negamax para la profundidad actual (puntuación desde el punto de vista del bando que mueve),
+            # con una ventana de aspiración alrededor de la puntuación de la iteración anterior.
+            root_best_move = None
+            iteration_start = time.time()
+            eval_score, move = aspiration_search(board, depth, eval_score)
+            search_stats["completed_depth"] = depth
+
+            # Si se encontró un movimiento válido, actualizar el mejor movimiento global.
+            if move is not None:
+                best_move = move
+                pv, keys = principal_variation(board, depth, pv_table[0])
+                if not pv or pv[0] != move: # No debería ocurrir: al menos el movimiento de la iteración.
+                    pv, keys = [move], [board.zobrist_key]
+                pv_moves = dict(zip(keys, pv)) # La siguiente iteración la sigue donde la tabla haya perdido la entrada.
+                info = collect_search_info(depth, eval_score, pv, start_time, iteration_start, tt_start)
+                context.search_info.append(info)
+                if on_info is not None:
+                    on_info(info)
+                # print(f"Profundidad {depth}: Mejor movimiento {move_to_uci(move)}, Evaluación: {eval_score}") # Para depuración.
+                if pondering or active_time_manager is not None:
+                    if abs(eval_score) >= MATE_SCORE: # Mate encontrado: buscar más no lo mejora.
+                        break
+                    if not pondering and active_time_manager.should_stop(move, eval_score): # La siguiente iteración no cabe en el presupuesto.
+                        break
+            else:
+                # Si no se encontró un movimiento en esta profundidad, y no hay un best_move previo,
+                # significa que no hay movimientos legales o algo salió mal.
+                # Esto debería ser manejado por la lógica de jaque mate/ahogado en negamax.
+                pass
+    except SearchTimeout:
+        # La búsqueda se abortó a mitad de una iteración: deshacer los movimientos que quedaron hechos.
+        while len(board.move_log) > root_ply:
+            board.undo_move()
+        if root_best_move is not None: # La iteración parcial ya encontró un movimiento raíz mejor.
+            best_move = root_best_move
+            pv = principal_variation(board, depth, pv_table[0])[0] # Su variante, si sigue en la tabla triangular.
+        if not pondering: # Una búsqueda en el tiempo del rival cancelada no agotó ningún tiempo.
+            print(f"⏳ Tiempo límite alcanzado durante la profundidad {depth}. Usando el mejor movimiento encontrado hasta ahora.")
+    finally:
+        deadline = None
+        stop_event = None
+        pondering = False
+        active_time_manager = None
+        pv_moves = {} # Las búsquedas sueltas (negamax, aspiration_search) no siguen una variante vieja.
+        if helpers is not None:
+            # Se paran los auxiliares y se juega el resultado más profundo (a igual profundidad, el propio).
+            helper_depth, helper_move = helpers.stop(search_stats)
+            if helper_move is not None and helper_depth > search_stats["completed_depth"]:
+                best_move = helper_move
 
     # Fallback si no se encontró ningún movimiento (ej. al inicio del juego o si el tiempo se agota muy rápido).
-    if not best_move_tuple:
-        legal_moves = MoveGenerator.generate_legal_moves(board, board.turn) # Obtiene movimientos legales.
-        if legal_moves:
-            print("⚠️ No se encontró mejor movimiento por la IA, usando el primer movimiento legal como fallback.")
-            start, end = legal_moves[0] # Toma el primer movimiento legal como fallback.
-            return MoveClass(start, end, board, promotion_choice="q")
-        return None # No hay movimientos legales en absoluto.
+    if best_move is None:
+        if not legal_moves:
+            context.pv = []
+            return (None, []) if return_pv else None # No hay movimientos legales en absoluto.
+        print("⚠️ No se encontró mejor movimiento por la IA, usando el primer movimiento legal como fallback.")
+        best_move = legal_moves[0] # Toma el primer movimiento legal como fallback.
 
     # Asegurarse de que el movimiento final sea legal.
-    # Esto es una doble verificación, ya que minimax solo debería devolver movimientos legales.
-    final_legal_moves = MoveGenerator.generate_legal_moves(board, board.turn)
-    if best_move_tuple not in final_legal_moves:
-        print(f"⚠️ El movimiento {best_move_tuple} seleccionado por la IA es ilegal. Usando el primer movimiento legal como fallback.")
-        if final_legal_moves:
-            start, end = final_legal_moves[0]
-            return MoveClass(start, end, board, promotion_choice="q")
-        return None
-
-    start, end = best_move_tuple # Desempaqueta el mejor movimiento.
-    return MoveClass(start, end, board, promotion_choice="q") # Retorna el objeto Move.
-
-
+    # Esto es una doble verificación, ya que negamax solo debería devolver movimientos legales.
+    elif best_move not in legal_moves:
+        print(f"⚠️ El movimiento {move_to_uci(best_move)} seleccionado por la IA es ilegal. Usando el primer movimiento legal como fallback.")
+        best_move = legal_moves[0]
+
+    # Variante del movimiento jugado (si no es el de la última iteración: parcial, de un auxiliar o fallback).
+    if not pv or pv[0] != best_move:
+        pv = principal_variation(board, max(depth, 1), (best_move,))[0]
+    context.pv = pv
+
+    # La interfaz trabaja con objetos Move: solo aquí se convierte el entero.
+    move = MoveClass.from_int(best_move, board) # El objeto Move.
+    return (move, pv) if return_pv else move
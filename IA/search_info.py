@@ -0,0 +1,114 @@
+# IA/search_info.py
+# Información de la búsqueda por iteración: get_best_move crea un SearchInfo al completar cada profundidad,
+# lo guarda en context.search_info y, si se indica, lo pasa a un callback (on_info). Solo cuesta una lista de
+# contadores por iteración (los contadores por nodo ya existen en context.stats), así que puede quedarse
+# activada siempre, por ejemplo para vigilar caídas de NPS.
+#
+# Uso: python -m IA.search_info --depth 6 [--fen "..." | --epd posiciones.epd] [--time 5]
+import argparse # Argumentos de la línea de comandos.
+from chessLogic.move import move_to_uci # Movimientos de la variante principal en notación UCI.
+
+MATE_SCORE = 1000000 # Igual que en IA/search.py (no se importa: search importa este módulo).
+
+
+class SearchInfo:
+    """
+    Resumen de una iteración completa de la profundización iterativa. Los contadores (nodos, tabla de
+    transposiciones, podas) son acumulados desde el principio de la búsqueda; iteration_time es solo
+    el de esta iteración.
+    """
+
+    def __init__(self, depth, seldepth, score, nodes, qnodes, elapsed, iteration_time,
+                 tt_probes, tt_hits, tt_stores, cutoffs, first_move_cutoffs, pv):
+        """
+        Args:
+            depth (int): Profundidad completada.
+            seldepth (int): Máxima distancia a la raíz alcanzada (quiescencia incluida).
+            score (float): Puntuación de la iteración desde el punto de vista del bando que mueve.
+            nodes (int): Nodos de negamax.
+            qnodes (int): Nodos de quiescencia.
+            elapsed (float): Segundos desde el principio de la búsqueda.
+            iteration_time (float): Segundos de esta iteración (con sus repeticiones por aspiración).
+            tt_probes (int): Consultas a la tabla de transposiciones.
+            tt_hits (int): Consultas que encontraron la posición.
+            tt_stores (int): Escrituras en la tabla.
+            cutoffs (int): Podas beta.
+            first_move_cutoffs (int): Podas beta del primer movimiento probado.
+            pv (list): Variante principal (movimientos codificados como enteros).
+        """
+        self.depth = depth
+        self.seldepth = seldepth
+        self.score = score
+        self.nodes = nodes
+        self.qnodes = qnodes
+        self.elapsed = elapsed
+        self.iteration_time = iteration_time
+        self.tt_probes = tt_probes
+        self.tt_hits = tt_hits
+        self.tt_stores = tt_stores
+        self.cutoffs = cutoffs
+        self.first_move_cutoffs = first_move_cutoffs
+        self.pv = pv
+
+    @property
+    def nps(self):
+        """
+        Nodos por segundo (negamax y quiescencia) desde el principio de la búsqueda.
+        """
+        return int((self.nodes + self.qnodes) / self.elapsed) if self.elapsed > 0 else 0
+
+    @property
+    def tt_hit_rate(self):
+        """
+        Fracción de consultas a la tabla de transposiciones que encontraron la posición.
+        """
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    @property
+    def first_move_cutoff_rate(self):
+        """
+        Fracción de podas que produjo el primer movimiento probado (calidad de la ordenación).
+        """
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def as_dict(self):
+        """
+        Devuelve los campos (y los derivados nps, tt_hit_rate y first_move_cutoff_rate) en un diccionario.
+        """
+        info = dict(vars(self))
+        info.update(nps=self.nps, tt_hit_rate=self.tt_hit_rate, first_move_cutoff_rate=self.first_move_cutoff_rate)
+        return info
+
+    def __str__(self):
+        """
+        Línea de estilo UCI ("info depth ... pv ..."), con los contadores propios de este motor.
+        """
+        if abs(self.score) >= MATE_SCORE: # Mate: en jugadas, a partir de la longitud de la variante.
+            moves = (len(self.pv) + 1) // 2
+            score = f"mate {moves if self.score > 0 else -moves}"
+        else:
+            score = f"cp {round(self.score)}"
+        return (f"info depth {self.depth} seldepth {self.seldepth} score {score} "
+                f"nodes {self.nodes + self.qnodes} qnodes {self.qnodes} nps {self.nps} "
+                f"time {round(self.elapsed * 1000)} itertime {round(self.iteration_time * 1000)} "
+                f"tthits {self.tt_hits}/{self.tt_probes} ttstores {self.tt_stores} "
+                f"cutoffs {self.cutoffs} firstcut {self.first_move_cutoff_rate:.3f} "
+                f"pv {' '.join(move_to_uci(m) for m in self.pv)}")
+
+
+if __name__ == "__main__":
+    from chessLogic.chessboard import ChessBoard # Solo para la línea de comandos.
+    from chessLogic.fen import START_FEN, board_to_fen, iter_fen_file # Posiciones en FEN/EPD.
+    from IA.search import get_best_move, SearchContext # Importa aquí: search importa este módulo.
+
+    parser = argparse.ArgumentParser(description="Información de la búsqueda por iteración.")
+    parser.add_argument("--fen", default=START_FEN, help="Posición en notación FEN.")
+    parser.add_argument("--epd", help="Archivo FEN/EPD con una posición por línea (en lugar de --fen).")
+    parser.add_argument("--depth", type=int, default=6, help="Profundidad máxima en medias jugadas.")
+    parser.add_argument("--time", type=float, help="Límite de tiempo por posición en segundos.")
+    args = parser.parse_args()
+
+    positions = iter_fen_file(args.epd) if args.epd else [(ChessBoard.from_fen(args.fen), {})]
+    for board, operations in positions:
+        print(operations.get("id", board_to_fen(board)))
+        get_best_move(board, max_depth=args.depth, time_limit=args.time, context=SearchContext(), on_info=print)
@@ -0,0 +1,93 @@
+# IA/see.py
+# Evaluación estática de intercambios (SEE, "Static Exchange Evaluation").
+# Estima el material que gana o pierde una captura si ambos bandos siguen capturando en la misma casilla,
+# siempre con la pieza menos valiosa y pudiendo detenerse cuando seguir les perjudica. No hace movimientos:
+# trabaja sobre una copia de la ocupación y vuelve a consultar las piezas deslizantes al retirar cada
+# atacante, para descubrir los ataques en rayos X (torre detrás de torre, dama detrás de alfil...).
+from IA.evaluation import piece_values # Valores de las piezas en centipeones.
+from chessLogic.move import EN_PASSANT, PROMOTION, PROMOTION_PIECES # Codificación entera de movimientos.
+from chessLogic.attack_tables import KNIGHT_ATTACKS_BB, KING_ATTACKS_BB, PAWN_ATTACKS_BB # Saltos y ataques de peón.
+from chessLogic.slider_attacks import ROOK_ATTACKS, ROOK_MASKS, BISHOP_ATTACKS, BISHOP_MASKS # Ataques deslizantes.
+
+EXCHANGE_ORDER = "pnbrqk" # Cada bando recaptura con su pieza menos valiosa.
+
+
+def attackers_to(board, sq, occupancy):
+    """
+    Devuelve el bitboard de las piezas de ambos colores que atacan una casilla con la ocupación dada.
+
+    Args:
+        board (ChessBoard): La instancia del tablero de ajedrez.
+        sq (int): Índice de la casilla (0..63).
+        occupancy (int): Ocupación a considerar (las piezas ya retiradas no bloquean ni atacan).
+
+    Returns:
+        int: Bitboard de atacantes (hay que cruzarlo con occupancy[color] para separar los bandos).
+    """
+    bb = board.bitboards
+    diagonal = bb["wb"] | bb["bb"] | bb["wq"] | bb["bq"]
+    straight = bb["wr"] | bb["br"] | bb["wq"] | bb["bq"]
+    attackers = (PAWN_ATTACKS_BB["b"][sq] & bb["wp"]) | (PAWN_ATTACKS_BB["w"][sq] & bb["bp"]) \
+        | (KNIGHT_ATTACKS_BB[sq] & (bb["wn"] | bb["bn"])) \
+        | (KING_ATTACKS_BB[sq] & (bb["wk"] | bb["bk"])) \
+        | (BISHOP_ATTACKS[sq][occupancy & BISHOP_MASKS[sq]] & diagonal) \
+        | (ROOK_ATTACKS[sq][occupancy & ROOK_MASKS[sq]] & straight)
+    return attackers & occupancy
+
+
+def static_exchange_eval(board, move):
+    """
+    Calcula el balance material de una captura (o promoción) tras la secuencia de recapturas en su casilla.
+
+    Args:
+        board (ChessBoard): La instancia del tablero de ajedrez (no se modifica).
+        move (int): El movimiento codificado, del bando que mueve.
+
+    Returns:
+        int: Ganancia en centipeones para el bando que mueve (negativa si la captura pierde material).
+    """
+    from_sq = move & 63
+    to_sq = (move >> 6) & 63
+    flags = move >> 12
+    rows = board.board
+    bb = board.bitboards
+    color = board.turn
+    occupancy = board.all_occupancy ^ (1 << from_sq) # El atacante deja su casilla.
+
+    moving = rows[from_sq >> 3][from_sq & 7][1]
+    target = rows[to_sq >> 3][to_sq & 7]
+    if flags == EN_PASSANT: # El peón capturado no está en la casilla de destino.
+        gain = piece_values["p"]
+        occupancy ^= 1 << (to_sq + (8 if color == "w" else -8))
+    else:
+        gain = piece_values[target[1]] if target != "--" else 0
+    on_square = piece_values[moving] # Valor de la pieza que queda en la casilla (la siguiente víctima).
+    if flags & PROMOTION:
+        promoted = piece_values[PROMOTION_PIECES[flags & 3]]
+        gain += promoted - piece_values["p"]
+        on_square = promoted
+
+    gains = [gain]
+    attackers = attackers_to(board, to_sq, occupancy)
+    side = "b" if color == "w" else "w"
+    while True:
+        side_attackers = attackers & board.occupancy[side]
+        if not side_attackers:
+            break
+        for kind in EXCHANGE_ORDER: # Pieza menos valiosa del bando que recaptura.
+            candidates = side_attackers & bb[side + kind]
+            if candidates:
+                break
+        other = "b" if side == "w" else "w"
+        if kind == "k" and attackers & board.occupancy[other]: # El rey no puede capturar en una casilla defendida.
+            break
+        gains.append(on_square - gains[-1]) # Balance si este bando captura (y el rival puede pararse).
+        on_square = piece_values[kind]
+        occupancy ^= candidates & -candidates # Retira el atacante...
+        attackers = attackers_to(board, to_sq, occupancy) # ... y descubre los rayos X que hubiera detrás.
+        side = other
+
+    # Cada bando puede no recapturar si le sale peor: se propaga desde el final de la secuencia.
+    for i in range(len(gains) - 1, 0, -1):
+        gains[i - 1] = -max(-gains[i - 1], gains[i])
+    return gains[0]
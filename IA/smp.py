@@ -0,0 +1,178 @@
+# IA/smp.py
+# Búsqueda paralela "Lazy SMP" con varios procesos (el GIL impide aprovechar varios núcleos con hilos).
+# Todos los procesos buscan la misma posición por profundización iterativa y solo se comunican a través
+# de la tabla de transposiciones compartida (IA/transposition.SharedTranspositionTable, sin bloqueos):
+# lo que uno ya ha buscado lo aprovechan los demás para ordenar y podar. Para que no recorran el árbol
+# en el mismo orden, cada proceso auxiliar se salta algunas profundidades (patrón escalonado).
+#
+# get_best_move(..., workers=N) hace de coordinador: busca en su propio proceso, arranca N-1 auxiliares
+# con LazySMPHelpers y, al terminar, se queda con el resultado completo más profundo.
+#
+# Uso (escalado): python -m IA.smp --depth 5 --workers 1 2 4 8 [--position kiwipete | --fen "..."]
+import argparse # Argumentos de la línea de comandos.
+import multiprocessing # Procesos auxiliares, evento de parada y cola de resultados.
+import os # Número de núcleos.
+import queue # Excepción Empty de la cola de resultados.
+import time # Medición de tiempos para el escalado y plazo de parada de los auxiliares.
+from chessLogic.chessboard import ChessBoard # Cada auxiliar reconstruye el tablero desde FEN.
+from chessLogic.fen import board_to_fen # La posición viaja a los auxiliares en FEN.
+from chessLogic.move import move_to_uci # Movimientos en notación UCI para el informe de escalado.
+from IA import search # Funciones y estado global de la búsqueda.
+from IA.perft import REFERENCE_POSITIONS # Posiciones de referencia para medir el escalado.
+
+SMP_WORKERS = os.cpu_count() or 1 # Procesos por defecto: uno por núcleo.
+HELPER_POLL_INTERVAL = 0.1 # Segundos entre comprobaciones de los auxiliares mientras se espera su resultado.
+HELPER_STOP_TIMEOUT = 2.0 # Segundos que se espera a los auxiliares tras pedirles parar; después se terminan.
+
+# Profundidades que se salta cada auxiliar (patrón de Stockfish 8): el auxiliar i usa la fila (i - 1) % 20
+# y se salta la profundidad d si ((d + SKIP_PHASE) // SKIP_SIZE) es impar. Así, en cada momento, los
+# procesos trabajan repartidos entre la profundidad del coordinador y las siguientes.
+SKIP_SIZE = (1, 1, 2, 2, 2, 2, 3, 3, 3, 3, 3, 3, 4, 4, 4, 4, 4, 4, 4, 4)
+SKIP_PHASE = (0, 1, 0, 1, 2, 3, 0, 1, 2, 3, 4, 5, 0, 1, 2, 3, 4, 5, 6, 7)
+
+
+def skips_depth(worker_id, depth):
+    """
+    Indica si el proceso auxiliar worker_id (>= 1) se salta la iteración de profundidad depth.
+    El coordinador (worker_id 0) no se salta ninguna.
+    """
+    if worker_id == 0:
+        return False
+    i = (worker_id - 1) % len(SKIP_SIZE)
+    return (depth + SKIP_PHASE[i]) // SKIP_SIZE[i] % 2 == 1
+
+
+def _helper_search(fen, table, worker_id, max_depth, deadline, stop, results):
+    """
+    Proceso auxiliar: profundización iterativa sobre la posición con la tabla compartida hasta max_depth,
+    el tiempo límite o la señal de parada. Envía a la cola ("iteration", worker_id, depth, move) al completar
+    cada iteración y ("done", worker_id, nodos) al terminar, también si la búsqueda falla.
+    """
+    context = None
+    try:
+        board = ChessBoard.from_fen(fen)
+        context = search.SearchContext(transposition_table=table)
+        context.killer_moves = {d: [] for d in range(max_depth + 1)}
+        search.activate_context(context)
+        search.deadline = deadline
+        search.stop_event = stop
+        search.poll_countdown = search.POLL_INTERVAL
+        search.root_ply = 0
+        search.pv_moves = {}
+
+        score = None
+        for depth in range(1, max_depth + 1):
+            if skips_depth(worker_id, depth):
+                continue
+            score, move = search.aspiration_search(board, depth, score)
+            if move is not None:
+                results.put(("iteration", worker_id, depth, move))
+            if abs(score) >= search.MATE_SCORE: # Mate encontrado: buscar más no lo mejora.
+                break
+    except search.SearchTimeout:
+        pass
+    finally: # Sin "done", el coordinador tendría que esperar al plazo para dar al auxiliar por terminado.
+        nodes = context.stats["nodes"] + context.stats["qnodes"] if context is not None else 0
+        results.put(("done", worker_id, nodes))
+
+
+class LazySMPHelpers:
+    """
+    Procesos auxiliares de una búsqueda Lazy SMP. Se crean al empezar la búsqueda del coordinador
+    y se paran con stop(), que devuelve el resultado completo más profundo que encontraron.
+    """
+
+    def __init__(self, board, table, workers, max_depth, deadline=None):
+        """
+        Arranca workers - 1 procesos auxiliares.
+
+        Args:
+            board (ChessBoard): La posición que se busca.
+            table (SharedTranspositionTable): La tabla compartida con el coordinador.
+            workers (int): Procesos en total, coordinador incluido.
+            max_depth (int): Profundidad máxima de la búsqueda.
+            deadline (float, optional): Instante (time.time()) en el que se aborta la búsqueda.
+        """
+        fen = board_to_fen(board)
+        self.stop_event = multiprocessing.Event()
+        self.results = multiprocessing.Queue()
+        self.processes = [
+            multiprocessing.Process(target=_helper_search, daemon=True,
+                                    args=(fen, table, i, max_depth, deadline, self.stop_event, self.results))
+            for i in range(1, workers)
+        ]
+        for process in self.processes:
+            process.start()
+
+    def stop(self, stats=None):
+        """
+        Para los auxiliares y recoge sus resultados. Un auxiliar que muere sin avisar (por ejemplo, por falta
+        de memoria) deja de esperarse; uno que no para en HELPER_STOP_TIMEOUT segundos se termina.
+
+        Args:
+            stats (dict, optional): Estadísticas de la búsqueda; se suman sus nodos en helper_nodes.
+
+        Returns:
+            tuple: (depth, move) de la iteración completa más profunda de los auxiliares, o (0, None).
+        """
+        self.stop_event.set()
+        best_depth, best_move = 0, None
+        running = set(range(1, len(self.processes) + 1)) # Auxiliares que aún no han enviado "done".
+        stop_deadline = time.time() + HELPER_STOP_TIMEOUT
+        while running: # Vaciar la cola antes de join(): un proceso con datos pendientes no termina.
+            try:
+                message = self.results.get(timeout=HELPER_POLL_INTERVAL)
+            except queue.Empty:
+                running = {i for i in running if self.processes[i - 1].is_alive()} # Los muertos ya no avisarán.
+                if running and time.time() >= stop_deadline:
+                    for i in running: # Atascado: no responde a la señal de parada.
+                        self.processes[i - 1].terminate()
+                    break
+                continue
+            if message[0] == "done":
+                running.discard(message[1])
+                if stats is not None:
+                    stats["helper_nodes"] += message[2]
+            elif message[2] > best_depth:
+                best_depth, best_move = message[2], message[3]
+        for process in self.processes:
+            process.join(HELPER_STOP_TIMEOUT)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        return best_depth, best_move
+
+
+def measure_scaling(fen, depth, worker_counts, tt_size_mb=search.TT_SIZE_MB):
+    """
+    Mide el tiempo hasta completar una profundidad fija con distintos números de procesos
+    (con una tabla vacía en cada medición) e imprime la aceleración respecto al primero.
+
+    Returns:
+        list: Tuplas (workers, segundos, nodos totales, movimiento en notación UCI).
+    """
+    results = []
+    for workers in worker_counts:
+        context = search.SearchContext(tt_size_mb, shared=True)
+        board = ChessBoard.from_fen(fen)
+        start = time.perf_counter()
+        move = search.get_best_move(board, max_depth=depth, time_limit=None, context=context, workers=workers)
+        elapsed = time.perf_counter() - start
+        stats = context.stats
+        nodes = stats["nodes"] + stats["qnodes"] + stats["helper_nodes"]
+        context.transposition_table.close()
+        results.append((workers, elapsed, nodes, move_to_uci(move.to_int()) if move else None))
+        speedup = results[0][1] / elapsed if elapsed > 0 else 0.0
+        print(f"workers={workers}: {elapsed:.2f}s, {nodes} nodos, x{speedup:.2f} ({results[-1][3]})")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Escalado de la búsqueda Lazy SMP.")
+    parser.add_argument("--fen", help="Posición en notación FEN.")
+    parser.add_argument("--position", choices=sorted(REFERENCE_POSITIONS), default="kiwipete",
+                        help="Posición de referencia (si no se indica --fen).")
+    parser.add_argument("--depth", type=int, default=5, help="Profundidad en medias jugadas.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Números de procesos a medir.")
+    args = parser.parse_args()
+    measure_scaling(args.fen or REFERENCE_POSITIONS[args.position][0], args.depth, args.workers)
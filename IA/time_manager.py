@@ -0,0 +1,107 @@
+# IA/time_manager.py
+# Gestión del tiempo de la IA en partidas con reloj.
+# A partir del tiempo restante, el incremento y las jugadas que faltan hasta el siguiente control, reparte
+# para cada jugada un presupuesto blando (no empezar otra iteración después de agotarlo) y uno duro
+# (get_best_move aborta la búsqueda al alcanzarlo). El presupuesto blando se amplía cuando la búsqueda
+# es inestable: el mejor movimiento cambia entre iteraciones o la puntuación cae.
+import time # Reloj de pared, el mismo que usa IA/search.py para el límite de tiempo.
+
+MOVE_OVERHEAD = 0.05 # Segundos reservados por jugada para dibujar el tablero y hacer el movimiento.
+DEFAULT_MOVES_TO_GO = 40 # Jugadas restantes estimadas al empezar la partida (sin control de jugadas).
+MIN_MOVES_TO_GO = 15 # Estimación mínima: siempre se guarda tiempo para el resto de la partida.
+INCREMENT_USAGE = 0.75 # Fracción del incremento que se gasta en cada jugada.
+MAX_SOFT_FRACTION = 0.2 # El presupuesto blando nunca supera esta fracción del tiempo restante.
+HARD_FACTOR = 4.0 # El presupuesto duro es este múltiplo del blando...
+MAX_HARD_FRACTION = 0.4 # ... sin pasar de esta fracción del tiempo restante.
+NEXT_ITERATION_FRACTION = 0.6 # Tras gastar esta fracción del presupuesto blando, la siguiente iteración no cabría.
+
+BEST_MOVE_CHANGE_FACTOR = 1.4 # Ampliación del presupuesto blando si cambia el mejor movimiento.
+SCORE_DROP = 30 # Caída de la puntuación (centipeones) entre iteraciones que se considera preocupante.
+SCORE_DROP_FACTOR = 1.3 # Ampliación del presupuesto blando si la puntuación cae.
+MAX_EXTENSION = 2.5 # Ampliación máxima acumulada del presupuesto blando.
+
+
+class TimeManager:
+    """
+    Presupuesto de tiempo de una jugada con reloj. Se crea uno por jugada con el estado del reloj
+    y se pasa a get_best_move, que llama a start() y consulta should_stop() tras cada iteración.
+    """
+
+    def __init__(self, remaining, increment=0.0, moves_to_go=None, overhead=MOVE_OVERHEAD):
+        """
+        Args:
+            remaining (float): Tiempo restante en el reloj del bando que mueve, en segundos.
+            increment (float, optional): Incremento por jugada en segundos. Por defecto 0.
+            moves_to_go (int, optional): Jugadas hasta el siguiente control de tiempo. None para
+                                         estimarlas a partir del número de jugada.
+            overhead (float, optional): Segundos reservados por jugada para la interfaz.
+        """
+        self.remaining = remaining
+        self.increment = increment
+        self.moves_to_go = moves_to_go
+        self.overhead = overhead
+        self.start_time = None # Instante en que empezó la búsqueda (start()).
+        self.soft_limit = 0.0 # Presupuesto blando en segundos.
+        self.hard_limit = 0.0 # Presupuesto duro en segundos.
+        self.extension = 1.0 # Factor acumulado de ampliación del presupuesto blando.
+        self.last_best_move = None # Mejor movimiento de la iteración anterior.
+        self.last_score = None # Puntuación de la iteración anterior.
+
+    def start(self, board):
+        """
+        Empieza a contar el tiempo de la jugada y calcula los presupuestos.
+
+        Args:
+            board (ChessBoard): La posición que se va a buscar (para estimar las jugadas restantes).
+        """
+        self.start_time = time.time()
+        moves_to_go = self.moves_to_go
+        if moves_to_go is None:
+            moves_to_go = max(MIN_MOVES_TO_GO, DEFAULT_MOVES_TO_GO - board.fullmove_number // 2)
+        usable = max(0.0, self.remaining - self.overhead)
+
+        soft = usable / moves_to_go + self.increment * INCREMENT_USAGE
+        soft = min(soft, usable * MAX_SOFT_FRACTION)
+        if moves_to_go == 1: # Última jugada antes del control: se puede usar casi todo.
+            soft = usable * (1 - MAX_SOFT_FRACTION)
+        self.soft_limit = soft
+        self.hard_limit = max(soft, min(soft * HARD_FACTOR, usable * MAX_HARD_FRACTION))
+        self.extension = 1.0
+        self.last_best_move = None
+        self.last_score = None
+
+    @property
+    def deadline(self):
+        """
+        Instante (time.time()) en el que se agota el presupuesto duro.
+        """
+        return self.start_time + self.hard_limit
+
+    def elapsed(self):
+        """
+        Segundos transcurridos desde start().
+        """
+        return time.time() - self.start_time
+
+    def should_stop(self, best_move, score):
+        """
+        Se llama al terminar cada iteración. Amplía el presupuesto blando si el mejor movimiento cambió
+        o la puntuación cayó, y decide si merece la pena empezar la siguiente iteración.
+
+        Args:
+            best_move (int): Mejor movimiento de la iteración que acaba de terminar.
+            score (float): Su puntuación (desde el punto de vista del bando que mueve).
+
+        Returns:
+            bool: True si hay que dejar de buscar y jugar best_move.
+        """
+        if self.last_best_move is not None:
+            if best_move != self.last_best_move: # Búsqueda inestable: pensar más.
+                self.extension *= BEST_MOVE_CHANGE_FACTOR
+            if score < self.last_score - SCORE_DROP: # La posición empeora: pensar más.
+                self.extension *= SCORE_DROP_FACTOR
+            self.extension = min(self.extension, MAX_EXTENSION)
+        self.last_best_move = best_move
+        self.last_score = score
+        soft = min(self.soft_limit * self.extension, self.hard_limit)
+        return self.elapsed() >= soft * NEXT_ITERATION_FRACTION
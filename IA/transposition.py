@@ -0,0 +1,265 @@
+# IA/transposition.py
+# Tabla de transposiciones de tamaño fijo, reservada de antemano en dos arrays de enteros de 64 bits.
+#
+# Cada entrada ocupa 16 bytes: una palabra de datos y una palabra de verificación (clave XOR datos).
+# Guardar la clave mezclada con los datos permite detectar entradas corruptas o de otra posición
+# sin bloqueos (el mismo truco que usan los motores que comparten la tabla entre hilos o procesos).
+#
+# Palabra de datos:
+#   bits 0-15   mejor movimiento (codificación de chessLogic/move.py; 0 = ninguno)
+#   bits 16-23  profundidad (0..255)
+#   bits 24-25  tipo de cota (EXACT, LOWERBOUND, UPPERBOUND)
+#   bits 26-31  generación (0..63), para envejecer las entradas de búsquedas anteriores
+#   bits 32-63  puntuación * 100 desplazada en 2**31 (las evaluaciones son múltiplos de 0.01)
+#
+# Las entradas se agrupan en cubetas de 2: la primera se reemplaza preferentemente por profundidad
+# (o si es de una búsqueda anterior) y la segunda siempre se reemplaza.
+#
+# SharedTranspositionTable guarda los mismos arrays en un bloque de multiprocessing.shared_memory
+# para que varios procesos de la búsqueda paralela (IA/smp.py) compartan la tabla.
+from array import array # Arrays compactos de enteros sin signo de 64 bits.
+from multiprocessing import shared_memory # Memoria compartida entre procesos para la tabla paralela.
+
+EXACT = 0 # La puntuación es exacta.
+LOWERBOUND = 1 # La puntuación es una cota inferior (hubo poda beta).
+UPPERBOUND = 2 # La puntuación es una cota superior (ningún movimiento superó alfa).
+
+ENTRY_BYTES = 16 # Clave + datos.
+BUCKET_SIZE = 2 # Entradas por cubeta: preferida por profundidad + reemplazo siempre.
+GENERATION_MASK = 63 # Generaciones de 6 bits.
+SCORE_SCALE = 100 # Puntuación guardada como entero en centésimas.
+SCORE_OFFSET = 1 << 31 # Desplazamiento para guardar puntuaciones negativas en 32 bits sin signo.
+MAX_STORED_SCORE = SCORE_OFFSET - 1 # Límite del entero de 32 bits con signo.
+MASK_64 = (1 << 64) - 1
+FILL_SAMPLE = 1000 # Entradas examinadas para estimar la ocupación (como "hashfull" en UCI).
+
+
+class TranspositionTable:
+    """
+    Tabla de transposiciones de memoria acotada con cubetas de 2 entradas y envejecimiento por generación.
+    """
+
+    def __init__(self, size_mb=16):
+        """
+        Reserva la tabla.
+
+        Args:
+            size_mb (int | float, optional): Tamaño máximo en megabytes. Se redondea hacia abajo a una
+                                             potencia de dos de cubetas. Por defecto 16 MB.
+        """
+        buckets = max(1, int(size_mb * 1024 * 1024) // (ENTRY_BYTES * BUCKET_SIZE))
+        buckets = 1 << (buckets.bit_length() - 1) # Potencia de dos: el índice se obtiene con un AND.
+        self.bucket_mask = buckets - 1
+        self.size = buckets * BUCKET_SIZE # Número total de entradas.
+        self.generation = 0
+        self._allocate()
+
+    def _allocate(self):
+        """
+        Crea los arrays a cero (todas las entradas vacías).
+        """
+        zeros = bytes(8 * self.size)
+        self.keys = array("Q", zeros) # Clave XOR datos de cada entrada.
+        self.data = array("Q", zeros) # Datos empaquetados de cada entrada.
+        self.reset_stats()
+
+    def reset_stats(self):
+        """
+        Pone a cero los contadores de estadísticas.
+        """
+        self.probes = 0 # Consultas realizadas.
+        self.hits = 0 # Consultas que encontraron la posición.
+        self.stores = 0 # Escrituras realizadas.
+        self.collisions = 0 # Escrituras que expulsaron una entrada de otra posición de la búsqueda actual.
+
+    def clear(self):
+        """
+        Vacía la tabla (por ejemplo, al empezar una partida nueva).
+        """
+        self.generation = 0
+        self._allocate()
+
+    def new_search(self):
+        """
+        Avanza la generación: las entradas de búsquedas anteriores siguen siendo consultables,
+        pero pasan a ser las primeras candidatas a reemplazarse.
+        """
+        self.generation = (self.generation + 1) & GENERATION_MASK
+
+    def probe(self, key):
+        """
+        Busca una posición en la tabla.
+
+        Args:
+            key (int): Clave de Zobrist de la posición.
+
+        Returns:
+            tuple | None: (depth, flag, score, move) si la posición está en la tabla, o None.
+                          move es None si no se guardó ningún movimiento.
+        """
+        self.probes += 1
+        index = (key & self.bucket_mask) * BUCKET_SIZE
+        keys, data = self.keys, self.data
+        for i in (index, index + 1):
+            entry = data[i]
+            if keys[i] ^ entry == key and entry: # La verificación coincide y la entrada no está vacía.
+                self.hits += 1
+                return (
+                    (entry >> 16) & 0xFF,
+                    (entry >> 24) & 3,
+                    ((entry >> 32) - SCORE_OFFSET) / SCORE_SCALE,
+                    (entry & 0xFFFF) or None,
+                )
+        return None
+
+    def store(self, key, depth, flag, score, move=None):
+        """
+        Guarda el resultado de la búsqueda de una posición.
+
+        Reemplazo: si la posición ya está en la cubeta se actualiza su entrada (conservando el movimiento
+        si el nuevo es None) solo si la nueva profundidad es mayor o igual, la nueva puntuación es exacta
+        o la entrada es de una búsqueda anterior: una cota de la quiescencia (profundidad 0) no borra
+        una entrada más profunda de la misma posición. Si no está, la primera entrada se reemplaza cuando está vacía, es de una búsqueda
+        anterior o la nueva profundidad es mayor o igual; en otro caso se usa la segunda entrada.
+
+        Args:
+            key (int): Clave de Zobrist de la posición.
+            depth (int): Profundidad de la búsqueda (se limita a 0..255).
+            flag (int): EXACT, LOWERBOUND o UPPERBOUND.
+            score (float): Puntuación (múltiplo de 0.01).
+            move (int, optional): Mejor movimiento codificado, o None.
+        """
+        self.stores += 1
+        index = (key & self.bucket_mask) * BUCKET_SIZE
+        keys, data = self.keys, self.data
+        generation = self.generation
+
+        scaled = round(score * SCORE_SCALE)
+        if scaled > MAX_STORED_SCORE:
+            scaled = MAX_STORED_SCORE
+        elif scaled < -MAX_STORED_SCORE:
+            scaled = -MAX_STORED_SCORE
+        depth = 0 if depth < 0 else 255 if depth > 255 else depth
+
+        # ¿La posición ya está en la cubeta?
+        slot = -1
+        for i in (index, index + 1):
+            old = data[i]
+            if keys[i] ^ old == key and old:
+                if depth < (old >> 16) & 0xFF and flag != EXACT and (old >> 26) & GENERATION_MASK == generation:
+                    return # La entrada guardada es más profunda: vale más que esta cota.
+                slot = i
+                if move is None: # Conserva el movimiento anterior si el nuevo no aporta uno.
+                    move = (data[i] & 0xFFFF) or None
+                break
+
+        if slot < 0:
+            first = data[index]
+            if not first or (first >> 26) & GENERATION_MASK != generation or depth >= (first >> 16) & 0xFF:
+                slot = index # Entrada preferida por profundidad.
+            else:
+                slot = index + 1 # Entrada de reemplazo siempre.
+            old = data[slot]
+            if old and (old >> 26) & GENERATION_MASK == generation:
+                self.collisions += 1 # Se pierde una posición de la búsqueda actual.
+
+        entry = ((move or 0) | depth << 16 | flag << 24 | generation << 26
+                 | (scaled + SCORE_OFFSET) << 32)
+        data[slot] = entry
+        keys[slot] = (key ^ entry) & MASK_64
+
+    def fill_permille(self):
+        """
+        Estima la ocupación de la tabla (entradas de la búsqueda actual por cada mil), a partir de
+        una muestra de las primeras entradas.
+        """
+        sample = min(FILL_SAMPLE, self.size)
+        data = self.data
+        generation = self.generation
+        used = sum(1 for i in range(sample) if data[i] and (data[i] >> 26) & GENERATION_MASK == generation)
+        return used * 1000 // sample
+
+    def stats(self):
+        """
+        Devuelve las estadísticas de uso de la tabla.
+
+        Returns:
+            dict: probes, hits, hit_rate, stores, collisions, fill_permille, entries y size_mb.
+        """
+        return {
+            "probes": self.probes,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.probes if self.probes else 0.0,
+            "stores": self.stores,
+            "collisions": self.collisions,
+            "fill_permille": self.fill_permille(),
+            "entries": self.size,
+            "size_mb": self.size * ENTRY_BYTES / (1024 * 1024),
+        }
+
+
+class SharedTranspositionTable(TranspositionTable):
+    """
+    Tabla de transposiciones en memoria compartida entre procesos, sin bloqueos.
+    Dos procesos pueden escribir la misma entrada a la vez: la verificación (clave XOR datos) hace que
+    una entrada mezclada no coincida con ninguna clave y se ignore. La generación se guarda también en
+    la memoria compartida, así todos los procesos envejecen las entradas al mismo ritmo.
+
+    Disposición del bloque: palabra 0 = generación, después las claves y después los datos.
+    Al pasarla a otro proceso (pickle) se vuelve a abrir el mismo bloque por su nombre.
+    """
+
+    def __init__(self, size_mb=16, name=None):
+        """
+        Crea el bloque de memoria compartida, o se conecta a uno existente.
+
+        Args:
+            size_mb (int | float, optional): Tamaño máximo en megabytes (solo al crear la tabla).
+            name (str, optional): Nombre de un bloque existente al que conectarse. None para crear uno nuevo.
+        """
+        if name is None:
+            buckets = max(1, int(size_mb * 1024 * 1024) // (ENTRY_BYTES * BUCKET_SIZE))
+            buckets = 1 << (buckets.bit_length() - 1)
+            self.shm = shared_memory.SharedMemory(create=True, size=8 * (1 + 2 * buckets * BUCKET_SIZE))
+            self.owner = True # Solo el proceso que crea el bloque lo libera (unlink).
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+            buckets = (self.shm.size // 8 - 1) // (2 * BUCKET_SIZE)
+        self.bucket_mask = buckets - 1
+        self.size = buckets * BUCKET_SIZE
+        self._words = self.shm.buf.cast("Q")
+        self.keys = self._words[1:1 + self.size]
+        self.data = self._words[1 + self.size:1 + 2 * self.size]
+        self.reset_stats()
+
+    def __reduce__(self):
+        """
+        Al enviarla a otro proceso solo viaja el nombre del bloque.
+        """
+        return (SharedTranspositionTable, (0, self.shm.name))
+
+    @property
+    def generation(self):
+        return self._words[0]
+
+    @generation.setter
+    def generation(self, value):
+        self._words[0] = value
+
+    def _allocate(self):
+        """
+        Pone a cero el bloque compartido (todas las entradas vacías).
+        """
+        self.shm.buf[:] = bytes(len(self.shm.buf))
+        self.reset_stats()
+
+    def close(self):
+        """
+        Desconecta este proceso del bloque y, si lo creó, lo libera.
+        """
+        for view in (self.keys, self.data, self._words):
+            view.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
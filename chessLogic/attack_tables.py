@@ -0,0 +1,81 @@
+# chessLogic/attack_tables.py
+# Tablas de ataques precalculadas por casilla, construidas una sola vez al importar el módulo.
+# Evitan reconstruir listas de direcciones y comprobar los límites del tablero en cada llamada.
+# Las casillas se indexan con sq = fila * 8 + columna (ver chessLogic/bitboard.py).
+# Cada tabla existe en dos formas: tuplas de casillas (fila, columna) para recorrer el tablero 8x8
+# y bitboards (enteros de 64 bits) para consultas de conjunto contra ChessBoard.bitboards.
+
+# Direcciones de las líneas: primero las 4 rectas (torre) y después las 4 diagonales (alfil).
+ROOK_DIRECTIONS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+BISHOP_DIRECTIONS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+DIRECTIONS = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+ROOK_RAYS = range(0, 4) # Índices de RAYS[sq] que recorren líneas rectas.
+BISHOP_RAYS = range(4, 8) # Índices de RAYS[sq] que recorren diagonales.
+
+KNIGHT_OFFSETS = ((2, 1), (2, -1), (-2, 1), (-2, -1), (1, 2), (1, -2), (-1, 2), (-1, -2)) # Saltos en 'L'.
+KING_OFFSETS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)) # Casillas adyacentes.
+
+
+def _on_board(r, c):
+    """
+    Indica si (r, c) está dentro del tablero.
+    """
+    return 0 <= r < 8 and 0 <= c < 8
+
+
+def _to_bitboard(squares):
+    """
+    Convierte una secuencia de casillas (fila, columna) en un bitboard.
+    """
+    bb = 0
+    for r, c in squares:
+        bb |= 1 << (r * 8 + c)
+    return bb
+
+
+def _build_jumps(offsets):
+    """
+    Construye, para cada casilla, la tupla de destinos alcanzables con saltos fijos.
+    """
+    return tuple(
+        tuple((r + dr, c + dc) for dr, dc in offsets if _on_board(r + dr, c + dc))
+        for r in range(8) for c in range(8)
+    )
+
+
+def _build_ray(r, c, dr, dc):
+    """
+    Construye la secuencia de casillas desde (r, c) en la dirección (dr, dc), sin incluir el origen.
+    """
+    ray = []
+    r, c = r + dr, c + dc
+    while _on_board(r, c):
+        ray.append((r, c))
+        r, c = r + dr, c + dc
+    return tuple(ray)
+
+
+# SQUARE_COORDS[sq]: tupla (fila, columna) de cada índice, para no crearla en cada movimiento generado.
+SQUARE_COORDS = tuple((r, c) for r in range(8) for c in range(8))
+
+# --- Saltos fijos ---
+KNIGHT_TARGETS = _build_jumps(KNIGHT_OFFSETS) # KNIGHT_TARGETS[sq]: destinos de un caballo en sq.
+KING_TARGETS = _build_jumps(KING_OFFSETS) # KING_TARGETS[sq]: casillas adyacentes a sq.
+# PAWN_ATTACKS[color][sq]: casillas que ataca un peón de ese color situado en sq.
+PAWN_ATTACKS = {
+    "w": _build_jumps(((-1, -1), (-1, 1))), # Las blancas avanzan hacia filas menores.
+    "b": _build_jumps(((1, -1), (1, 1))), # Las negras avanzan hacia filas mayores.
+}
+
+# --- Líneas (rayos) ---
+# RAYS[sq][i]: casillas desde sq en la dirección DIRECTIONS[i], de la más cercana a la más lejana.
+RAYS = tuple(
+    tuple(_build_ray(r, c, dr, dc) for dr, dc in DIRECTIONS)
+    for r in range(8) for c in range(8)
+)
+
+# --- Versiones en bitboard ---
+KNIGHT_ATTACKS_BB = tuple(_to_bitboard(targets) for targets in KNIGHT_TARGETS)
+KING_ATTACKS_BB = tuple(_to_bitboard(targets) for targets in KING_TARGETS)
+PAWN_ATTACKS_BB = {color: tuple(_to_bitboard(targets) for targets in table) for color, table in PAWN_ATTACKS.items()}
+RAYS_BB = tuple(tuple(_to_bitboard(ray) for ray in rays) for rays in RAYS)
@@ -0,0 +1,71 @@
+# chessLogic/bitboard.py
+# Utilidades básicas para trabajar con bitboards (enteros de 64 bits, un bit por casilla).
+# Convención de casillas: sq = fila * 8 + columna, con la fila 0 = octava fila (piezas negras),
+# igual que el tablero 8x8 de ChessBoard. Así, (0, 0) es a8 -> bit 0 y (7, 7) es h1 -> bit 63.
+
+# Las doce piezas que tienen un bitboard propio en ChessBoard.
+PIECES = ("wp", "wn", "wb", "wr", "wq", "wk", "bp", "bn", "bb", "br", "bq", "bk")
+
+FULL_BOARD = (1 << 64) - 1 # Máscara con las 64 casillas activas.
+
+# Máscaras de columnas (files) y filas (ranks) del tablero.
+FILE_MASKS = [sum(1 << (r * 8 + c) for r in range(8)) for c in range(8)]
+RANK_MASKS = [sum(1 << (r * 8 + c) for c in range(8)) for r in range(8)]
+
+
+def square_index(row, col):
+    """
+    Convierte una casilla (fila, columna) en su índice 0..63.
+    """
+    return row * 8 + col
+
+
+def square_coords(sq):
+    """
+    Convierte un índice 0..63 en la tupla (fila, columna).
+    """
+    return divmod(sq, 8)
+
+
+def iter_squares(bb):
+    """
+    Itera los índices de las casillas activas de un bitboard (del bit menos significativo al más significativo).
+
+    Args:
+        bb (int): El bitboard a recorrer.
+
+    Yields:
+        int: El índice de cada casilla ocupada.
+    """
+    while bb:
+        lsb = bb & -bb # Aísla el bit menos significativo.
+        yield lsb.bit_length() - 1 # Índice del bit aislado.
+        bb ^= lsb # Lo elimina y continúa con el siguiente.
+
+
+def popcount(bb):
+    """
+    Devuelve el número de casillas activas en un bitboard.
+    """
+    return bb.bit_count()
+
+
+# Derechos de enroque como máscara de 4 bits (ChessBoard.castling).
+CASTLE_WK = 1 # Enroque corto blanco.
+CASTLE_WQ = 2 # Enroque largo blanco.
+CASTLE_BK = 4 # Enroque corto negro.
+CASTLE_BQ = 8 # Enroque largo negro.
+ALL_CASTLING = CASTLE_WK | CASTLE_WQ | CASTLE_BK | CASTLE_BQ
+CASTLING_BITS = {"wK": CASTLE_WK, "wQ": CASTLE_WQ, "bK": CASTLE_BK, "bQ": CASTLE_BQ} # Nombre -> bit.
+
+# CASTLING_MASK[sq]: derechos que se conservan cuando una pieza sale de sq o llega a sq.
+# Tras cada movimiento: castling &= CASTLING_MASK[origen] & CASTLING_MASK[destino].
+# Cubre a la vez el movimiento del rey, el de una torre y la captura de una torre en su casilla inicial.
+CASTLING_MASK = [ALL_CASTLING] * 64
+CASTLING_MASK[0] &= ~CASTLE_BQ # a8: torre negra de la reina.
+CASTLING_MASK[4] &= ~(CASTLE_BK | CASTLE_BQ) # e8: rey negro.
+CASTLING_MASK[7] &= ~CASTLE_BK # h8: torre negra del rey.
+CASTLING_MASK[56] &= ~CASTLE_WQ # a1: torre blanca de la reina.
+CASTLING_MASK[60] &= ~(CASTLE_WK | CASTLE_WQ) # e1: rey blanco.
+CASTLING_MASK[63] &= ~CASTLE_WK # h1: torre blanca del rey.
+CASTLING_MASK = tuple(CASTLING_MASK)
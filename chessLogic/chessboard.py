@@ -1,15 +1,24 @@
 from . import moves # Importa el módulo 'moves' que contiene las reglas geométricas de movimiento.
 from . import rules # Importa el módulo 'rules' que contiene reglas de ajedrez como jaque, enroque, etc.
 from .move import Move # Importa la clase 'Move' para representar un movimiento.
+from .move import DOUBLE_PAWN_PUSH, KING_CASTLE, QUEEN_CASTLE, EN_PASSANT, PROMOTION, PROMOTION_PIECES, NULL_MOVE # Banderas de la codificación entera.
 from chessLogic.utils import get_all_moves # Importa la función para obtener todos los movimientos posibles.
 from chessLogic.rules import ChessRules # Importa la clase ChessRules para acceder a sus métodos estáticos.
+from chessLogic.bitboard import PIECES, ALL_CASTLING, CASTLING_BITS, CASTLING_MASK # Piezas y máscaras de enroque.
+from chessLogic.attack_tables import SQUARE_COORDS # Tupla (fila, columna) de cada casilla, sin crearla en cada jugada.
+from chessLogic.zobrist import PIECE_KEYS, CASTLING_MASK_KEYS, EN_PASSANT_KEYS, SIDE_KEY, compute_zobrist_key # Claves de Zobrist.
+
+from chessLogic.fen import load_fen, board_to_fen # Lectura y escritura de posiciones FEN.
+
+UNDO_FIELDS = 5 # Huecos por jugada en la pila de deshacer.
+UNDO_STACK_PLIES = 512 # Jugadas reservadas de antemano (la pila crece si una partida es más larga).
 
 class ChessBoard:
     def __init__(self):
         # Inicializa el tablero de ajedrez con la configuración inicial de las piezas.
         # Cada elemento es una cadena de 2 caracteres: color (w/b) + tipo de pieza (r/n/b/q/k/p).
         # "--" representa una casilla vacía.
-        self.board = [
+        self._board = [
             ["br", "bn", "bb", "bq", "bk", "bb", "bn", "br"], # Fila 0: Piezas negras
             ["bp"] * 8,                                     # Fila 1: Peones negros
             ["--"] * 8,                                     # Fila 2: Vacía
@@ -21,22 +30,144 @@ class ChessBoard:
         ]
         self.turn = "w" # El turno inicial es para las blancas ('w').
         self.en_passant_square = None   # 🔹 Casilla donde es posible un en passant. Se actualiza después de un movimiento de peón doble.
-        # Derechos de enroque para cada rey y torre. True si es posible, False si ya se movió la pieza.
-        self.castling_rights = {"wK": True, "wQ": True, "bK": True, "bQ": True}
+        # Derechos de enroque como máscara de 4 bits (CASTLE_WK | CASTLE_WQ | CASTLE_BK | CASTLE_BQ).
+        # Un bit activo indica que el rey y la torre de ese lado aún no se han movido ni ha sido capturada la torre.
+        self.castling = ALL_CASTLING
+        self.halfmove_clock = 0 # Medias jugadas desde la última captura o movimiento de peón (regla de 50 movimientos).
+        self.fullmove_number = 1 # Número de jugada completa; aumenta tras cada movimiento de las negras.
         self.white_king_pos = (7, 4) # Posición inicial del rey blanco.
         self.black_king_pos = (0, 4) # Posición inicial del rey negro.
 
-        # 🔹 nuevo: log de movimientos para poder deshacerlos.
+        # 🔹 nuevo: log de movimientos (codificados como enteros) para poder deshacerlos.
         self.move_log = []
 
-        # 🔹 opcional: log de derechos de enroque para poder restaurarlos en undo.
-        self.castling_rights_log = [self.castling_rights.copy()]
+        # 🔹 Pila de deshacer con el estado irreversible de cada jugada, reservada de antemano y plana:
+        # UNDO_FIELDS huecos por jugada (pieza capturada, enroque, en passant, reloj de 50 movimientos
+        # y clave de Zobrist). make_move no crea diccionarios ni modifica el movimiento recibido.
+        self._undo_stack = [None] * (UNDO_STACK_PLIES * UNDO_FIELDS)
+
+        # 🔹 Representación por bitboards: un entero de 64 bits por pieza (bit sq = fila * 8 + columna)
+        # más las máscaras de ocupación por color y total. make_move/undo_move las mantienen sincronizadas.
+        self.bitboards = {piece: 0 for piece in PIECES}
+        self.occupancy = {"w": 0, "b": 0}
+        self.all_occupancy = 0
+        self._rebuild_bitboards()
+
+        # 🔹 Clave de Zobrist de la posición, actualizada de forma incremental en set_piece, make_move y undo_move.
+        self.zobrist_key = compute_zobrist_key(self)
+
+    @classmethod
+    def from_fen(cls, fen):
+        """
+        Crea un tablero con la posición dada en notación FEN (o EPD).
+
+        Args:
+            fen (str): La cadena FEN.
+
+        Returns:
+            ChessBoard: El nuevo tablero.
+        """
+        chessboard = cls()
+        chessboard.set_fen(fen)
+        return chessboard
+
+    def set_fen(self, fen):
+        """
+        Carga una posición FEN/EPD en este tablero, reutilizándolo (ver chessLogic/fen.load_fen).
+
+        Returns:
+            dict: Las operaciones EPD de la línea (vacío para FEN).
+        """
+        return load_fen(self, fen)
+
+    def to_fen(self):
+        """
+        Devuelve la posición actual en notación FEN.
+        """
+        return board_to_fen(self)
+
+    @property
+    def board(self):
+        """
+        Vista de solo lectura del tablero 8x8 (lista de filas con cadenas como "wp" o "--").
+        No debe modificarse directamente: cualquier cambio debe pasar por set_piece o make_move
+        para que los bitboards se mantengan sincronizados.
+        """
+        return self._board
+
+    @property
+    def castling_rights(self):
+        """
+        Derechos de enroque como diccionario {"wK": bool, "wQ": bool, "bK": bool, "bQ": bool}.
+        Es una vista calculada a partir de la máscara self.castling, para consultas fuera del motor.
+        """
+        return {right: bool(self.castling & bit) for right, bit in CASTLING_BITS.items()}
 
     def get_piece(self, row, col):
         """
         Devuelve la pieza en la casilla especificada (row, col).
         """
-        return self.board[row][col]
+        return self._board[row][col]
+
+    def set_piece(self, row, col, piece):
+        """
+        Coloca una pieza (o "--" para vaciar) en la casilla (row, col),
+        actualizando el tablero 8x8 y los bitboards.
+
+        Args:
+            row (int): Fila de la casilla.
+            col (int): Columna de la casilla.
+            piece (str): Pieza a colocar ("wp", "bk", ...) o "--" para dejarla vacía.
+        """
+        old = self._board[row][col] # Pieza que ocupaba la casilla.
+        if old == piece:
+            return
+        sq = row * 8 + col # Índice de la casilla.
+        bit = 1 << sq # Bit correspondiente a la casilla.
+        if old != "--": # Quita la pieza anterior de su bitboard, de la ocupación y de la clave.
+            self.bitboards[old] ^= bit
+            self.occupancy[old[0]] ^= bit
+            self.all_occupancy ^= bit
+            self.zobrist_key ^= PIECE_KEYS[old][sq]
+        if piece != "--": # Añade la nueva pieza.
+            self.bitboards[piece] |= bit
+            self.occupancy[piece[0]] |= bit
+            self.all_occupancy |= bit
+            self.zobrist_key ^= PIECE_KEYS[piece][sq]
+        self._board[row][col] = piece
+
+    def _rebuild_bitboards(self):
+        """
+        Recalcula desde cero todos los bitboards a partir del tablero 8x8.
+        """
+        for piece in PIECES:
+            self.bitboards[piece] = 0
+        self.occupancy["w"] = self.occupancy["b"] = 0
+        for r in range(8):
+            for c in range(8):
+                piece = self._board[r][c]
+                if piece != "--":
+                    bit = 1 << (r * 8 + c)
+                    self.bitboards[piece] |= bit
+                    self.occupancy[piece[0]] |= bit
+        self.all_occupancy = self.occupancy["w"] | self.occupancy["b"]
+
+    def _update_state_key(self, old_castling, old_en_passant):
+        """
+        Actualiza la clave de Zobrist con los cambios de estado que no son piezas:
+        derechos de enroque, casilla de en passant y turno.
+        Las piezas ya se actualizan en set_piece.
+
+        Args:
+            old_castling (int): Máscara de derechos de enroque antes del cambio.
+            old_en_passant (tuple | None): Casilla de en passant antes del cambio.
+        """
+        key = self.zobrist_key ^ CASTLING_MASK_KEYS[old_castling ^ self.castling] # Derechos que cambiaron.
+        if old_en_passant is not None: # Saca la columna de en passant anterior.
+            key ^= EN_PASSANT_KEYS[old_en_passant[1]]
+        if self.en_passant_square is not None: # Mete la nueva.
+            key ^= EN_PASSANT_KEYS[self.en_passant_square[1]]
+        self.zobrist_key = key ^ SIDE_KEY # Cambia el turno.
 
     def is_valid_move(self, start_pos, end_pos, color_override=None):
         """
@@ -69,8 +200,8 @@ class ChessBoard:
 
         # --- Simular el movimiento para verificar si el rey queda en jaque ---
         temp_piece = self.board[end_pos[0]][end_pos[1]] # Guarda la pieza en la casilla de destino (por si es una captura).
-        self.board[end_pos[0]][end_pos[1]] = piece      # Mueve la pieza a la casilla de destino.
-        self.board[start_row][start_col] = "--"         # Vacía la casilla de inicio.
+        self.set_piece(end_pos[0], end_pos[1], piece)      # Mueve la pieza a la casilla de destino.
+        self.set_piece(start_row, start_col, "--")         # Vacía la casilla de inicio.
 
         # Actualizar temporalmente la posición del rey si la pieza movida es un rey.
         old_king_pos = None
@@ -85,8 +216,8 @@ class ChessBoard:
         king_in_check = rules.ChessRules.is_in_check(self, color)
 
         # --- Revertir el movimiento simulado para restaurar el estado del tablero ---
-        self.board[start_row][start_col] = piece        # Devuelve la pieza a su casilla de inicio.
-        self.board[end_pos[0]][end_pos[1]] = temp_piece # Restaura la pieza capturada (o vacía la casilla).
+        self.set_piece(start_row, start_col, piece)        # Devuelve la pieza a su casilla de inicio.
+        self.set_piece(end_pos[0], end_pos[1], temp_piece) # Restaura la pieza capturada (o vacía la casilla).
         if old_king_pos: # Si la posición del rey fue actualizada temporalmente.
             if piece[0] == "w":
                 self.white_king_pos = old_king_pos # Restaura la posición original del rey blanco.
@@ -120,39 +251,15 @@ class ChessBoard:
         Returns:
             bool: True si tiene movimientos válidos, False en caso contrario.
         """
-        from .utils import get_all_moves # Importa get_all_moves aquí para evitar importaciones circulares.
         # Obtener todos los movimientos pseudo-legales del color (sin verificar jaque).
         moves = get_all_moves(self, color, pseudo_legal=True)
 
         # Probar si al menos uno de estos movimientos no deja al rey en jaque.
+        # Se usa make_move/undo_move para que el en passant retire también el peón capturado.
         for start, end in moves:
-            start_piece = self.board[start[0]][start[1]] # Pieza en la casilla de inicio.
-            captured = self.board[end[0]][end[1]]       # Pieza en la casilla de destino (posible captura).
-
-            # Simular el movimiento.
-            self.board[end[0]][end[1]] = start_piece # Mueve la pieza.
-            self.board[start[0]][start[1]] = "--"    # Vacía la casilla de inicio.
-
-            old_king_pos = None
-            if start_piece[1] == "k": # Si la pieza movida es un rey.
-                old_king_pos = self.white_king_pos if color == "w" else self.black_king_pos # Guarda la posición actual del rey.
-                if color == "w":
-                    self.white_king_pos = end # Actualiza la posición del rey blanco.
-                else:
-                    self.black_king_pos = end # Actualiza la posición del rey negro.
-
-            # Verifica si el rey está en jaque después del movimiento simulado.
-            in_check = rules.ChessRules.is_in_check(self, color)
-
-            # Revertir el movimiento simulado.
-            self.board[start[0]][start[1]] = start_piece # Restaura la pieza a su posición original.
-            self.board[end[0]][end[1]] = captured       # Restaura la pieza capturada (o vacía la casilla).
-            if old_king_pos: # Si la posición del rey fue actualizada temporalmente.
-                if color == "w":
-                    self.white_king_pos = old_king_pos # Restaura la posición original del rey blanco.
-                else:
-                    self.black_king_pos = old_king_pos # Restaura la posición original del rey negro.
-
+            self.make_move(Move(start, end, self)) # Simula el movimiento.
+            in_check = rules.ChessRules.is_in_check(self, color) # ¿Queda el rey en jaque?
+            self.undo_move() # Revierte el movimiento simulado.
             if not in_check: # Si se encuentra un movimiento que no deja al rey en jaque.
                 return True # El jugador tiene movimientos válidos.
 
@@ -173,83 +280,83 @@ class ChessBoard:
             return True
         return False
     
-    def make_move(self, move: Move):
+    def make_move(self, move):
         """
         Aplica un movimiento en el tablero con soporte de reglas especiales.
         
         Args:
-            move (Move): Objeto Move que describe el movimiento a realizar.
+            move (int | Move): Movimiento codificado (ver chessLogic/move.py) u objeto Move de la interfaz.
         """
-        # Guardar estado antes del movimiento para poder deshacerlo.
-        move.prev_castling_rights = self.castling_rights.copy() # Guarda una copia de los derechos de enroque.
-        move.prev_en_passant = self.en_passant_square # Guarda la casilla de en passant.
-        move.prev_white_king_pos = self.white_king_pos # Guarda la posición del rey blanco.
-        move.prev_black_king_pos = self.black_king_pos # Guarda la posición del rey negro.
+        if not isinstance(move, int): # Los objetos Move de la interfaz se convierten a su codificación.
+            move = move.to_int()
+        board = self._board
+        flags = move >> 12 # Banderas del movimiento.
+        from_sq = move & 63 # Casilla de inicio.
+        to_sq = (move >> 6) & 63 # Casilla de destino.
+        sr, sc = from_sq >> 3, from_sq & 7 # Fila y columna de inicio.
+        er, ec = to_sq >> 3, to_sq & 7 # Fila y columna de destino.
+        piece = board[sr][sc] # Pieza que se mueve.
+        captured = board[sr][ec] if flags == EN_PASSANT else board[er][ec] # Pieza capturada (o "--").
+
+        # Guardar el estado irreversible en la pila de deshacer (sin copias ni objetos nuevos).
+        stack = self._undo_stack
+        base = len(self.move_log) * UNDO_FIELDS
+        if base == len(stack): # Partida más larga de lo previsto: se duplica la reserva.
+            stack.extend([None] * len(stack))
+        stack[base] = captured
+        stack[base + 1] = old_castling = self.castling
+        stack[base + 2] = old_en_passant = self.en_passant_square
+        stack[base + 3] = self.halfmove_clock
+        stack[base + 4] = self.zobrist_key
+        self.move_log.append(move)
 
         # Movimiento normal: mueve la pieza de la casilla de inicio a la de destino.
-        self.board[move.start_row][move.start_col] = "--" # Vacía la casilla de inicio.
-        self.board[move.end_row][move.end_col] = move.piece_moved # Coloca la pieza movida en la casilla de destino.
+        self.set_piece(sr, sc, "--") # Vacía la casilla de inicio.
+        if flags & PROMOTION: # 🔹 Promoción de peón: la pieza elegida ocupa la casilla de destino.
+            self.set_piece(er, ec, piece[0] + PROMOTION_PIECES[flags & 3])
+        else:
+            self.set_piece(er, ec, piece) # Coloca la pieza movida en la casilla de destino.
 
         # 🔹 Actualizar posición del rey si se mueve.
-        if move.piece_moved[1] == "k": # Si la pieza movida es un rey.
-            if move.piece_moved[0] == "w":
-                self.white_king_pos = (move.end_row, move.end_col) # Actualiza la posición del rey blanco.
+        if piece[1] == "k": # Si la pieza movida es un rey.
+            if piece[0] == "w":
+                self.white_king_pos = SQUARE_COORDS[to_sq] # Actualiza la posición del rey blanco.
             else:
-                self.black_king_pos = (move.end_row, move.end_col) # Actualiza la posición del rey negro.
-
-        # 🔹 Promoción de peón.
-        if move.is_pawn_promotion:
-            # Reemplaza el peón en la última fila con la pieza elegida para la promoción.
-            self.board[move.end_row][move.end_col] = move.piece_moved[0] + move.promotion_choice
-
-        # 🔹 Enroque.
-        if move.is_castling:
-            if move.end_col == 6:  # Enroque corto (lado del rey).
-                self.board[move.end_row][5] = self.board[move.end_row][7] # Mueve la torre.
-                self.board[move.end_row][7] = "--" # Vacía la casilla original de la torre.
-            else:  # Enroque largo (lado de la reina).
-                self.board[move.end_row][3] = self.board[move.end_row][0] # Mueve la torre.
-                self.board[move.end_row][0] = "--" # Vacía la casilla original de la torre.
+                self.black_king_pos = SQUARE_COORDS[to_sq] # Actualiza la posición del rey negro.
+
+        # 🔹 Enroque y en passant.
+        if flags == KING_CASTLE: # Enroque corto (lado del rey).
+            self.set_piece(er, 5, board[er][7]) # Mueve la torre.
+            self.set_piece(er, 7, "--") # Vacía la casilla original de la torre.
+        elif flags == QUEEN_CASTLE: # Enroque largo (lado de la reina).
+            self.set_piece(er, 3, board[er][0]) # Mueve la torre.
+            self.set_piece(er, 0, "--") # Vacía la casilla original de la torre.
+        elif flags == EN_PASSANT: # Elimina el peón capturado, que está junto a la casilla de inicio.
+            self.set_piece(sr, ec, "--")
 
         # 🔹 En passant: Actualiza la casilla en_passant_square.
         self.en_passant_square = None # Por defecto, no hay casilla de en passant después de un movimiento.
-        # Si un peón se mueve dos casillas.
-        if move.piece_moved[1] == "p" and abs(move.end_row - move.start_row) == 2:
-            row = (move.start_row + move.end_row) // 2 # La casilla de en passant es la que el peón "saltó".
-            col = move.start_col
+        if flags == DOUBLE_PAWN_PUSH: # Si un peón se mueve dos casillas.
+            enemy_pawn = "bp" if piece[0] == "w" else "wp"
             # Verifica si hay peones enemigos adyacentes que puedan realizar en passant.
-            if (col > 0 and self.board[move.end_row][col-1][0:1] == ('b' if move.piece_moved[0] == 'w' else 'w')) or \
-            (col < 7 and self.board[move.end_row][col+1][0:1] == ('b' if move.piece_moved[0] == 'w' else 'w')):
-                self.en_passant_square = (row, col) # Establece la casilla de en passant.
-
-        if move.is_en_passant:
-            # Si el movimiento es un en passant, elimina el peón capturado.
-            direction = 1 if move.piece_moved[0] == "b" else -1 # Dirección del movimiento del peón.
-            move.piece_captured = self.board[move.end_row - direction][move.end_col] # Guarda el peón capturado.
-            self.board[move.end_row - direction][move.end_col] = "--" # Elimina el peón capturado.
-
-        # 🔹 Actualizar derechos de enroque.
-        # Si el rey se mueve, pierde ambos derechos de enroque.
-        if move.piece_moved == "wk":
-            self.castling_rights["wK"] = False
-            self.castling_rights["wQ"] = False
-        elif move.piece_moved == "bk":
-            self.castling_rights["bK"] = False
-            self.castling_rights["bQ"] = False
-        # Si una torre se mueve de su posición inicial, pierde el derecho de enroque de ese lado.
-        elif move.piece_moved == "wr":
-            if move.start_row == 7 and move.start_col == 0: # Torre blanca de la reina.
-                self.castling_rights["wQ"] = False
-            elif move.start_row == 7 and move.start_col == 7: # Torre blanca del rey.
-                self.castling_rights["wK"] = False
-        elif move.piece_moved == "br":
-            if move.start_row == 0 and move.start_col == 0: # Torre negra de la reina.
-                self.castling_rights["bQ"] = False
-            elif move.start_row == 0 and move.start_col == 7: # Torre negra del rey.
-                self.castling_rights["bK"] = False
-
-        # Guardar el movimiento en el log y cambiar el turno.
-        self.move_log.append(move) # Añade el objeto Move al historial.
+            if (ec > 0 and board[er][ec - 1] == enemy_pawn) or (ec < 7 and board[er][ec + 1] == enemy_pawn):
+                self.en_passant_square = SQUARE_COORDS[(from_sq + to_sq) >> 1] # La casilla que el peón "saltó".
+
+        # 🔹 Actualizar derechos de enroque: mover el rey o una torre, o capturar una torre en su
+        # casilla inicial, retira los derechos correspondientes.
+        self.castling = old_castling & CASTLING_MASK[from_sq] & CASTLING_MASK[to_sq]
+
+        # 🔹 Reloj de 50 movimientos: se reinicia con cada movimiento de peón o captura.
+        if piece[1] == "p" or captured != "--":
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+
+        # 🔹 Actualizar la clave de Zobrist (enroque, en passant y turno).
+        self._update_state_key(old_castling, old_en_passant)
+
+        if self.turn == "b": # Tras mover las negras empieza una nueva jugada completa.
+            self.fullmove_number += 1
         self.turn = "b" if self.turn == "w" else "w" # Cambia el turno al otro color.
 
 
@@ -259,48 +366,96 @@ class ChessBoard:
         """
         if not self.move_log: # Si no hay movimientos en el log, no hay nada que deshacer.
             return
+        if self.move_log[-1] == NULL_MOVE: # Un movimiento nulo de la búsqueda.
+            self.undo_null_move()
+            return
 
         move = self.move_log.pop() # Obtiene el último movimiento del log.
-
-        # Restaurar el tablero a su estado anterior al movimiento.
-        self.board[move.start_row][move.start_col] = move.piece_moved # Devuelve la pieza movida a su origen.
-        self.board[move.end_row][move.end_col] = move.piece_captured # Restaura la pieza capturada (o vacía la casilla).
-
-        # 🔹 Revertir promoción de peón.
-        if move.is_pawn_promotion:
-            # Si hubo promoción, la pieza en la casilla de inicio debe volver a ser un peón.
-            self.board[move.start_row][move.start_col] = move.piece_moved
-            # La casilla de destino debe restaurar la pieza que estaba allí (o estar vacía).
-            self.board[move.end_row][move.end_col] = move.piece_captured
+        stack = self._undo_stack
+        base = len(self.move_log) * UNDO_FIELDS # Estado guardado antes de ese movimiento.
+        board = self._board
+        flags = move >> 12
+        from_sq = move & 63
+        to_sq = (move >> 6) & 63
+        sr, sc = from_sq >> 3, from_sq & 7
+        er, ec = to_sq >> 3, to_sq & 7
+        piece = board[er][ec] # Pieza que se movió (la pieza promocionada vuelve a ser un peón).
+        if flags & PROMOTION:
+            piece = piece[0] + "p"
+        captured = stack[base]
+
+        # Restaurar el tablero: la pieza vuelve a su origen y la capturada a su casilla.
+        self.set_piece(sr, sc, piece)
+        if flags == EN_PASSANT: # 🔹 El peón capturado al paso vuelve junto a la casilla de inicio.
+            self.set_piece(er, ec, "--")
+            self.set_piece(sr, ec, captured)
+        else:
+            self.set_piece(er, ec, captured) # Restaura la pieza capturada (o vacía la casilla).
 
         # 🔹 Revertir enroque.
-        if move.is_castling:
-            if move.end_col == 6:  # Enroque corto.
-                self.board[move.end_row][7] = self.board[move.end_row][5] # Devuelve la torre a su posición original.
-                self.board[move.end_row][5] = "--" # Vacía la casilla donde estaba la torre después del enroque.
-            else:  # Enroque largo.
-                self.board[move.end_row][0] = self.board[move.end_row][3] # Devuelve la torre a su posición original.
-                self.board[move.end_row][3] = "--" # Vacía la casilla donde estaba la torre después del enroque.
-
-        # 🔹 Revertir en passant.
-        if move.is_en_passant:
-            # Si fue un en passant, el peón capturado debe ser restaurado.
-            direction = 1 if move.piece_moved[0] == "b" else -1 # Dirección del movimiento del peón.
-            self.board[move.end_row - direction][move.end_col] = move.piece_captured # Restaura el peón capturado.
-            self.board[move.end_row][move.end_col] = "--" # Vacía la casilla de destino del peón que realizó el en passant.
-
-        # Restaurar posiciones de los reyes.
-        self.white_king_pos = move.prev_white_king_pos # Restaura la posición del rey blanco.
-        self.black_king_pos = move.prev_black_king_pos # Restaura la posición del rey negro.
-
-        # Restaurar estados previos de derechos de enroque y en passant.
-        self.castling_rights = move.prev_castling_rights # Restaura los derechos de enroque.
-        self.en_passant_square = move.prev_en_passant # Restaura la casilla de en passant.
+        if flags == KING_CASTLE: # Enroque corto.
+            self.set_piece(er, 7, board[er][5]) # Devuelve la torre a su posición original.
+            self.set_piece(er, 5, "--") # Vacía la casilla donde estaba la torre después del enroque.
+        elif flags == QUEEN_CASTLE: # Enroque largo.
+            self.set_piece(er, 0, board[er][3]) # Devuelve la torre a su posición original.
+            self.set_piece(er, 3, "--") # Vacía la casilla donde estaba la torre después del enroque.
+
+        # Restaurar la posición del rey si fue él quien se movió.
+        if piece == "wk":
+            self.white_king_pos = SQUARE_COORDS[from_sq]
+        elif piece == "bk":
+            self.black_king_pos = SQUARE_COORDS[from_sq]
+
+        # Restaurar el estado irreversible guardado (la clave de Zobrist se recupera sin recalcular).
+        self.castling = stack[base + 1]
+        self.en_passant_square = stack[base + 2]
+        self.halfmove_clock = stack[base + 3]
+        self.zobrist_key = stack[base + 4]
 
         # Revertir el turno.
         self.turn = "b" if self.turn == "w" else "w" # Cambia el turno de nuevo al color anterior.
+        if self.turn == "b":
+            self.fullmove_number -= 1
 
 
+    def make_null_move(self):
+        """
+        Pasa el turno sin mover ninguna pieza (movimiento nulo, para la poda de la búsqueda).
+        Borra la casilla de en passant, avanza el reloj de 50 movimientos y actualiza la clave de Zobrist.
+        Se registra en move_log como NULL_MOVE, así que undo_move también lo deshace.
+        """
+        stack = self._undo_stack
+        base = len(self.move_log) * UNDO_FIELDS
+        if base == len(stack): # Partida más larga de lo previsto: se duplica la reserva.
+            stack.extend([None] * len(stack))
+        stack[base] = "--"
+        stack[base + 1] = self.castling
+        stack[base + 2] = old_en_passant = self.en_passant_square
+        stack[base + 3] = self.halfmove_clock
+        stack[base + 4] = self.zobrist_key
+        self.move_log.append(NULL_MOVE)
+
+        self.en_passant_square = None # Pasar el turno anula la captura al paso.
+        self.halfmove_clock += 1
+        self._update_state_key(self.castling, old_en_passant) # En passant y turno.
+        if self.turn == "b":
+            self.fullmove_number += 1
+        self.turn = "b" if self.turn == "w" else "w"
+
+    def undo_null_move(self):
+        """
+        Deshace el último movimiento nulo (ver make_null_move).
+        """
+        self.move_log.pop()
+        base = len(self.move_log) * UNDO_FIELDS
+        stack = self._undo_stack
+        self.en_passant_square = stack[base + 2]
+        self.halfmove_clock = stack[base + 3]
+        self.zobrist_key = stack[base + 4]
+        self.turn = "b" if self.turn == "w" else "w"
+        if self.turn == "b":
+            self.fullmove_number -= 1
+
     def is_game_over(self):
         """
         Verifica si el juego ha terminado por jaque mate o ahogado.
@@ -362,11 +517,9 @@ class ChessBoard:
         if self.is_check(current_turn):
             return False
         
-        # Generar todos los movimientos legales para el jugador actual.
-        legal_moves = self.get_legal_moves(current_turn)
-        
         # Si no hay movimientos legales y no está en jaque, es ahogado.
-        return len(legal_moves) == 0
+        # has_valid_moves se detiene en el primer movimiento legal, sin generar la lista completa.
+        return not self.has_valid_moves(current_turn)
 
 
 
@@ -0,0 +1,238 @@
+# chessLogic/fen.py
+# Lectura y escritura de posiciones en notación FEN/EPD y carga masiva desde archivos.
+# FEN: "<piezas> <turno> <enroques> <en passant> <medias jugadas> <número de jugada>".
+# EPD: los cuatro primeros campos de FEN seguidos de operaciones "opcode operando;" (p. ej. 'bm Nf3; id "x";').
+# La fila 8 de la notación es la fila 0 del tablero 8x8 (igual que en ChessBoard).
+from chessLogic.attack_tables import PAWN_ATTACKS_BB, SQUARE_COORDS # Ataques de peón y coordenadas por casilla.
+from chessLogic.bitboard import CASTLING_BITS # Bits de cada derecho de enroque.
+from chessLogic.zobrist import PIECE_KEYS, CASTLING_MASK_KEYS, EN_PASSANT_KEYS, SIDE_KEY # Clave de la posición cargada.
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1" # Posición inicial.
+
+FILES = "abcdefgh" # Columnas en notación algebraica.
+# Letra FEN -> pieza del tablero ("P" -> "wp", "n" -> "bn", ...), y su inversa.
+FEN_TO_PIECE = {letter: ("w" if letter.isupper() else "b") + letter.lower() for letter in "PNBRQKpnbrqk"}
+PIECE_TO_FEN = {piece: letter for letter, piece in FEN_TO_PIECE.items()}
+# Letra de enroque FEN -> bit de ChessBoard.castling ("K" -> CASTLE_WK, ...).
+FEN_CASTLING = {"K": CASTLING_BITS["wK"], "Q": CASTLING_BITS["wQ"], "k": CASTLING_BITS["bK"], "q": CASTLING_BITS["bQ"]}
+EMPTY_ROW = ("--",) * 8
+
+
+def square_name(row, col):
+    """
+    Devuelve el nombre algebraico de una casilla (0, 0) -> 'a8', (7, 7) -> 'h1'.
+    """
+    return f"{FILES[col]}{8 - row}"
+
+
+def parse_square(name):
+    """
+    Convierte un nombre algebraico ('e3') en la tupla (fila, columna).
+    """
+    if len(name) != 2 or name[0] not in FILES or name[1] not in "12345678":
+        raise ValueError(f"Casilla no válida: {name!r}")
+    return 8 - int(name[1]), FILES.index(name[0])
+
+
+def parse_epd_operations(text):
+    """
+    Interpreta las operaciones de una línea EPD ('bm Nf3; id "WAC.001";') como diccionario.
+    Los operandos entre comillas se devuelven sin ellas; un opcode sin operando se guarda con "".
+    """
+    operations = {}
+    for part in text.split(";"):
+        part = part.strip()
+        if not part:
+            continue
+        opcode, _, operand = part.partition(" ")
+        operand = operand.strip()
+        if len(operand) >= 2 and operand[0] == operand[-1] == '"':
+            operand = operand[1:-1]
+        operations[opcode] = operand
+    return operations
+
+
+def load_fen(chessboard, fen):
+    """
+    Carga una posición FEN o EPD en un tablero existente, sin crear uno nuevo.
+    Fija piezas, bitboards, turno, derechos de enroque, en passant, posiciones de los reyes,
+    relojes y clave de Zobrist, y vacía el historial de jugadas.
+
+    Todos los campos se interpretan y validan antes de tocar el tablero: si la cadena no es válida,
+    el tablero queda como estaba.
+
+    La casilla de en passant solo se conserva si algún peón del bando que mueve puede capturar en ella,
+    igual que hace make_move; así la clave de Zobrist no depende de cómo se escribió el FEN.
+
+    Args:
+        chessboard (ChessBoard): El tablero donde cargar la posición.
+        fen (str): La cadena FEN (6 campos, los relojes son opcionales) o EPD (4 campos + operaciones).
+
+    Returns:
+        dict: Las operaciones EPD de la línea (vacío para FEN).
+
+    Raises:
+        ValueError: Si la cadena no es una posición válida.
+    """
+    fields = fen.split(None, 4)
+    if len(fields) < 4:
+        raise ValueError(f"FEN incompleto: {fen!r}")
+    placement, turn, castling, en_passant = fields[:4]
+    rest = fields[4] if len(fields) > 4 else ""
+
+    # --- Piezas (en filas y bitboards locales) ---
+    ranks = placement.split("/")
+    if len(ranks) != 8:
+        raise ValueError(f"FEN con {len(ranks)} filas: {fen!r}")
+    rows = []
+    bitboards = dict.fromkeys(chessboard.bitboards, 0)
+    key = 0 # La clave de Zobrist y los bitboards se construyen en la misma pasada.
+    for r, rank in enumerate(ranks):
+        row = list(EMPTY_ROW)
+        c = 0
+        for letter in rank:
+            if letter.isdigit():
+                c += int(letter)
+            else:
+                piece = FEN_TO_PIECE.get(letter)
+                if piece is None or c > 7:
+                    raise ValueError(f"Fila FEN no válida: {rank!r}")
+                row[c] = piece
+                sq = r * 8 + c
+                bitboards[piece] |= 1 << sq
+                key ^= PIECE_KEYS[piece][sq]
+                c += 1
+        if c != 8:
+            raise ValueError(f"Fila FEN no válida: {rank!r}")
+        rows.append(row)
+    if bitboards["wk"].bit_count() != 1 or bitboards["bk"].bit_count() != 1:
+        raise ValueError(f"FEN sin exactamente un rey por bando: {fen!r}")
+
+    # --- Turno y derechos de enroque ---
+    if turn not in ("w", "b"):
+        raise ValueError(f"Turno FEN no válido: {turn!r}")
+    mask = 0
+    if castling != "-":
+        for letter in castling:
+            if letter not in FEN_CASTLING:
+                raise ValueError(f"Enroque FEN no válido: {castling!r}")
+            mask |= FEN_CASTLING[letter]
+
+    # --- En passant (solo si un peón del bando que mueve puede capturar) ---
+    en_passant_square = None
+    if en_passant != "-":
+        er, ec = parse_square(en_passant)
+        ep_sq = er * 8 + ec
+        enemy = "b" if turn == "w" else "w"
+        if PAWN_ATTACKS_BB[enemy][ep_sq] & bitboards[turn + "p"]: # Peones propios que atacan la casilla.
+            en_passant_square = SQUARE_COORDS[ep_sq]
+
+    # --- Relojes (FEN) u operaciones (EPD) ---
+    operations = {}
+    parts = rest.split()
+    if len(parts) == 2 and parts[0].isdigit() and parts[1].isdigit(): # FEN completo.
+        halfmove_clock, fullmove_number = int(parts[0]), int(parts[1])
+    else:
+        operations = parse_epd_operations(rest) if rest else {}
+        try:
+            halfmove_clock = int(operations.get("hmvc", 0))
+            fullmove_number = int(operations.get("fmvn", 1))
+        except ValueError:
+            raise ValueError(f"Relojes EPD no válidos: {fen!r}") from None
+
+    key ^= CASTLING_MASK_KEYS[mask]
+    if en_passant_square is not None:
+        key ^= EN_PASSANT_KEYS[en_passant_square[1]]
+    if turn == "b":
+        key ^= SIDE_KEY
+
+    # --- Escritura en el tablero (la posición ya es válida) ---
+    for row, new_row in zip(chessboard._board, rows): # Se reutilizan las listas de filas existentes.
+        row[:] = new_row
+    chessboard.bitboards.update(bitboards)
+    white = bitboards["wp"] | bitboards["wn"] | bitboards["wb"] | bitboards["wr"] | bitboards["wq"] | bitboards["wk"]
+    black = bitboards["bp"] | bitboards["bn"] | bitboards["bb"] | bitboards["br"] | bitboards["bq"] | bitboards["bk"]
+    chessboard.occupancy["w"] = white
+    chessboard.occupancy["b"] = black
+    chessboard.all_occupancy = white | black
+    chessboard.white_king_pos = SQUARE_COORDS[bitboards["wk"].bit_length() - 1]
+    chessboard.black_king_pos = SQUARE_COORDS[bitboards["bk"].bit_length() - 1]
+    chessboard.turn = turn
+    chessboard.castling = mask
+    chessboard.en_passant_square = en_passant_square
+    chessboard.halfmove_clock = halfmove_clock
+    chessboard.fullmove_number = fullmove_number
+    chessboard.move_log.clear() # La pila de deshacer se conserva reservada.
+    chessboard.zobrist_key = key
+    return operations
+
+
+def board_to_fen(chessboard):
+    """
+    Devuelve la posición del tablero en notación FEN (6 campos).
+
+    Args:
+        chessboard (ChessBoard): La instancia del tablero de ajedrez.
+
+    Returns:
+        str: La cadena FEN.
+    """
+    ranks = []
+    for row in chessboard.board:
+        rank = ""
+        empty = 0
+        for piece in row:
+            if piece == "--":
+                empty += 1
+            else:
+                if empty:
+                    rank += str(empty)
+                    empty = 0
+                rank += PIECE_TO_FEN[piece]
+        if empty:
+            rank += str(empty)
+        ranks.append(rank)
+    castling = "".join(letter for letter, bit in FEN_CASTLING.items() if chessboard.castling & bit) or "-"
+    en_passant = chessboard.en_passant_square
+    en_passant = square_name(*en_passant) if en_passant is not None else "-"
+    return (f"{'/'.join(ranks)} {chessboard.turn} {castling} {en_passant} "
+            f"{chessboard.halfmove_clock} {chessboard.fullmove_number}")
+
+
+def iter_fen_lines(lines, chessboard=None):
+    """
+    Carga posiciones FEN/EPD una a una desde cualquier iterable de líneas, reutilizando el mismo tablero.
+    Ignora líneas vacías y comentarios ('#'). No guarda las posiciones: cada iteración sobrescribe la anterior,
+    así que el tablero devuelto solo es válido hasta pedir la siguiente.
+
+    Args:
+        lines (iterable): Líneas de texto (un archivo abierto, una lista, ...).
+        chessboard (ChessBoard, optional): Tablero a reutilizar. Si no se indica, se crea uno.
+
+    Yields:
+        tuple: (chessboard, operations) con las operaciones EPD de la línea (vacío para FEN).
+    """
+    if chessboard is None:
+        from chessLogic.chessboard import ChessBoard # Importa aquí para evitar importaciones circulares.
+        chessboard = ChessBoard()
+    for line in lines:
+        line = line.strip()
+        if not line or line[0] == "#":
+            continue
+        yield chessboard, load_fen(chessboard, line)
+
+
+def iter_fen_file(path, chessboard=None):
+    """
+    Recorre un archivo de posiciones FEN/EPD (una por línea) sin cargarlo entero en memoria.
+    Ver iter_fen_lines.
+
+    Args:
+        path (str): Ruta del archivo.
+        chessboard (ChessBoard, optional): Tablero a reutilizar.
+
+    Yields:
+        tuple: (chessboard, operations) para cada posición del archivo.
+    """
+    with open(path, encoding="utf-8") as f:
+        yield from iter_fen_lines(f, chessboard)
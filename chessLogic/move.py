@@ -1,4 +1,109 @@
+# chessLogic/move.py
+# Codificación compacta de movimientos en un entero de 16 bits:
+#   bits 0-5   casilla de origen  (sq = fila * 8 + columna)
+#   bits 6-11  casilla de destino
+#   bits 12-15 banderas: tipo de movimiento y pieza de promoción
+# La búsqueda y el generador de movimientos trabajan solo con estos enteros (no reservan memoria,
+# se comparan y se usan como claves sin coste). La clase Move se usa únicamente en la interfaz gráfica.
+
+# Banderas (valor de los bits 12-15).
+QUIET = 0            # Movimiento sin captura.
+DOUBLE_PAWN_PUSH = 1 # Avance doble de peón.
+KING_CASTLE = 2      # Enroque corto.
+QUEEN_CASTLE = 3     # Enroque largo.
+CAPTURE = 4          # Bit de captura (se combina con PROMOTION).
+EN_PASSANT = 5       # Captura al paso.
+PROMOTION = 8        # Bit de promoción; los dos bits bajos indican la pieza en PROMOTION_PIECES.
+
+PROMOTION_PIECES = "nbrq" # Pieza de promoción según flags & 3.
+PROMOTION_FLAGS = {piece: PROMOTION | i for i, piece in enumerate(PROMOTION_PIECES)} # 'q' -> 11, etc.
+
+NULL_MOVE = 0 # Pasar el turno (a8 -> a8: nunca es un movimiento real). Solo lo usa la búsqueda.
+
+FILES = "abcdefgh" # Nombres de las columnas para la notación UCI.
+
+
+def encode_move(from_sq, to_sq, flags=QUIET):
+    """
+    Codifica un movimiento en un entero de 16 bits.
+
+    Args:
+        from_sq (int): Casilla de origen (0..63).
+        to_sq (int): Casilla de destino (0..63).
+        flags (int, optional): Banderas del movimiento (QUIET, CAPTURE, EN_PASSANT, ...).
+
+    Returns:
+        int: El movimiento codificado.
+    """
+    return from_sq | (to_sq << 6) | (flags << 12)
+
+
+def move_from_sq(move):
+    """
+    Devuelve la casilla de origen de un movimiento codificado.
+    """
+    return move & 63
+
+
+def move_to_sq(move):
+    """
+    Devuelve la casilla de destino de un movimiento codificado.
+    """
+    return (move >> 6) & 63
+
+
+def move_flags(move):
+    """
+    Devuelve las banderas de un movimiento codificado.
+    """
+    return move >> 12
+
+
+def is_capture(move):
+    """
+    Indica si el movimiento codificado captura una pieza (incluye en passant y promociones con captura).
+    """
+    return bool((move >> 12) & CAPTURE)
+
+
+def is_promotion(move):
+    """
+    Indica si el movimiento codificado es una promoción.
+    """
+    return bool((move >> 12) & PROMOTION)
+
+
+def promotion_piece(move):
+    """
+    Devuelve el tipo de pieza de promoción ('n', 'b', 'r' o 'q'), o None si no es una promoción.
+    """
+    flags = move >> 12
+    return PROMOTION_PIECES[flags & 3] if flags & PROMOTION else None
+
+
+def move_to_tuple(move):
+    """
+    Convierte un movimiento codificado en la tupla ((fila, columna), (fila, columna)).
+    """
+    return divmod(move & 63, 8), divmod((move >> 6) & 63, 8)
+
+
+def move_to_uci(move):
+    """
+    Devuelve el movimiento en notación UCI (por ejemplo 'e2e4' o 'e7e8q'), útil para depuración.
+    """
+    sr, sc = divmod(move & 63, 8)
+    er, ec = divmod((move >> 6) & 63, 8)
+    return f"{FILES[sc]}{8 - sr}{FILES[ec]}{8 - er}{promotion_piece(move) or ''}"
+
+
 class Move:
+    # Sin __dict__: los objetos Move ocupan menos memoria y se crean más rápido.
+    __slots__ = (
+        "start_row", "start_col", "end_row", "end_col", "piece_moved", "piece_captured",
+        "is_pawn_promotion", "promotion_choice", "is_castling", "is_en_passant",
+    )
+
     def __init__(self, start_pos, end_pos, chessboard, promotion_choice="q"):
         """
         Inicializa un objeto Move.
@@ -13,13 +118,13 @@ class Move:
         self.start_row, self.start_col = start_pos # Fila y columna de inicio.
         self.end_row, self.end_col = end_pos       # Fila y columna de destino.
 
-        # Referencia al tablero actual para obtener información de las piezas.
-        self.board = chessboard.board
+        # El tablero solo se consulta aquí: el movimiento no guarda una referencia a él.
+        board = chessboard.board
 
         # Pieza que se mueve.
-        self.piece_moved = self.board[self.start_row][self.start_col]
+        self.piece_moved = board[self.start_row][self.start_col]
         # Pieza que se captura en la casilla de destino (puede ser "--" si no hay captura).
-        self.piece_captured = self.board[self.end_row][self.end_col]
+        self.piece_captured = board[self.end_row][self.end_col]
 
         # 🔹 Promoción de peón: True si la pieza movida es un peón y llega a la última fila.
         self.is_pawn_promotion = (
@@ -43,13 +148,38 @@ class Move:
                 self.piece_captured = (
                     "bp" if self.piece_moved[0] == "w" else "wp" # Determina el color del peón capturado.
                 )
-        
-        # Atributos para guardar el estado del tablero antes del movimiento,
-        # necesarios para la función undo_move.
-        self.prev_castling_rights = None
-        self.prev_en_passant = None
-        self.prev_white_king_pos = None
-        self.prev_black_king_pos = None
+
+    @classmethod
+    def from_int(cls, move, chessboard):
+        """
+        Construye un objeto Move a partir de un movimiento codificado, para entregarlo a la interfaz.
+        El tablero debe estar en la posición en la que se juega el movimiento.
+
+        Args:
+            move (int): Movimiento codificado con encode_move.
+            chessboard (ChessBoard): La instancia del tablero de ajedrez actual.
+
+        Returns:
+            Move: El objeto Move equivalente.
+        """
+        start, end = move_to_tuple(move)
+        return cls(start, end, chessboard, promotion_choice=promotion_piece(move) or "q")
+
+    def to_int(self):
+        """
+        Devuelve el movimiento codificado en un entero de 16 bits (ver encode_move).
+        """
+        if self.is_castling:
+            flags = KING_CASTLE if self.end_col > self.start_col else QUEEN_CASTLE
+        elif self.is_en_passant:
+            flags = EN_PASSANT
+        else:
+            flags = CAPTURE if self.piece_captured != "--" else QUIET
+            if self.is_pawn_promotion:
+                flags |= PROMOTION_FLAGS[self.promotion_choice]
+            elif self.piece_moved[1] == "p" and abs(self.end_row - self.start_row) == 2:
+                flags = DOUBLE_PAWN_PUSH
+        return encode_move(self.start_row * 8 + self.start_col, self.end_row * 8 + self.end_col, flags)
 
     def __eq__(self, other):
         """
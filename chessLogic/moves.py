@@ -1,4 +1,7 @@
 # chessLogic/moves.py
+from .attack_tables import KNIGHT_TARGETS, KING_TARGETS, PAWN_ATTACKS, SQUARE_COORDS # Tablas precalculadas.
+from .slider_attacks import ROOK_ATTACKS, ROOK_MASKS, BISHOP_ATTACKS, BISHOP_MASKS # Ataques de piezas deslizantes.
+from .bitboard import iter_squares # Recorre las casillas activas de un bitboard.
 
 def is_legal_move(chessboard, start_pos, end_pos, piece_type=None, pseudo_legal=False):
     """
@@ -82,6 +85,83 @@ def is_legal_move(chessboard, start_pos, end_pos, piece_type=None, pseudo_legal=
 
     return False # Si el tipo de pieza no es reconocido, el movimiento es inválido.
 
+# ---------------------------
+# Generación de destinos por pieza.
+# En lugar de probar is_legal_move contra las 64 casillas, se recorren solo los destinos
+# que la pieza puede alcanzar. El resultado es el mismo conjunto de casillas.
+# ---------------------------
+
+def get_piece_targets(chessboard, start_pos, pseudo_legal=False):
+    """
+    Devuelve las casillas de destino geométricamente legales de la pieza en start_pos.
+    Equivale a quedarse con las casillas end_pos para las que is_legal_move(chessboard, start_pos, end_pos,
+    pseudo_legal=pseudo_legal) es True. No verifica si el movimiento deja al rey en jaque.
+
+    Args:
+        chessboard (ChessBoard): La instancia del tablero de ajedrez.
+        start_pos (tuple): Tupla (fila, columna) de la pieza.
+        pseudo_legal (bool, optional): Si es True, no se incluyen los enroques. Por defecto es False.
+
+    Returns:
+        list: Lista ordenada de tuplas (fila, columna) de destino.
+    """
+    from .rules import ChessRules # Importa ChessRules aquí para evitar importaciones circulares.
+
+    board = chessboard.board
+    sr, sc = start_pos
+    piece = board[sr][sc]
+    if piece == "--":
+        return []
+    color = piece[0]
+    p_type = piece[1]
+    targets = []
+
+    if p_type == "p": # Peón: avances, capturas diagonales y en passant.
+        direction = -1 if color == "w" else 1
+        er = sr + direction
+        if 0 <= er < 8:
+            if board[er][sc] == "--": # Avance de una casilla.
+                targets.append((er, sc))
+                # Avance de dos casillas desde la fila inicial (la intermedia ya está vacía).
+                if (sr == 6 and color == "w") or (sr == 1 and color == "b"):
+                    if board[sr + 2 * direction][sc] == "--":
+                        targets.append((sr + 2 * direction, sc))
+            ep = chessboard.en_passant_square
+            for er, ec in PAWN_ATTACKS[color][sr * 8 + sc]:
+                target = board[er][ec]
+                if target != "--":
+                    if target[0] != color: # Captura diagonal.
+                        targets.append((er, ec))
+                elif ep == (er, ec): # En passant: el peón vulnerable está junto al nuestro.
+                    cap = board[sr][ec]
+                    if cap != "--" and cap[1] == "p" and cap[0] != color:
+                        targets.append((er, ec))
+    elif p_type == "n" or p_type == "k": # Caballo y rey: saltos fijos.
+        for er, ec in (KNIGHT_TARGETS if p_type == "n" else KING_TARGETS)[sr * 8 + sc]:
+            target = board[er][ec]
+            if target == "--" or target[0] != color:
+                targets.append((er, ec))
+        # Enroques: solo si no es pseudo-legal y ChessRules los permite.
+        if p_type == "k" and not pseudo_legal:
+            if sc + 2 < 8 and ChessRules.can_castle(chessboard, color, kingside=True):
+                targets.append((sr, sc + 2))
+            if sc - 2 >= 0 and ChessRules.can_castle(chessboard, color, kingside=False):
+                targets.append((sr, sc - 2))
+    else: # Piezas deslizantes: torre, alfil y reina (una consulta de ataques por tipo de línea).
+        sq = sr * 8 + sc
+        occupancy = chessboard.all_occupancy
+        attacks = 0
+        if p_type != "b": # Torre o reina.
+            attacks |= ROOK_ATTACKS[sq][occupancy & ROOK_MASKS[sq]]
+        if p_type != "r": # Alfil o reina.
+            attacks |= BISHOP_ATTACKS[sq][occupancy & BISHOP_MASKS[sq]]
+        attacks &= ~chessboard.occupancy[color] # Sin casillas con piezas propias.
+        for target_sq in iter_squares(attacks):
+            targets.append(SQUARE_COORDS[target_sq])
+
+    targets.sort() # Mismo orden que el recorrido casilla por casilla.
+    return targets
+
 # ---------------------------
 # Reglas geométricas de movimiento para cada pieza.
 # Estas funciones solo verifican la trayectoria y si hay obstáculos, no jaques.
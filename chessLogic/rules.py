@@ -1,5 +1,8 @@
 # chessLogic/rules.py
-from .utils import get_all_moves # Importa get_all_moves para usar en is_checkmate y is_stalemate.
+from .zobrist import EN_PASSANT_KEYS # Claves de Zobrist de la columna de en passant.
+from .bitboard import CASTLE_WK, CASTLE_WQ, CASTLE_BK, CASTLE_BQ # Bits de los derechos de enroque.
+from .attack_tables import KNIGHT_ATTACKS_BB, KING_ATTACKS_BB, PAWN_ATTACKS_BB # Tablas de ataques precalculadas.
+from .slider_attacks import ROOK_ATTACKS, ROOK_MASKS, BISHOP_ATTACKS, BISHOP_MASKS # Ataques de piezas deslizantes.
 
 class ChessRules:
     """
@@ -21,12 +24,12 @@ class ChessRules:
         Returns:
             bool: True si el enroque es posible, False en caso contrario.
         """
-        rights = chessboard.castling_rights # Obtiene los derechos de enroque actuales del tablero.
+        rights = chessboard.castling # Máscara de derechos de enroque actuales del tablero.
         king_pos = chessboard.white_king_pos if color == "w" else chessboard.black_king_pos # Posición actual del rey.
         row, col = king_pos # Desempaqueta la posición del rey.
 
         if color == "w": # Reglas para el enroque blanco.
-            if kingside and rights["wK"] and king_pos == (7, 4): # Enroque corto blanco: rey en e1, derecho wK.
+            if kingside and rights & CASTLE_WK and king_pos == (7, 4): # Enroque corto blanco: rey en e1, derecho wK.
                 # Casillas entre el rey y la torre deben estar vacías.
                 if chessboard.board[7][5] == "--" and chessboard.board[7][6] == "--":
                     # Ninguna de las casillas por las que pasa el rey o donde termina debe estar atacada.
@@ -34,7 +37,7 @@ class ChessRules:
                        not ChessRules.is_square_attacked(chessboard, (7, 5), "b") and \
                        not ChessRules.is_square_attacked(chessboard, (7, 6), "b"):
                         return True
-            elif not kingside and rights["wQ"] and king_pos == (7, 4): # Enroque largo blanco: rey en e1, derecho wQ.
+            elif not kingside and rights & CASTLE_WQ and king_pos == (7, 4): # Enroque largo blanco: rey en e1, derecho wQ.
                 # Casillas entre el rey y la torre deben estar vacías.
                 if chessboard.board[7][1] == "--" and chessboard.board[7][2] == "--" and chessboard.board[7][3] == "--":
                     # Ninguna de las casillas por las que pasa el rey o donde termina debe estar atacada.
@@ -43,13 +46,13 @@ class ChessRules:
                        not ChessRules.is_square_attacked(chessboard, (7, 2), "b"):
                         return True
         else: # Reglas para el enroque negro (análogas a las blancas).
-            if kingside and rights["bK"] and king_pos == (0, 4): # Enroque corto negro.
+            if kingside and rights & CASTLE_BK and king_pos == (0, 4): # Enroque corto negro.
                 if chessboard.board[0][5] == "--" and chessboard.board[0][6] == "--":
                     if not ChessRules.is_square_attacked(chessboard, (0, 4), "w") and \
                        not ChessRules.is_square_attacked(chessboard, (0, 5), "w") and \
                        not ChessRules.is_square_attacked(chessboard, (0, 6), "w"):
                         return True
-            elif not kingside and rights["bQ"] and king_pos == (0, 4): # Enroque largo negro.
+            elif not kingside and rights & CASTLE_BQ and king_pos == (0, 4): # Enroque largo negro.
                 if chessboard.board[0][1] == "--" and chessboard.board[0][2] == "--" and chessboard.board[0][3] == "--":
                     if not ChessRules.is_square_attacked(chessboard, (0, 4), "w") and \
                        not ChessRules.is_square_attacked(chessboard, (0, 3), "w") and \
@@ -119,9 +122,9 @@ class ChessRules:
         """
         piece = chessboard.board[row][col] # Obtiene la pieza en la casilla.
         if piece == "wp" and row == 0: # Si es un peón blanco en la fila 0.
-            chessboard.board[row][col] = "w" + new_piece # Promociona a la nueva pieza blanca.
+            chessboard.set_piece(row, col, "w" + new_piece) # Promociona a la nueva pieza blanca.
         elif piece == "bp" and row == 7: # Si es un peón negro en la fila 7.
-            chessboard.board[row][col] = "b" + new_piece # Promociona a la nueva pieza negra.
+            chessboard.set_piece(row, col, "b" + new_piece) # Promociona a la nueva pieza negra.
 
     @staticmethod
     def is_square_attacked(chessboard, square, enemy_color):
@@ -136,69 +139,34 @@ class ChessRules:
         Returns:
             bool: True si la casilla está atacada, False en caso contrario.
         """
-        board = chessboard.board # Accede al tablero.
+        bitboards = chessboard.bitboards # Bitboards por pieza.
         r, c = square # Desempaqueta las coordenadas de la casilla.
+        sq = r * 8 + c # Índice de la casilla para las tablas precalculadas.
 
         # --- Peones ---
-        # Define las direcciones de ataque de los peones según el color enemigo.
-        if enemy_color == "w":  # Peones blancos atacan hacia abajo (hacia mayor fila).
-            attack_dirs = [(1, -1), (1, 1)]
-        else:  # Peones negros atacan hacia arriba (hacia menor fila).
-            attack_dirs = [(-1, -1), (-1, 1)]
-
-        for dr, dc in attack_dirs: # Itera sobre las direcciones de ataque del peón.
-            nr, nc = r + dr, c + dc # Calcula la casilla atacada.
-            if 0 <= nr < 8 and 0 <= nc < 8: # Si la casilla está dentro del tablero.
-                if board[nr][nc] == enemy_color + "p": # Si hay un peón enemigo en esa casilla.
-                    return True
+        # Un peón enemigo ataca la casilla si está en una de las casillas que atacaría
+        # un peón propio situado en ella (las diagonales hacia el lado enemigo).
+        own_color = "b" if enemy_color == "w" else "w"
+        if PAWN_ATTACKS_BB[own_color][sq] & bitboards[enemy_color + "p"]:
+            return True
 
         # --- Caballos ---
-        knight_moves = [(2, 1), (2, -1), (-2, 1), (-2, -1), # Define todos los movimientos de caballo.
-                        (1, 2), (1, -2), (-1, 2), (-1, -2)]
-        for dr, dc in knight_moves: # Itera sobre los movimientos de caballo.
-            nr, nc = r + dr, c + dc # Calcula la casilla atacada.
-            if 0 <= nr < 8 and 0 <= nc < 8: # Si la casilla está dentro del tablero.
-                if board[nr][nc] == enemy_color + "n": # Si hay un caballo enemigo en esa casilla.
-                    return True
-
-        # --- Alfiles y Damas (diagonales) ---
-        directions = [(1, 1), (1, -1), (-1, 1), (-1, -1)] # Define las direcciones diagonales.
-        for dr, dc in directions: # Itera sobre cada dirección diagonal.
-            nr, nc = r, c # Empieza desde la casilla a verificar.
-            while True:
-                nr += dr # Avanza en la dirección diagonal.
-                nc += dc
-                if not (0 <= nr < 8 and 0 <= nc < 8): # Si se sale del tablero.
-                    break
-                if board[nr][nc] != "--": # Si encuentra una pieza.
-                    # Si la pieza es un alfil o una reina enemiga, la casilla está atacada.
-                    if board[nr][nc] in [enemy_color + "b", enemy_color + "q"]:
-                        return True
-                    break # Si encuentra cualquier pieza, la línea de visión está bloqueada.
-
-        # --- Torres y Damas (líneas rectas) ---
-        directions = [(1, 0), (-1, 0), (0, 1), (0, -1)] # Define las direcciones rectas.
-        for dr, dc in directions: # Itera sobre cada dirección recta.
-            nr, nc = r, c # Empieza desde la casilla a verificar.
-            while True:
-                nr += dr # Avanza en la dirección recta.
-                nc += dc
-                if not (0 <= nr < 8 and 0 <= nc < 8): # Si se sale del tablero.
-                    break
-                if board[nr][nc] != "--": # Si encuentra una pieza.
-                    # Si la pieza es una torre o una reina enemiga, la casilla está atacada.
-                    if board[nr][nc] in [enemy_color + "r", enemy_color + "q"]:
-                        return True
-                    break # Si encuentra cualquier pieza, la línea de visión está bloqueada.
+        if KNIGHT_ATTACKS_BB[sq] & bitboards[enemy_color + "n"]:
+            return True
 
         # --- Rey enemigo ---
-        king_moves = [(1, 0), (-1, 0), (0, 1), (0, -1), # Define todos los movimientos de rey.
-                      (1, 1), (1, -1), (-1, 1), (-1, -1)]
-        for dr, dc in king_moves: # Itera sobre los movimientos de rey.
-            nr, nc = r + dr, c + dc # Calcula la casilla atacada.
-            if 0 <= nr < 8 and 0 <= nc < 8: # Si la casilla está dentro del tablero.
-                if board[nr][nc] == enemy_color + "k": # Si hay un rey enemigo en esa casilla.
-                    return True
+        if KING_ATTACKS_BB[sq] & bitboards[enemy_color + "k"]:
+            return True
+
+        # --- Piezas deslizantes ---
+        # Una consulta por tipo de línea: las casillas que vería una torre (o un alfil) desde la casilla
+        # atacada coinciden con las piezas deslizantes que pueden atacarla.
+        occupancy = chessboard.all_occupancy
+        queens = bitboards[enemy_color + "q"]
+        if ROOK_ATTACKS[sq][occupancy & ROOK_MASKS[sq]] & (bitboards[enemy_color + "r"] | queens):
+            return True
+        if BISHOP_ATTACKS[sq][occupancy & BISHOP_MASKS[sq]] & (bitboards[enemy_color + "b"] | queens):
+            return True
 
         return False # Si ninguna pieza enemiga ataca la casilla, devuelve False.
 
@@ -274,37 +242,38 @@ class ChessRules:
         if piece[1] == "k": # Si la pieza es un rey.
             if piece[0] == "w": # Rey blanco.
                 if end == (7, 6):  # Enroque corto blanco.
-                    board[7][6] = "wk" # Mueve el rey.
-                    board[7][4] = "--" # Vacía la casilla original del rey.
-                    board[7][5] = "wr" # Mueve la torre.
-                    board[7][7] = "--" # Vacía la casilla original de la torre.
+                    chessboard.set_piece(7, 6, "wk") # Mueve el rey.
+                    chessboard.set_piece(7, 4, "--") # Vacía la casilla original del rey.
+                    chessboard.set_piece(7, 5, "wr") # Mueve la torre.
+                    chessboard.set_piece(7, 7, "--") # Vacía la casilla original de la torre.
                     chessboard.white_king_pos = (7, 6) # Actualiza la posición del rey blanco.
                 elif end == (7, 2):  # Enroque largo blanco.
-                    board[7][2] = "wk"
-                    board[7][4] = "--"
-                    board[7][3] = "wr"
-                    board[7][0] = "--"
+                    chessboard.set_piece(7, 2, "wk")
+                    chessboard.set_piece(7, 4, "--")
+                    chessboard.set_piece(7, 3, "wr")
+                    chessboard.set_piece(7, 0, "--")
                     chessboard.white_king_pos = (7, 2)
             else: # Rey negro.
                 if end == (0, 6):  # Enroque corto negro.
-                    board[0][6] = "bk"
-                    board[0][4] = "--"
-                    board[0][5] = "br"
-                    board[0][7] = "--"
+                    chessboard.set_piece(0, 6, "bk")
+                    chessboard.set_piece(0, 4, "--")
+                    chessboard.set_piece(0, 5, "br")
+                    chessboard.set_piece(0, 7, "--")
                     chessboard.black_king_pos = (0, 6)
                 elif end == (0, 2):  # Enroque largo negro.
-                    board[0][2] = "bk"
-                    board[0][4] = "--"
-                    board[0][3] = "br"
-                    board[0][0] = "--"
+                    chessboard.set_piece(0, 2, "bk")
+                    chessboard.set_piece(0, 4, "--")
+                    chessboard.set_piece(0, 3, "br")
+                    chessboard.set_piece(0, 0, "--")
                     chessboard.black_king_pos = (0, 2)
 
         # En passant.
         elif piece[1] == "p" and ChessRules.en_passant(chessboard, start, end): # Si es un peón y un en passant válido.
             direction = -1 if piece[0] == "w" else 1 # Dirección del peón.
-            board[end[0]][end[1]] = piece # Mueve el peón que realiza el en passant.
-            board[start[0]][start[1]] = "--" # Vacía la casilla original del peón.
-            board[end[0] - direction][end[1]] = "--"  # Elimina el peón capturado.
+            chessboard.set_piece(end[0], end[1], piece) # Mueve el peón que realiza el en passant.
+            chessboard.set_piece(start[0], start[1], "--") # Vacía la casilla original del peón.
+            chessboard.set_piece(end[0] - direction, end[1], "--")  # Elimina el peón capturado.
+            chessboard.zobrist_key ^= EN_PASSANT_KEYS[chessboard.en_passant_square[1]] # Saca la columna de en passant de la clave.
             chessboard.en_passant_square = None # Resetea la casilla de en passant.
 
     @staticmethod
@@ -324,15 +293,9 @@ class ChessRules:
             return False
 
         # 2. ¿Hay algún movimiento legal que lo salve?
-        # Se obtienen los movimientos legales para el color actual.
-        moves = board.get_legal_moves(color)
-        for move in moves: # Itera sobre cada movimiento legal.
-            board.make_move(move) # Simula el movimiento.
-            # Si después de hacer el movimiento, el rey ya no está en jaque.
-            if not ChessRules.is_in_check(board, color):
-                board.undo_move() # Deshace el movimiento.
-                return False  # Encontró un movimiento que lo salva, por lo tanto, no es jaque mate.
-            board.undo_move() # Deshace el movimiento.
+        # has_valid_moves se detiene en el primer movimiento que deja al rey fuera de jaque.
+        if board.has_valid_moves(color):
+            return False
 
         # Si no hay ningún movimiento que salve al rey, es jaque mate.
         return True
@@ -355,15 +318,8 @@ class ChessRules:
             return False
 
         # 2. Si tiene al menos un movimiento legal, no es ahogado.
-        # Se obtienen los movimientos legales para el color actual.
-        moves = board.get_legal_moves(color)
-        for move in moves: # Itera sobre cada movimiento legal.
-            board.make_move(move) # Simula el movimiento.
-            # Si después de hacer el movimiento, el rey no está en jaque.
-            if not ChessRules.is_in_check(board, color):
-                board.undo_move() # Deshace el movimiento.
-                return False # Encontró un movimiento legal que no deja al rey en jaque, no es ahogado.
-            board.undo_move() # Deshace el movimiento.
+        if board.has_valid_moves(color):
+            return False
 
         # 3. Si no hay movimiento legal y el rey no está en jaque, es ahogado.
         return True
@@ -0,0 +1,92 @@
+# chessLogic/slider_attacks.py
+# Ataques de piezas deslizantes (torre, alfil y dama) consultados en una sola operación.
+#
+# Es el equivalente sin PEXT de los "magic bitboards": para cada casilla se precalcula, al importar,
+# el conjunto de casillas atacadas para TODAS las combinaciones posibles de bloqueadores relevantes
+# (las casillas de sus líneas sin contar el borde). En C ese índice se obtiene con
+# ((ocupación & máscara) * magic) >> shift; en Python un diccionario indexado directamente por
+# (ocupación & máscara) hace el mismo papel con un solo AND y una búsqueda, sin multiplicaciones
+# de 64 bits ni números mágicos que validar.
+#
+# Uso: ROOK_ATTACKS[sq][occupancy & ROOK_MASKS[sq]] (o las funciones rook_attacks/bishop_attacks/queen_attacks).
+# Sirve para generar movimientos, detectar ataques y contar movilidad con popcount.
+from chessLogic.attack_tables import RAYS, RAYS_BB, DIRECTIONS, ROOK_RAYS, BISHOP_RAYS # Líneas precalculadas.
+
+
+def _relevant_mask(sq, ray_indices):
+    """
+    Máscara de bloqueadores relevantes: las casillas de cada línea menos la última (el borde),
+    porque una pieza en el borde no cambia el conjunto de casillas atacadas.
+    """
+    mask = 0
+    for i in ray_indices:
+        for r, c in RAYS[sq][i][:-1]:
+            mask |= 1 << (r * 8 + c)
+    return mask
+
+
+def _ray_attacks(sq, occupancy, ray_indices):
+    """
+    Calcula los ataques a lo largo de las líneas dadas parando en el primer bloqueador de cada una.
+    Se usa solo para construir las tablas.
+    """
+    attacks = 0
+    for i in ray_indices:
+        ray = RAYS_BB[sq][i]
+        blockers = ray & occupancy
+        if blockers:
+            dr, dc = DIRECTIONS[i]
+            if dr * 8 + dc > 0: # Dirección creciente: el bloqueador más cercano es el bit más bajo.
+                first = (blockers & -blockers).bit_length() - 1
+            else: # Dirección decreciente: el bloqueador más cercano es el bit más alto.
+                first = blockers.bit_length() - 1
+            ray ^= RAYS_BB[first][i] # Quita las casillas detrás del bloqueador.
+        attacks |= ray
+    return attacks
+
+
+def _build_table(ray_indices):
+    """
+    Construye las máscaras y las tablas de ataques de un tipo de pieza deslizante para las 64 casillas.
+    Enumera todos los subconjuntos de la máscara con el truco de Carry-Rippler.
+    """
+    masks = []
+    tables = []
+    for sq in range(64):
+        mask = _relevant_mask(sq, ray_indices)
+        table = {}
+        subset = 0
+        while True:
+            table[subset] = _ray_attacks(sq, subset, ray_indices)
+            subset = (subset - mask) & mask # Siguiente subconjunto de la máscara.
+            if subset == 0:
+                break
+        masks.append(mask)
+        tables.append(table)
+    return tuple(masks), tuple(tables)
+
+
+ROOK_MASKS, ROOK_ATTACKS = _build_table(ROOK_RAYS)
+BISHOP_MASKS, BISHOP_ATTACKS = _build_table(BISHOP_RAYS)
+
+
+def rook_attacks(sq, occupancy):
+    """
+    Devuelve el bitboard de casillas atacadas por una torre en sq con la ocupación dada.
+    Incluye la primera pieza de cada línea (sea propia o enemiga).
+    """
+    return ROOK_ATTACKS[sq][occupancy & ROOK_MASKS[sq]]
+
+
+def bishop_attacks(sq, occupancy):
+    """
+    Devuelve el bitboard de casillas atacadas por un alfil en sq con la ocupación dada.
+    """
+    return BISHOP_ATTACKS[sq][occupancy & BISHOP_MASKS[sq]]
+
+
+def queen_attacks(sq, occupancy):
+    """
+    Devuelve el bitboard de casillas atacadas por una dama en sq (torre + alfil).
+    """
+    return ROOK_ATTACKS[sq][occupancy & ROOK_MASKS[sq]] | BISHOP_ATTACKS[sq][occupancy & BISHOP_MASKS[sq]]
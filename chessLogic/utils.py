@@ -15,8 +15,7 @@ def get_all_moves(chessboard, color, pseudo_legal=False):
     Returns:
         list: Una lista de tuplas, donde cada tupla representa un movimiento ((start_row, start_col), (end_row, end_col)).
     """
-    from .moves import is_legal_move # Importa is_legal_move aquí para evitar importaciones circulares.
-    
+    from .moves import get_piece_targets # Importa get_piece_targets aquí para evitar importaciones circulares.
 
     moves_list = [] # Lista para almacenar los movimientos generados.
     board = chessboard.board # Accede al tablero de la instancia ChessBoard.
@@ -26,18 +25,8 @@ def get_all_moves(chessboard, color, pseudo_legal=False):
             piece = board[r][c] # Obtiene la pieza en la casilla actual.
             # Si hay una pieza en la casilla y es del color del jugador actual.
             if piece != "--" and piece[0] == color:
-                for er in range(8): # Itera sobre todas las posibles filas de destino.
-                    for ec in range(8): # Itera sobre todas las posibles columnas de destino.
-                        if pseudo_legal:
-                            # Movimientos pseudo-legales: solo reglas geométricas.
-                            # Llama a is_legal_move con pseudo_legal=True para ignorar la verificación de enroque completo.
-                            if is_legal_move(chessboard, (r, c), (er, ec), pseudo_legal=True):
-                                moves_list.append(((r, c), (er, ec))) # Añade el movimiento a la lista.
-                        else:
-                            # Movimientos legales completos (incluye enroque completo y en passant).
-                            # Llama a is_legal_move con pseudo_legal=False.
-                            if is_legal_move(chessboard, (r, c), (er, ec), pseudo_legal=False):
-                                moves_list.append(((r, c), (er, ec))) # Añade el movimiento a la lista.
+                # Solo se recorren los destinos alcanzables por la pieza (en lugar de las 64 casillas).
+                # Con pseudo_legal=False se incluyen además los enroques permitidos por ChessRules.
+                for end in get_piece_targets(chessboard, (r, c), pseudo_legal=pseudo_legal):
+                    moves_list.append(((r, c), end)) # Añade el movimiento a la lista.
     return moves_list # Devuelve la lista de movimientos.
-
-
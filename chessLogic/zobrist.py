@@ -0,0 +1,59 @@
+# chessLogic/zobrist.py
+# Claves de Zobrist para identificar posiciones con un entero de 64 bits.
+# La clave de una posición es el XOR de las claves de cada pieza en su casilla, de cada derecho
+# de enroque vigente, de la columna de en passant (si la hay) y del turno (si mueven las negras).
+# Las claves se generan con una semilla fija, por lo que son estables entre procesos y ejecuciones
+# (a diferencia de hash() sobre cadenas, que Python sala en cada proceso).
+import random # Generador pseudoaleatorio con semilla fija.
+from chessLogic.bitboard import PIECES, CASTLING_BITS # Piezas con claves por casilla y bits de enroque.
+
+ZOBRIST_SEED = 0x5A0B2157 # Semilla fija: cambiarla invalida cualquier clave guardada.
+
+_rng = random.Random(ZOBRIST_SEED)
+
+# PIECE_KEYS[pieza][sq]: clave de la pieza en la casilla sq (sq = fila * 8 + columna).
+PIECE_KEYS = {piece: [_rng.getrandbits(64) for _ in range(64)] for piece in PIECES}
+# Una clave por derecho de enroque, con los mismos nombres que ChessBoard.castling_rights.
+CASTLING_KEYS = {right: _rng.getrandbits(64) for right in ("wK", "wQ", "bK", "bQ")}
+# Una clave por columna de la casilla de en passant.
+EN_PASSANT_KEYS = [_rng.getrandbits(64) for _ in range(8)]
+# Clave que se aplica cuando es el turno de las negras.
+SIDE_KEY = _rng.getrandbits(64)
+
+del _rng
+
+# CASTLING_MASK_KEYS[máscara]: XOR de las claves de los derechos presentes en la máscara de 4 bits
+# (ver ChessBoard.castling). Como XOR es su propio inverso, CASTLING_MASK_KEYS[antes ^ después]
+# actualiza la clave con un solo XOR por movimiento.
+CASTLING_MASK_KEYS = [0] * 16
+for _mask in range(16):
+    for _right, _bit in CASTLING_BITS.items():
+        if _mask & _bit:
+            CASTLING_MASK_KEYS[_mask] ^= CASTLING_KEYS[_right]
+CASTLING_MASK_KEYS = tuple(CASTLING_MASK_KEYS)
+del _mask, _right, _bit
+
+
+def compute_zobrist_key(chessboard):
+    """
+    Calcula desde cero la clave de Zobrist de una posición.
+    Sirve para inicializar ChessBoard.zobrist_key y para verificar la actualización incremental.
+
+    Args:
+        chessboard (ChessBoard): La instancia del tablero de ajedrez.
+
+    Returns:
+        int: La clave de Zobrist de 64 bits de la posición.
+    """
+    key = 0
+    for r in range(8):
+        for c in range(8):
+            piece = chessboard.board[r][c]
+            if piece != "--":
+                key ^= PIECE_KEYS[piece][r * 8 + c]
+    key ^= CASTLING_MASK_KEYS[chessboard.castling]
+    if chessboard.en_passant_square is not None:
+        key ^= EN_PASSANT_KEYS[chessboard.en_passant_square[1]]
+    if chessboard.turn == "b":
+        key ^= SIDE_KEY
+    return key
@@ -3,11 +3,35 @@ from gui.board import draw_board, highlight_square, highlight_king_in_check # Im
 from gui.pieces import load_images, IMAGES # Importa funciones para cargar imágenes de piezas y el diccionario de imágenes.
 from chessLogic.chessboard import ChessBoard # Importa la clase ChessBoard que maneja la lógica del ajedrez.
 from chessLogic.move import Move # Importa la clase Move para representar los movimientos en el ajedrez.
-from IA.search import get_best_move # Importa la función para obtener el mejor movimiento de la IA (Minimax).
+from IA.search import get_best_move, SearchContext # Importa la búsqueda Minimax y su estado persistente por partida.
+from IA.time_manager import TimeManager # Reparte el tiempo del reloj de la IA entre sus jugadas.
+from IA.ponder import Ponderer # Búsqueda de la IA en el tiempo del jugador.
 import sys  # Importar sys para sys.exit() para salir de la aplicación.
+import time # Medición del tiempo gastado en cada jugada (relojes).
 
 WIDTH, HEIGHT = 640, 640 # Define el ancho y alto de la ventana del juego.
 SQ_SIZE = WIDTH // 8 # Calcula el tamaño de cada casilla del tablero.
+GAME_TIME = 300 # Tiempo inicial de cada reloj en segundos (5 minutos).
+INCREMENT = 3 # Incremento por jugada en segundos.
+MAX_AI_DEPTH = 64 # Profundidad máxima de la IA: con reloj, la limita el gestor de tiempo.
+AI_WORKERS = 1 # Procesos de la búsqueda de la IA (Lazy SMP, IA/smp.py); subirlo en equipos con varios núcleos.
+PONDER = True # La IA (difícil) sigue pensando mientras el jugador piensa su jugada (IA/ponder.py).
+SHOW_SEARCH_INFO = False # Imprimir en la consola la información de cada iteración de la búsqueda (IA/search_info.py).
+
+def format_clock(seconds):
+    """
+    Formatea el tiempo de un reloj como mm:ss.
+    """
+    seconds = max(0, int(seconds))
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+def update_clock_caption(clocks):
+    """
+    Muestra los relojes de ambos bandos en el título de la ventana.
+    """
+    pygame.display.set_caption(
+        f"Ajedrez con IA: PHIA  ⏱ Blancas {format_clock(clocks['w'])} · Negras {format_clock(clocks['b'])}"
+    )
 
 def promotion_menu(screen, color):
     """
@@ -254,6 +278,9 @@ def run_game():
 
     clock = pygame.time.Clock() # Crea un objeto Clock para controlar la velocidad del juego.
     board = ChessBoard() # Crea una nueva instancia del tablero de ajedrez.
+    search_context = SearchContext(shared=AI_WORKERS > 1) # Tabla de transposiciones y heurísticas de la IA, conservadas durante la partida.
+    on_info = print if SHOW_SEARCH_INFO else None # Destino de la información de cada iteración.
+    ponderer = Ponderer(search_context, MAX_AI_DEPTH, AI_WORKERS, on_info) # Búsqueda en el tiempo del jugador.
     load_images() # Carga todas las imágenes de las piezas.
 
     # 🔹 Preguntar modo antes de iniciar el juego.
@@ -264,6 +291,9 @@ def run_game():
         difficulty = modal_choose_difficulty(screen)  # Llama al modal para elegir entre 'easy' o 'hard'.
 
     selected_square = None # Almacena la casilla seleccionada por el jugador.
+    clocks = {"w": GAME_TIME, "b": GAME_TIME} # Tiempo restante de cada bando en segundos.
+    turn_start = time.time() # Instante en que empezó a correr el reloj del bando que mueve.
+    update_clock_caption(clocks)
     running = True # Bandera para controlar el bucle principal del juego.
     last_turn = board.turn  # Guarda el turno anterior para detectar cambios.
 
@@ -302,6 +332,9 @@ def run_game():
                             turno_actual = board.turn # Guarda el turno actual antes de hacer el movimiento.
                             move = Move(start, end, board, promotion_choice=promote_to or "q") # Crea el objeto Move.
                             board.make_move(move) # Realiza el movimiento en el tablero.
+                            clocks[turno_actual] += INCREMENT - (time.time() - turn_start) # Descuenta el tiempo gastado.
+                            turn_start = time.time() # Empieza a correr el reloj del rival.
+                            update_clock_caption(clocks)
 
                             draw_board(screen) # Redibuja el tablero.
                             if board.is_check(board.turn): # Si el rey del turno actual está en jaque.
@@ -320,22 +353,32 @@ def run_game():
                                 action = modal_game_over(screen, f"¡Jaque Mate! Ganaron las {ganador}", board) # Muestra el modal de fin de juego.
                                 if action == "play_again": # Si el jugador elige jugar de nuevo.
                                     board = ChessBoard() # Reinicia el tablero.
+                                    ponderer.stop() # Cancela la búsqueda en el tiempo del jugador de la partida anterior.
+                                    search_context.clear() # Partida nueva: la IA olvida lo aprendido.
                                     selected_square = None # Deselecciona la casilla.
                                     last_turn = board.turn # Reinicia el turno anterior.
                                     mode = modal_choose_mode(screen) # Vuelve a preguntar el modo de juego.
                                     if mode == "ia": # Si es contra IA, pregunta la dificultad.
                                         difficulty = modal_choose_difficulty(screen)
+                                    clocks = {"w": GAME_TIME, "b": GAME_TIME} # Reinicia los relojes.
+                                    turn_start = time.time()
+                                    update_clock_caption(clocks)
                                 else:
                                     running = False # Si no, sale del juego.
                             elif board.is_stalemate(board.turn): # Si es ahogado.
                                 action = modal_game_over(screen, "¡Ahogado! Es un empate.", board) # Muestra el modal de fin de juego.
                                 if action == "play_again": # Si el jugador elige jugar de nuevo.
                                     board = ChessBoard() # Reinicia el tablero.
+                                    ponderer.stop() # Cancela la búsqueda en el tiempo del jugador de la partida anterior.
+                                    search_context.clear() # Partida nueva: la IA olvida lo aprendido.
                                     selected_square = None # Deselecciona la casilla.
                                     last_turn = board.turn # Reinicia el turno anterior.
                                     mode = modal_choose_mode(screen) # Vuelve a preguntar el modo de juego.
                                     if mode == "ia": # Si es contra IA, pregunta la dificultad.
                                         difficulty = modal_choose_difficulty(screen)
+                                    clocks = {"w": GAME_TIME, "b": GAME_TIME} # Reinicia los relojes.
+                                    turn_start = time.time()
+                                    update_clock_caption(clocks)
                                 else:
                                     running = False # Si no, sale del juego.
 
@@ -350,10 +393,17 @@ def run_game():
                 best_move = get_best_move_astar(board, depth_limit=2, beam_width=5) # Obtiene el mejor movimiento con A*.
             else: # Si la dificultad es difícil.
                 from IA.search import get_best_move # Importa el algoritmo Minimax.
-                best_move = get_best_move(board, max_depth=3, time_limit=5.0) # Obtiene el mejor movimiento con Minimax.
+                time_manager = TimeManager(clocks["b"], INCREMENT) # Presupuesto según el reloj de la IA.
+                best_move = ponderer.finish(board, time_manager) # Si el jugador hizo lo previsto, sigue la búsqueda en curso.
+                if best_move is None: # Sin acierto: búsqueda nueva (la tabla conserva lo buscado mientras tanto).
+                    best_move = get_best_move(board, max_depth=MAX_AI_DEPTH, context=search_context,
+                                              time_manager=time_manager, workers=AI_WORKERS, on_info=on_info) # Obtiene el mejor movimiento con Minimax.
 
             if best_move: # Si la IA encontró un movimiento.
                 board.make_move(best_move) # Realiza el movimiento de la IA.
+                clocks["b"] += INCREMENT - (time.time() - turn_start) # Descuenta el tiempo que pensó la IA.
+                turn_start = time.time() # Empieza a correr el reloj del jugador.
+                update_clock_caption(clocks)
 
                 draw_board(screen) # Redibuja el tablero.
                 if board.is_check(board.turn): # Si el rey del turno actual está en jaque.
@@ -365,6 +415,8 @@ def run_game():
                         if piece_draw != "--":
                             screen.blit(IMAGES[piece_draw], (c_draw * SQ_SIZE, r_draw * SQ_SIZE))
                 pygame.display.flip() # Actualiza la pantalla.
+                if PONDER and difficulty != "easy": # Pensar en el tiempo del jugador (no hace nada si la partida terminó).
+                    ponderer.start(board)
 
                 # Revisar fin de juego (jaque mate o ahogado).
                 if board.is_checkmate(board.turn): # Si es jaque mate.
@@ -372,22 +424,32 @@ def run_game():
                     action = modal_game_over(screen, f"¡Jaque Mate! Ganaron las {ganador}", board) # Muestra el modal de fin de juego.
                     if action == "play_again": # Si el jugador elige jugar de nuevo.
                         board = ChessBoard() # Reinicia el tablero.
+                        ponderer.stop() # Cancela la búsqueda en el tiempo del jugador de la partida anterior.
+                        search_context.clear() # Partida nueva: la IA olvida lo aprendido.
                         selected_square = None # Deselecciona la casilla.
                         last_turn = board.turn # Reinicia el turno anterior.
                         mode = modal_choose_mode(screen) # Vuelve a preguntar el modo de juego.
                         if mode == "ia": # Si es contra IA, pregunta la dificultad.
                             difficulty = modal_choose_difficulty(screen)
+                        clocks = {"w": GAME_TIME, "b": GAME_TIME} # Reinicia los relojes.
+                        turn_start = time.time()
+                        update_clock_caption(clocks)
                     else:
                         running = False # Si no, sale del juego.
                 elif board.is_stalemate(board.turn): # Si es ahogado.
                     action = modal_game_over(screen, "¡Ahogado! Es un empate.", board) # Muestra el modal de fin de juego.
                     if action == "play_again": # Si el jugador elige jugar de nuevo.
                         board = ChessBoard() # Reinicia el tablero.
+                        ponderer.stop() # Cancela la búsqueda en el tiempo del jugador de la partida anterior.
+                        search_context.clear() # Partida nueva: la IA olvida lo aprendido.
                         selected_square = None # Deselecciona la casilla.
                         last_turn = board.turn # Reinicia el turno anterior.
                         mode = modal_choose_mode(screen) # Vuelve a preguntar el modo de juego.
                         if mode == "ia": # Si es contra IA, pregunta la dificultad.
                             difficulty = modal_choose_difficulty(screen)
+                        clocks = {"w": GAME_TIME, "b": GAME_TIME} # Reinicia los relojes.
+                        turn_start = time.time()
+                        update_clock_caption(clocks)
                     else:
                         running = False # Si no, sale del juego.
 
@@ -422,6 +484,7 @@ def run_game():
         pygame.display.flip() # Actualiza la pantalla para mostrar todos los elementos dibujados.
         clock.tick(60) # Limita el bucle a 60 fotogramas por segundo.
 
+    ponderer.stop() # Termina la búsqueda en el tiempo del jugador antes de salir.
     pygame.quit() # Desinicializa Pygame.
     sys.exit() # Sale de la aplicación.
 
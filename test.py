@@ -1,9 +1,27 @@
 # test_checkmate_stalemate.py
+import os # Salida abrupta de un proceso auxiliar simulado.
+import time # Medición del tiempo de búsqueda.
 from chessLogic.chessboard import ChessBoard # Importa la clase ChessBoard.
 from chessLogic.move import Move # Importa la clase Move.
 from IA.move_generator import MoveGenerator # Importa MoveGenerator (aunque no se usa directamente en este test).
-from IA.search import get_best_move # Importa get_best_move (aunque no se usa directamente en este test).
+from IA import search # Tablas de ordenación de la búsqueda.
+from IA.search import get_best_move, SearchContext, HISTORY_DECAY_SHIFT # Búsqueda y su contexto persistente.
 from chessLogic.rules import ChessRules # Importa ChessRules para verificar jaque mate y ahogado.
+from chessLogic.zobrist import compute_zobrist_key # Recalcula la clave de Zobrist desde cero.
+from IA.transposition import ( # Tabla de transposiciones (y su versión en memoria compartida).
+    TranspositionTable, SharedTranspositionTable, EXACT, LOWERBOUND, UPPERBOUND,
+)
+import pickle # Envío de la tabla compartida a otro proceso.
+from IA import smp # Procesos auxiliares de la búsqueda Lazy SMP.
+from IA.root_split import RootSplitSearch # Búsqueda determinista repartiendo los movimientos raíz.
+from IA.time_manager import TimeManager # Gestión del tiempo con reloj.
+from IA.ponder import Ponderer, predict_reply # Búsqueda en el tiempo del rival.
+from IA.see import static_exchange_eval # Evaluación estática de intercambios.
+from IA.perft import perft, REFERENCE_POSITIONS # Recuento de nodos y posiciones de referencia.
+from chessLogic.fen import START_FEN, iter_fen_lines # Posiciones en notación FEN/EPD.
+from chessLogic.move import ( # Codificación entera de movimientos.
+    encode_move, move_to_sq, move_to_uci, is_capture, is_promotion, DOUBLE_PAWN_PUSH, PROMOTION_FLAGS,
+)
 
 def play_sequence(board, moves_list):
     """
@@ -50,7 +68,598 @@ def test_checkmate_detection():
     else:
         print("✅ Juego sigue") # Si no es ninguno, imprime que el juego sigue.
 
-if __name__ == "__main__":
-    test_checkmate_detection() # Ejecuta la función de prueba si el script se ejecuta directamente.
+def test_bitboards_sync():
+    """
+    Comprueba que los bitboards coinciden con el tablero 8x8 tras hacer y deshacer jugadas
+    (incluye captura, enroque corto y en passant).
+    """
+    board = ChessBoard()
+    sequence = [
+        ((6, 4), (4, 4)),  # e4
+        ((1, 3), (3, 3)),  # d5
+        ((4, 4), (3, 3)),  # exd5 (captura)
+        ((1, 4), (3, 4)),  # e5
+        ((3, 3), (2, 4)),  # dxe6 a.p.
+        ((0, 5), (3, 2)),  # Ac5
+        ((7, 6), (5, 5)),  # Cf3
+        ((0, 6), (2, 5)),  # Cf6
+        ((7, 5), (4, 2)),  # Ac4
+        ((0, 4), (0, 6)),  # O-O negro
+    ]
+    play_sequence(board, sequence)
+    assert len(board.move_log) == len(sequence) # Todas las jugadas deben haberse aplicado.
+
+    def check_sync():
+        for r in range(8):
+            for c in range(8):
+                piece = board.get_piece(r, c)
+                bit = 1 << (r * 8 + c)
+                for name, bb in board.bitboards.items(): # Solo el bitboard de la pieza tiene el bit activo.
+                    assert bool(bb & bit) == (name == piece)
+                assert bool(board.all_occupancy & bit) == (piece != "--")
+
+    check_sync()
+    while board.move_log: # Deshacer todo debe devolver la posición inicial.
+        board.undo_move()
+        check_sync()
+    assert board.board == ChessBoard().board
+
+def test_zobrist_incremental():
+    """
+    Comprueba que la clave de Zobrist incremental coincide con el recálculo completo
+    y que dos órdenes de jugadas que llevan a la misma posición dan la misma clave.
+    """
+    board = ChessBoard()
+    start_key = board.zobrist_key
+    sequence = [((7, 6), (5, 5)), ((0, 6), (2, 5)), ((7, 1), (5, 2)), ((0, 1), (2, 2))] # Cf3 Cf6 Cc3 Cc6
+    for start, end in sequence:
+        board.make_move(Move(start, end, board))
+        assert board.zobrist_key == compute_zobrist_key(board)
+
+    other = ChessBoard() # Mismas jugadas en otro orden: Cc3 Cc6 Cf3 Cf6.
+    play_sequence(other, [sequence[2], sequence[3], sequence[0], sequence[1]])
+    assert other.zobrist_key == board.zobrist_key
+
+    while board.move_log:
+        board.undo_move()
+        assert board.zobrist_key == compute_zobrist_key(board)
+    assert board.zobrist_key == start_key
+
+def test_move_encoding():
+    """
+    Comprueba la codificación entera de movimientos: ida y vuelta con Move y las cuatro promociones.
+    """
+    board = ChessBoard()
+    for move in MoveGenerator.generate_legal_moves(board, "w"):
+        assert Move.from_int(move, board).to_int() == move
+    assert encode_move(52, 36, DOUBLE_PAWN_PUSH) == Move((6, 4), (4, 4), board).to_int() # e2e4
+    assert move_to_uci(encode_move(52, 36, DOUBLE_PAWN_PUSH)) == "e2e4"
+
+    # Peón blanco en a7 con la casilla a8 libre: se generan las cuatro promociones.
+    board.set_piece(1, 0, "wp")
+    board.set_piece(0, 0, "--")
+    promotions = [m for m in MoveGenerator.generate_pseudo_legal_moves(board, "w") if is_promotion(m)]
+    assert sorted(move_to_uci(m) for m in promotions if move_to_sq(m) == 0) == ["a7a8b", "a7a8n", "a7a8q", "a7a8r"]
+    board.make_move(encode_move(8, 0, PROMOTION_FLAGS["n"]))
+    assert board.get_piece(0, 0) == "wn"
+    board.undo_move()
+    assert board.get_piece(1, 0) == "wp" and board.get_piece(0, 0) == "--"
+
+def test_undo_stack_state():
+    """
+    Comprueba la pila de deshacer: capturar una torre en su casilla inicial retira el derecho de enroque,
+    el reloj de 50 movimientos avanza y se reinicia, y deshacer restaura todo el estado.
+    """
+    board = ChessBoard()
+    play_sequence(board, [((6, 6), (5, 6)), ((1, 1), (2, 1)), ((7, 5), (6, 6))]) # g3 b6 Ag2
+    assert board.halfmove_clock == 1 # Ag2 no es captura ni movimiento de peón.
+    play_sequence(board, [((1, 0), (2, 0)), ((6, 6), (0, 0))]) # a6 Axa8 (captura la torre de a8).
+    assert board.halfmove_clock == 0
+    assert board.castling_rights == {"wK": True, "wQ": True, "bK": True, "bQ": False}
+    assert board.zobrist_key == compute_zobrist_key(board)
+
+    board.undo_move()
+    assert board.castling_rights["bQ"] and board.get_piece(0, 0) == "br"
+    while board.move_log:
+        board.undo_move()
+    assert board.halfmove_clock == 0 and board.zobrist_key == ChessBoard().zobrist_key
+
+def test_fen_roundtrip():
+    """
+    Comprueba la lectura y escritura FEN: la posición inicial, una posición tras jugar movimientos
+    (misma clave de Zobrist que al cargarla) y la carga masiva de líneas EPD en un tablero reutilizado.
+    """
+    assert ChessBoard().to_fen() == START_FEN
+    kiwipete = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+    assert ChessBoard.from_fen(kiwipete).to_fen() == kiwipete
+
+    board = ChessBoard()
+    play_sequence(board, [((6, 4), (4, 4)), ((1, 3), (3, 3)), ((4, 4), (3, 4)), ((1, 5), (3, 5))]) # e4 d5 e5 f5
+    fen = "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3"
+    assert board.to_fen() == fen
+    loaded = ChessBoard.from_fen(fen)
+    assert loaded.zobrist_key == board.zobrist_key and loaded.bitboards == board.bitboards
+    loaded_key = loaded.zobrist_key
+    # Sin peón que pueda capturar, la casilla de en passant del FEN se descarta.
+    assert ChessBoard.from_fen(START_FEN.replace("w KQkq -", "w KQkq e6")).zobrist_key == ChessBoard().zobrist_key
+
+    lines = ["# comentario", '8/8/8/8/8/8/6k1/4K2R w K - bm O-O; id "epd.1";', "", fen]
+    loaded = [(b.to_fen(), ops) for b, ops in iter_fen_lines(lines)]
+    assert loaded == [("8/8/8/8/8/8/6k1/4K2R w K - 0 1", {"bm": "O-O", "id": "epd.1"}), (fen, {})]
+
+    # Un FEN no válido no modifica el tablero.
+    board = ChessBoard.from_fen(fen)
+    bitboards = dict(board.bitboards)
+    for bad in ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNZ w KQkq - 0 1", # Pieza desconocida en la fila 1.
+                "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQQBNR w KQkq - 0 1", # Sin rey blanco.
+                "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBKKBNR w KQkq - 0 1", # Dos reyes blancos.
+                "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR x KQkq - 0 1", # Turno no válido.
+                "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq z9 0 1"): # Casilla no válida.
+        try:
+            board.set_fen(bad)
+            assert False, bad
+        except ValueError:
+            pass
+        assert board.to_fen() == fen and board.bitboards == bitboards and board.zobrist_key == loaded_key
 
+def count_legal_nodes(board, depth):
+    """
+    Cuenta las posiciones alcanzables a la profundidad dada usando ChessBoard.get_legal_moves (perft).
+    """
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in board.get_legal_moves():
+        board.make_move(move)
+        nodes += count_legal_nodes(board, depth - 1)
+        board.undo_move()
+    return nodes
+
+def test_legal_moves_perft_start():
+    """
+    Comprueba el número de nodos desde la posición inicial (valores de referencia conocidos).
+    """
+    board = ChessBoard()
+    assert [count_legal_nodes(board, d) for d in (1, 2, 3)] == [20, 400, 8902]
+
+def test_perft_reference_positions():
+    """
+    Comprueba los recuentos de perft de las posiciones de referencia con los dos generadores
+    (y con la tabla hash), lo que cubre enroques, en passant, promociones y clavadas.
+    """
+    for fen, expected in REFERENCE_POSITIONS.values():
+        board = ChessBoard.from_fen(fen)
+        assert perft(board, 2, "rules") == expected[1]
+        assert perft(board, 3) == expected[2]
+        assert perft(board, 3, table={}) == expected[2]
+        assert board.to_fen() == fen # perft deja el tablero como estaba.
+
+def test_transposition_table():
+    """
+    Comprueba la tabla de transposiciones: ida y vuelta de los datos empaquetados, reemplazo por
+    profundidad en la cubeta, envejecimiento por generación y estadísticas.
+    """
+    tt = TranspositionTable(size_mb=1)
+    move = encode_move(52, 36, DOUBLE_PAWN_PUSH)
+    tt.store(12345, 4, LOWERBOUND, -1234.56, move)
+    assert tt.probe(12345) == (4, LOWERBOUND, -1234.56, move)
+    assert tt.probe(54321) is None
 
+    # Otra posición de la misma cubeta, menos profunda: va a la entrada de reemplazo siempre.
+    other = 12345 + (tt.bucket_mask + 1)
+    tt.store(other, 2, EXACT, 10.0)
+    assert tt.probe(12345)[0] == 4 and tt.probe(other) == (2, EXACT, 10.0, None)
+    tt.store(12345, 3, EXACT, 0.5) # Misma posición sin movimiento: conserva el anterior.
+    assert tt.probe(12345) == (3, EXACT, 0.5, move)
+    tt.store(12345, 0, UPPERBOUND, -3.0) # Cota de la quiescencia: no borra la entrada más profunda.
+    assert tt.probe(12345) == (3, EXACT, 0.5, move)
+    tt.store(other, 4, LOWERBOUND, 2.0, move)
+    tt.store(other, 0, LOWERBOUND, 9.0)
+    assert tt.probe(other) == (4, LOWERBOUND, 2.0, move)
+
+    tt.new_search() # Las entradas viejas siguen siendo visibles pero se reemplazan primero.
+    third = 12345 + 2 * (tt.bucket_mask + 1)
+    tt.store(third, 1, UPPERBOUND, 7.25)
+    assert tt.probe(third) == (1, UPPERBOUND, 7.25, None) and tt.probe(12345) is None
+    stats = tt.stats()
+    assert stats["hits"] == 7 and stats["collisions"] == 0 and stats["size_mb"] == 1
+
+def test_search_context():
+    """
+    Comprueba que el contexto de búsqueda se conserva entre jugadas de la misma partida
+    (con la history heuristic reducida) y se vacía cuando la posición salta a otra partida.
+    """
+    board = ChessBoard()
+    context = SearchContext(tt_size_mb=1)
+    move = get_best_move(board, max_depth=2, context=context)
+    assert move is not None and context.transposition_table.stores > 0
+    history = dict(context.history_heuristic)
+
+    board.make_move(move)
+    board.make_move(MoveGenerator.generate_legal_moves(board, board.turn)[0])
+    assert context.is_continuation(board)
+    context.new_search(board, 2) # Dos medias jugadas después: se conserva lo aprendido.
+    assert context.transposition_table.probe(ChessBoard().zobrist_key) is not None
+    assert all(context.history_heuristic.get(key, 0) == score >> HISTORY_DECAY_SHIFT for key, score in history.items())
+
+    board.set_fen("8/8/4k3/8/8/4K3/4P3/8 w - - 0 1") # Otra partida: se olvida todo.
+    assert not context.is_continuation(board)
+    context.new_search(board, 2)
+    assert context.transposition_table.probe(ChessBoard().zobrist_key) is None
+    assert not context.history_heuristic
+
+def test_move_ordering():
+    """
+    Comprueba la ordenación por etapas: movimiento de la tabla primero, después capturas por MVV-LVA,
+    killer moves y movimientos tranquilos; y que la búsqueda cuenta las podas del primer movimiento.
+    """
+    board = ChessBoard.from_fen(REFERENCE_POSITIONS["kiwipete"][0])
+    moves = MoveGenerator.generate_legal_moves(board, board.turn)
+    quiet = [m for m in moves if not is_capture(m)]
+    tt_move, killer = quiet[-1], quiet[-2]
+    search.killer_moves[5] = [killer]
+    ordered = search.order_moves(board, moves, 5, tt_move)
+    del search.killer_moves[5]
+    captures = [m for m in ordered if is_capture(m)]
+    assert ordered[0] == tt_move and ordered[1:len(captures) + 1] == captures
+    assert ordered[len(captures) + 1] == killer
+    assert move_to_uci(captures[0]) == "e2a6" # MVV-LVA: alfil por alfil antes que dama por caballo.
+
+    context = SearchContext(tt_size_mb=1)
+    get_best_move(board, max_depth=3, context=context)
+    stats = context.stats
+    assert stats["nodes"] > 0 and 0 < stats["first_move_cutoffs"] <= stats["cutoffs"]
+    assert stats["hash_move_cutoffs"] <= stats["hash_moves"]
+    assert 0.0 < context.first_move_cutoff_rate() <= 1.0
+
+def mirror_fen(fen):
+    """
+    Devuelve la posición FEN con los colores intercambiados y el tablero reflejado (misma posición para el rival).
+    """
+    placement, turn, castling, en_passant, *clocks = fen.split()
+    placement = "/".join(rank.swapcase() for rank in reversed(placement.split("/")))
+    castling = "".join(sorted(castling.swapcase(), key="KQkq".index)) if castling != "-" else "-"
+    en_passant = en_passant if en_passant == "-" else en_passant[0] + str(9 - int(en_passant[1]))
+    return " ".join([placement, "b" if turn == "w" else "w", castling, en_passant] + clocks)
+
+def test_negamax_pvs():
+    """
+    Comprueba negamax con PVS: la puntuación es del bando que mueve (igual en la posición reflejada),
+    el envoltorio minimax la devuelve desde el punto de vista de las blancas y se encuentra el mate en uno.
+    """
+    inf = float("inf")
+    fen = REFERENCE_POSITIONS["kiwipete"][0]
+    for depth in (1, 2, 3):
+        search.transposition_table.clear()
+        score, move = search.negamax(ChessBoard.from_fen(fen), depth, -inf, inf)
+        search.transposition_table.clear()
+        mirrored, _ = search.negamax(ChessBoard.from_fen(mirror_fen(fen)), depth, -inf, inf)
+        assert move is not None and score == mirrored
+        search.transposition_table.clear()
+        assert search.minimax(ChessBoard.from_fen(mirror_fen(fen)), depth, -inf, inf, False)[0] == -score
+
+    board = ChessBoard.from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+    assert move_to_uci(get_best_move(board, max_depth=3, context=SearchContext(tt_size_mb=1)).to_int()) == "a1a8"
+
+def test_aspiration_windows():
+    """
+    Comprueba que la ventana de aspiración se ensancha al fallar por abajo o por arriba y
+    termina con la misma puntuación y movimiento que la búsqueda con ventana completa.
+    """
+    inf = float("inf")
+    fen = REFERENCE_POSITIONS["kiwipete"][0]
+    context = SearchContext(tt_size_mb=1)
+    search.activate_context(context)
+    full = search.negamax(ChessBoard.from_fen(fen), 3, -inf, inf)
+    stats = context.stats
+    for previous, failed in ((full[0] - 300, "aspiration_fail_highs"), (full[0] + 300, "aspiration_fail_lows"),
+                             (full[0] + 5, None)):
+        context.clear()
+        assert search.aspiration_search(ChessBoard.from_fen(fen), 3, previous) == full
+        assert stats["aspiration_searches"] == 1
+        assert stats["aspiration_fail_lows"] + stats["aspiration_fail_highs"] == (stats[failed] if failed else 0)
+        assert failed is None or stats[failed] > 0
+
+def test_search_deadline():
+    """
+    Comprueba que el tiempo límite se respeta dentro de la búsqueda: aborta a mitad de una iteración,
+    deja el tablero como estaba y devuelve un movimiento legal.
+    """
+    fen = REFERENCE_POSITIONS["kiwipete"][0]
+    board = ChessBoard.from_fen(fen)
+    context = SearchContext(tt_size_mb=1)
+    start = time.time()
+    move = get_best_move(board, max_depth=20, time_limit=0.2, context=context)
+    assert time.time() - start < 1.0
+    assert board.to_fen() == fen and len(board.move_log) == 0
+    assert move.to_int() in MoveGenerator.generate_legal_moves(board, board.turn)
+    assert context.stats["completed_depth"] < 20
+
+def test_time_manager():
+    """
+    Comprueba el reparto del reloj (presupuestos blando y duro), la ampliación cuando la búsqueda
+    es inestable y la respuesta inmediata con un único movimiento legal.
+    """
+    board = ChessBoard()
+    manager = TimeManager(60.0, increment=1.0, moves_to_go=20, overhead=0.0)
+    manager.start(board)
+    assert abs(manager.soft_limit - (60.0 / 20 + 0.75)) < 1e-9
+    assert manager.soft_limit < manager.hard_limit <= 60.0 * 0.4
+    assert not manager.should_stop(100, 50.0) # Recién empezada: hay tiempo para otra iteración.
+    assert not manager.should_stop(200, 0.0) and manager.extension > 1.0 # Cambio de movimiento y caída.
+
+    short = TimeManager(1.0) # Con poco tiempo los presupuestos se reducen.
+    short.start(board)
+    assert short.hard_limit < 0.5
+
+    board = ChessBoard.from_fen("7k/8/5K2/8/8/8/8/6R1 b - - 0 1") # El rey negro solo puede ir a h7.
+    context = SearchContext(tt_size_mb=1)
+    received = []
+    start = time.time()
+    move = get_best_move(board, max_depth=20, context=context, time_manager=TimeManager(60.0), on_info=received.append)
+    assert move_to_uci(move.to_int()) == "h8h7" and time.time() - start < 0.5
+    # El contexto queda como tras una búsqueda: la siguiente continúa la partida.
+    assert context.last_ply == len(board.move_log) and context.last_key == board.zobrist_key
+    assert received == context.search_info and len(received) == 1
+    assert received[0].depth == 0 and received[0].pv == [move.to_int()] == context.pv
+
+    # La profundidad se limita a la de la tabla triangular de la variante principal.
+    get_best_move(board, max_depth=search.MAX_PLY + 10, time_limit=0.1, context=context)
+    assert max(context.killer_moves) == search.MAX_PLY - 1
+
+    board = ChessBoard.from_fen(REFERENCE_POSITIONS["kiwipete"][0])
+    manager = TimeManager(2.0, overhead=0.0)
+    start = time.time()
+    move = get_best_move(board, max_depth=20, context=SearchContext(tt_size_mb=1), time_manager=manager)
+    assert move is not None and time.time() - start < manager.hard_limit + 0.3
+
+def test_null_move():
+    """
+    Comprueba el movimiento nulo: pasa el turno, borra en passant y mantiene la clave de Zobrist;
+    undo_null_move (y undo_move) lo deshacen; la búsqueda lo usa para podar.
+    """
+    fen = "rnbqkbnr/ppp1pppp/8/8/3pP3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 3"
+    board = ChessBoard.from_fen(fen)
+    key = board.zobrist_key
+    board.make_null_move()
+    assert board.to_fen() == "rnbqkbnr/ppp1pppp/8/8/3pP3/8/PPPP1PPP/RNBQKBNR w KQkq - 1 4"
+    assert board.zobrist_key == compute_zobrist_key(board) != key
+    board.undo_null_move()
+    assert board.to_fen() == fen and board.zobrist_key == key
+    board.make_null_move()
+    board.undo_move() # undo_move también deshace un movimiento nulo (la búsqueda lo usa al abortar).
+    assert board.to_fen() == fen and not board.move_log
+
+    context = SearchContext(tt_size_mb=1)
+    get_best_move(ChessBoard(), max_depth=5, time_limit=None, context=context)
+    assert 0 < context.stats["null_move_cutoffs"] <= context.stats["null_move_tries"]
+
+def test_shallow_pruning():
+    """
+    Comprueba que las podas cerca del horizonte (reverse futility, futility y late move pruning)
+    se aplican y que no cambian el movimiento en una posición táctica sencilla (ganar la dama).
+    """
+    context = SearchContext(tt_size_mb=1)
+    board = ChessBoard.from_fen("r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4")
+    get_best_move(board, max_depth=4, time_limit=None, context=context)
+    stats = context.stats
+    assert stats["reverse_futility_cutoffs"] > 0 and stats["futility_pruned"] > 0 and stats["late_move_pruned"] > 0
+
+    board = ChessBoard.from_fen("3qk3/8/8/8/8/8/8/3RK3 w - - 0 1") # Torre por dama en la columna d.
+    move = get_best_move(board, max_depth=4, time_limit=None, context=context)
+    assert move_to_uci(move.to_int()) == "d1d8"
+
+def test_quiescence_captures():
+    """
+    Comprueba el generador de capturas de la quiescencia (coincide con las capturas y promociones a dama
+    de los movimientos legales), la evaluación estática de intercambios y el modo de evasiones en jaque.
+    """
+    for fen, _ in REFERENCE_POSITIONS.values():
+        board = ChessBoard.from_fen(fen)
+        for move in MoveGenerator.generate_legal_moves(board, board.turn) + [None]:
+            if move is not None:
+                board.make_move(move)
+            legal = MoveGenerator.generate_legal_moves(board, board.turn)
+            expected = sorted(m for m in legal if (is_capture(m) and not is_promotion(m))
+                              or (is_promotion(m) and m >> 12 & 3 == 3))
+            assert sorted(MoveGenerator.generate_captures(board, board.turn)) == expected, fen
+            if move is not None:
+                board.undo_move()
+
+    def see(fen, uci):
+        board = ChessBoard.from_fen(fen)
+        move = next(m for m in MoveGenerator.generate_legal_moves(board, board.turn) if move_to_uci(m) == uci)
+        return static_exchange_eval(board, move)
+
+    assert see("4k3/8/8/3p4/4P3/8/8/4K3 w - - 0 1", "e4d5") == 100 # Peón indefenso.
+    assert see("4k3/8/2p5/3p4/8/8/8/3QK3 w - - 0 1", "d1d5") == -800 # Dama por peón defendido.
+    assert see("1k1r3q/1ppn3p/p4b2/4p3/8/P2N2P1/1PP1R1BP/2K1Q3 w - - 0 1", "d3e5") == -220 # Rayos X.
+    assert see("3rk3/3r4/8/3p4/8/8/3R4/3RK3 w - - 0 1", "d2d5") == -400 # Torres dobladas de ambos lados.
+
+    context = SearchContext(tt_size_mb=1)
+    search.activate_context(context)
+    search.deadline = None
+    board = ChessBoard.from_fen("R5k1/5ppp/8/8/8/8/8/6K1 b - - 0 1") # Mate del pasillo: sin evasiones.
+    assert search.quiescence_search(board, -search.MATE_SCORE - 1, search.MATE_SCORE + 1) == -search.MATE_SCORE
+    assert context.stats["qsearch_evasions"] == 1
+
+    board = ChessBoard.from_fen("4k3/8/2p5/3p4/8/8/8/3QK3 w - - 0 1") # Qxd5 pierde la dama: se descarta.
+    search.quiescence_search(board, -search.MATE_SCORE, search.MATE_SCORE)
+    assert context.stats["see_pruned"] == 1
+
+def test_lazy_smp():
+    """
+    Comprueba la tabla de transposiciones en memoria compartida (otra conexión al mismo bloque ve las
+    mismas entradas y la misma generación) y la búsqueda Lazy SMP con procesos auxiliares.
+    """
+    table = SharedTranspositionTable(size_mb=1)
+    table.new_search()
+    table.store(123456789, 4, EXACT, -1.5, 77)
+    other = pickle.loads(pickle.dumps(table)) # Lo que recibe un proceso auxiliar: el mismo bloque por nombre.
+    assert other.size == table.size and other.generation == 1
+    assert other.probe(123456789) == (4, EXACT, -1.5, 77)
+    other.store(987654321, 2, LOWERBOUND, 3.0)
+    assert table.probe(987654321) == (2, LOWERBOUND, 3.0, None)
+    other.close()
+    table.close()
+
+    try:
+        get_best_move(ChessBoard(), max_depth=2, time_limit=None, context=SearchContext(tt_size_mb=1), workers=2)
+        assert False, "workers > 1 requiere una tabla compartida"
+    except ValueError:
+        pass
+
+    context = SearchContext(tt_size_mb=1, shared=True)
+    board = ChessBoard.from_fen("3qk3/8/8/8/8/8/8/3RK3 w - - 0 1") # Torre por dama en la columna d.
+    move = get_best_move(board, max_depth=4, time_limit=None, context=context, workers=2)
+    assert move_to_uci(move.to_int()) == "d1d8"
+    assert context.stats["completed_depth"] == 4 and context.stats["helper_nodes"] > 0
+    context.transposition_table.close()
+
+    # Auxiliares que fallan, mueren sin avisar o no atienden la señal de parada: stop() no se queda esperando.
+    def crash(*args):
+        raise RuntimeError("fallo simulado del auxiliar")
+    def die(*args):
+        os._exit(1)
+    def hang(*args):
+        while True:
+            time.sleep(1)
+    original = search.aspiration_search
+    table = SharedTranspositionTable(size_mb=1)
+    try:
+        for failure in (crash, die, hang):
+            search.aspiration_search = failure # Los auxiliares (fork) heredan la función sustituida.
+            helpers = smp.LazySMPHelpers(ChessBoard(), table, 2, 3)
+            search.aspiration_search = original
+            start = time.time()
+            assert helpers.stop() == (0, None)
+            assert time.time() - start < smp.HELPER_STOP_TIMEOUT + 1
+            assert not helpers.processes[0].is_alive()
+    finally:
+        search.aspiration_search = original
+        table.close()
+
+def test_root_split():
+    """
+    Comprueba que la búsqueda por reparto de movimientos raíz da el mismo resultado que minimax en modo
+    análisis, en serie y con varios procesos, y que no cambia el contexto de búsqueda del llamador.
+    """
+    fens = ["3qk3/8/8/8/8/8/8/3RK3 w - - 0 1"] + [fen for fen, _ in REFERENCE_POSITIONS.values()] # Torre por dama en la columna d.
+    inf = float('inf')
+    expected = []
+    for fen in fens:
+        board = ChessBoard.from_fen(fen)
+        search.activate_context(SearchContext(tt_size_mb=1))
+        search.deadline = None
+        search.root_ply = len(board.move_log)
+        search.analysis_mode = True
+        try:
+            expected.append(search.minimax(board, 3, -inf, inf, board.turn == "w"))
+        finally:
+            search.analysis_mode = False
+    assert move_to_uci(expected[0][1]) == "d1d8"
+
+    context = SearchContext(tt_size_mb=1)
+    search.activate_context(context)
+    with RootSplitSearch(workers=1) as serial:
+        assert [serial.search(ChessBoard.from_fen(fen), 3) for fen in fens] == expected
+    assert search.transposition_table is context.transposition_table and search.search_stats is context.stats
+    assert not search.analysis_mode and not context.stats["nodes"]
+    with RootSplitSearch(workers=2) as parallel:
+        assert [parallel.search(ChessBoard.from_fen(fen), 3) for fen in fens] == expected
+
+def test_ponder():
+    """
+    Comprueba la búsqueda en el tiempo del rival: al acertar la respuesta, la búsqueda en curso devuelve
+    un movimiento legal de la posición real; al fallar, se cancela y el contexto no se toma por otra partida.
+    """
+    context = SearchContext(tt_size_mb=1)
+    board = ChessBoard.from_fen("r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4")
+    board.make_move(get_best_move(board, max_depth=3, time_limit=None, context=context))
+    ponderer = Ponderer(context, max_depth=4)
+    assert ponderer.start(board) and ponderer.is_active()
+    board.make_move(ponderer.ponder_move) # El rival juega lo previsto.
+    move = ponderer.finish(board, TimeManager(60.0))
+    assert move is not None and move.to_int() in MoveGenerator.generate_legal_moves(board, board.turn)
+    assert ponderer.hits == 1 and not ponderer.is_active()
+    assert context.last_key == board.zobrist_key and context.transposition_table.probe(board.zobrist_key)
+
+    board.make_move(move)
+    last_position = (context.last_ply, context.last_key)
+    assert ponderer.start(board)
+    reply = next(m for m in MoveGenerator.generate_legal_moves(board, board.turn) if m != ponderer.ponder_move)
+    board.make_move(reply) # El rival juega otra cosa.
+    assert ponderer.finish(board, TimeManager(60.0)) is None
+    assert ponderer.misses == 1 and not ponderer.is_active()
+    assert (context.last_ply, context.last_key) == last_position and context.is_continuation(board)
+    assert not search.pondering and search.stop_event is None
+
+def test_search_info():
+    """
+    Comprueba la información por iteración de get_best_move: un SearchInfo por profundidad completa,
+    entregado al callback y guardado en el contexto, con contadores acumulados coherentes y una
+    variante principal legal que empieza por el movimiento elegido.
+    """
+    context = SearchContext(tt_size_mb=1)
+    board = ChessBoard.from_fen(REFERENCE_POSITIONS["kiwipete"][0])
+    received = []
+    move = get_best_move(board, max_depth=4, time_limit=None, context=context, on_info=received.append)
+    assert received == context.search_info and [info.depth for info in received] == [1, 2, 3, 4]
+    for previous, info in zip(received, received[1:]):
+        assert info.nodes >= previous.nodes and info.elapsed >= previous.elapsed
+    last = received[-1]
+    assert last.seldepth >= last.depth and last.nodes == context.stats["nodes"]
+    assert 0 < last.tt_hits <= last.tt_probes and last.tt_stores > 0 and 0.0 < last.first_move_cutoff_rate <= 1.0
+    assert last.pv[0] == move.to_int() and len(last.pv) <= last.depth
+    for m in last.pv: # La variante es una secuencia legal desde la raíz.
+        assert m in MoveGenerator.generate_legal_moves(board, board.turn)
+        board.make_move(m)
+    assert str(last).startswith("info depth 4 seldepth ") and last.as_dict()["nps"] == last.nps
+
+def test_principal_variation():
+    """
+    Comprueba la variante principal que devuelve get_best_move: empieza por el movimiento elegido, es
+    una secuencia legal de la profundidad buscada, queda en el contexto y de ella sale la respuesta que
+    se espera del rival al pensar en su tiempo.
+    """
+    context = SearchContext(tt_size_mb=1)
+    board = ChessBoard.from_fen("r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4")
+    move, pv = get_best_move(board, max_depth=5, time_limit=None, context=context, return_pv=True)
+    assert pv[0] == move.to_int() and len(pv) == 5 and context.pv == pv
+    assert context.search_info[-1].pv == pv
+    for m in pv:
+        assert m in MoveGenerator.generate_legal_moves(board, board.turn)
+        board.make_move(m)
+    for _ in pv:
+        board.undo_move()
+    board.make_move(move)
+    assert predict_reply(board, context) == pv[1]
+
+    board = ChessBoard.from_fen("6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1") # Mate en una con la torre.
+    move, pv = get_best_move(board, max_depth=3, time_limit=None, context=SearchContext(tt_size_mb=1), return_pv=True)
+    assert [move_to_uci(m) for m in pv] == ["d1d8"]
+
+if __name__ == "__main__":
+    test_checkmate_detection() # Ejecuta la función de prueba si el script se ejecuta directamente.
+    test_bitboards_sync()
+    test_zobrist_incremental()
+    test_move_encoding()
+    test_undo_stack_state()
+    test_fen_roundtrip()
+    test_legal_moves_perft_start()
+    test_perft_reference_positions()
+    test_transposition_table()
+    test_search_context()
+    test_move_ordering()
+    test_negamax_pvs()
+    test_aspiration_windows()
+    test_search_deadline()
+    test_time_manager()
+    test_null_move()
+    test_shallow_pruning()
+    test_quiescence_captures()
+    test_lazy_smp()
+    test_root_split()
+    test_ponder()
+    test_search_info()
+    test_principal_variation()